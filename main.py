@@ -9,7 +9,6 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.config.settings import configure_logging
-from src.bot.cerebro_bot import cerebro_bot
 
 def main():
     """
@@ -22,6 +21,9 @@ def main():
     logger.info("Iniciando o bot Cerebro...")
     
     try:
+        # Importado aqui para que `import main` seja barato (ex: ferramentas e testes)
+        from src.bot.cerebro_bot import cerebro_bot
+        
         # Inicia o bot
         cerebro_bot.start()
     except KeyboardInterrupt:
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Avaliação offline do classificador local (IDEIA x QUESTAO).
+
+Reproduz os exemplos gravados na ordem em que chegaram, como o bot faria: o classificador
+decide quando está confiante e, caso contrário, a decisão da OpenAI (o rótulo gravado)
+vira um novo exemplo. Mostra a acurácia das decisões locais e quantas chamadas à API
+teriam sido economizadas para cada limiar:
+
+    python scripts/avaliar_classificador_local.py
+    python scripts/avaliar_classificador_local.py --limiar 0.9 0.95 0.99 --importar-historico
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import CLASSIFICADOR_DB_PATH, CLASSIFICADOR_LIMIAR, CLASSIFICADOR_MIN_EXEMPLOS
+from src.services.local_classifier import LocalClassifier
+
+# Numera os bancos temporários criados durante a avaliação
+_contador = itertools.count()
+
+def novo_classificador(diretorio, limiar, min_exemplos):
+    """
+    Cria um classificador vazio em um arquivo temporário.
+    """
+    caminho = os.path.join(diretorio, f"classificador_{next(_contador)}.db")
+    return LocalClassifier(db_path=caminho, limiar=limiar, min_exemplos=min_exemplos, importar_historico=False)
+
+def simular(exemplos, limiar, min_exemplos, diretorio):
+    """
+    Reproduz os exemplos em ordem e conta as decisões locais e os acertos.
+    """
+    classificador = novo_classificador(diretorio, limiar, min_exemplos)
+    locais = acertos = 0
+    for texto, tipo in exemplos:
+        decisao = classificador.classificar(texto)
+        if decisao:
+            locais += 1
+            acertos += decisao == tipo
+        else:
+            classificador.aprender(texto, tipo)
+    return locais, acertos
+
+def validacao_cruzada(exemplos, dobras, diretorio):
+    """
+    Acurácia do modelo completo (sem limiar) em validação cruzada.
+    """
+    embaralhados = list(exemplos)
+    random.Random(42).shuffle(embaralhados)
+    acertos = 0
+    for dobra in range(dobras):
+        teste = embaralhados[dobra::dobras]
+        classificador = novo_classificador(diretorio, 0.0, 0)
+        for i, (texto, tipo) in enumerate(embaralhados):
+            if i % dobras != dobra:
+                classificador.aprender(texto, tipo)
+        acertos += sum(classificador.prever(texto)[0] == tipo for texto, tipo in teste)
+    return acertos / len(embaralhados)
+
+def main():
+    """Executa a avaliação e imprime os resultados."""
+    parser = argparse.ArgumentParser(description="Avalia o classificador local com os exemplos gravados.")
+    parser.add_argument("--db", default=str(CLASSIFICADOR_DB_PATH), help="Banco de exemplos do classificador")
+    parser.add_argument("--limiar", type=float, nargs="+", default=[CLASSIFICADOR_LIMIAR], help="Limiares avaliados")
+    parser.add_argument("--min-exemplos", type=int, default=CLASSIFICADOR_MIN_EXEMPLOS)
+    parser.add_argument("--dobras", type=int, default=5, help="Dobras da validação cruzada")
+    parser.add_argument("--importar-historico", action="store_true", help="Importa antes as ideias salvas no banco")
+    args = parser.parse_args()
+    
+    base = LocalClassifier(db_path=args.db, importar_historico=False)
+    if args.importar_historico:
+        novos = base.importar_historico()
+        print(f"Exemplos importados do histórico: {novos}")
+        base = LocalClassifier(db_path=args.db, importar_historico=False)
+    
+    exemplos = base.exemplos()
+    print(f"Exemplos: {len(exemplos)} {base.estatisticas()['exemplos']}")
+    if not exemplos:
+        print("Nenhum exemplo gravado. Use o bot com o classificador habilitado ou --importar-historico.")
+        return
+    
+    with tempfile.TemporaryDirectory(prefix="cerebro-classificador-") as diretorio:
+        if len(exemplos) >= args.dobras:
+            print(f"Acurácia do modelo ({args.dobras} dobras, sem limiar): {validacao_cruzada(exemplos, args.dobras, diretorio):.1%}\n")
+        
+        print(f"{'limiar':>8s} {'decisões locais':>16s} {'chamadas economizadas':>22s} {'acurácia local':>15s}")
+        for limiar in args.limiar:
+            locais, acertos = simular(exemplos, limiar, args.min_exemplos, diretorio)
+            acuracia = f"{acertos / locais:.1%}" if locais else "-"
+            print(f"{limiar:8.3f} {locais:16d} {locais / len(exemplos):22.1%} {acuracia:>15s}")
+
+if __name__ == "__main__":
+    main()
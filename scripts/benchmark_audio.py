@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark do preparo de um áudio para transcrição (sem o envio pela rede).
+
+Compara o pipeline antigo, baseado em arquivos temporários (download em disco, detecção
+com `file`, conversão com pydub para outro arquivo WAV e nova leitura), com o pipeline em
+memória (bytes -> ffmpeg por stdin/stdout -> corpo multipart). Cada cenário roda em um
+processo Python novo para que o pico de memória (RSS) de um não contamine o outro:
+
+    python scripts/benchmark_audio.py
+    python scripts/benchmark_audio.py --arquivo voz.ogg --repeticoes 20
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, RAIZ)
+
+# Cenários medidos: nome exibido -> nome da função do pipeline
+CENARIOS = {
+    "arquivos temporários (antes)": "pipeline_arquivos",
+    "em memória (depois)": "pipeline_memoria",
+}
+
+def corpo_multipart(wav):
+    """
+    Monta o corpo multipart do upload, como o cliente HTTP faria.
+    """
+    from urllib3 import encode_multipart_formdata
+    
+    return encode_multipart_formdata({
+        "file": ("audio.wav", wav, "audio/wav"),
+        "model": "whisper-1",
+        "language": "pt",
+        "response_format": "json",
+        "temperature": "0.0",
+    })[0]
+
+def pipeline_arquivos(dados):
+    """
+    Pipeline antigo: cada etapa grava ou lê um arquivo.
+    """
+    from pydub import AudioSegment
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Download gravado em disco
+        audio_path = os.path.join(diretorio, "audio.ogg")
+        with open(audio_path, "wb") as arquivo:
+            arquivo.write(dados)
+        
+        # Detecção do formato com o utilitário `file`
+        subprocess.run(["file", audio_path], capture_output=True, text=True)
+        
+        # Conversão para outro arquivo temporário
+        som = AudioSegment.from_file(audio_path).set_channels(1).set_frame_rate(16000)
+        wav_path = os.path.join(diretorio, "audio.wav")
+        som.export(wav_path, format="wav")
+        
+        # Nova leitura do WAV para o upload
+        with open(wav_path, "rb") as arquivo:
+            return corpo_multipart(arquivo.read())
+
+def pipeline_memoria(dados):
+    """
+    Pipeline atual: bytes -> ffmpeg (stdin/stdout) -> corpo multipart.
+    """
+    from src.transcription.audio_processor import audio_processor
+    
+    wav = audio_processor.converter_para_wav(dados)
+    if not wav:
+        raise RuntimeError("conversão falhou (o ffmpeg está instalado?)")
+    return corpo_multipart(wav)
+
+def executar(cenario, arquivo, repeticoes):
+    """
+    Mede um cenário no processo atual e imprime o resultado em JSON.
+    """
+    with open(arquivo, "rb") as entrada:
+        dados = entrada.read()
+    
+    pipeline = globals()[cenario]
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        pipeline(dados)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    
+    # ru_maxrss é o pico de memória do processo, em KB no Linux
+    print(json.dumps({"ms": statistics.median(tempos), "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+def medir(cenario, arquivo, repeticoes):
+    """
+    Mede um cenário em um processo novo (ou retorna None se falhar).
+    """
+    ambiente = dict(os.environ)
+    ambiente["PYTHONPATH"] = RAIZ
+    # Chaves fictícias: as configurações são validadas na importação de alguns módulos
+    ambiente.setdefault("TELEGRAM_API_KEY", "123456:benchmark")
+    ambiente.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    
+    resultado = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--executar", cenario, "--arquivo", arquivo, "--repeticoes", str(repeticoes)],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True
+    )
+    if resultado.returncode != 0:
+        print(resultado.stderr.strip().splitlines()[-1] if resultado.stderr.strip() else "erro desconhecido", file=sys.stderr)
+        return None
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+def main():
+    """Executa o benchmark e imprime a comparação."""
+    parser = argparse.ArgumentParser(description="Compara o preparo do áudio com arquivos temporários e em memória.")
+    parser.add_argument("--arquivo", default=os.path.join(RAIZ, "test_audio", "sample.wav"), help="Áudio de entrada")
+    parser.add_argument("--repeticoes", type=int, default=10, help="Execuções por cenário (mediana)")
+    parser.add_argument("--executar", choices=list(CENARIOS.values()), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.executar:
+        executar(args.executar, args.arquivo, args.repeticoes)
+        return
+    
+    print(f"Áudio: {args.arquivo} ({os.path.getsize(args.arquivo)} bytes), {args.repeticoes} repetições\n")
+    print(f"{'cenário':32s} {'mediana':>10s} {'pico RSS':>10s}")
+    for nome, cenario in CENARIOS.items():
+        medicao = medir(cenario, args.arquivo, args.repeticoes)
+        if medicao is None:
+            print(f"{nome:32s} {'falhou':>10s}")
+        else:
+            print(f"{nome:32s} {medicao['ms']:7.1f} ms {medicao['rss_kb'] / 1024:7.1f} MB")
+
+if __name__ == "__main__":
+    main()
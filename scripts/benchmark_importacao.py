@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de inicialização a frio do bot Cerebro.
+
+Cada medição roda em um processo Python novo, então nada fica em cache entre execuções.
+Com --comparar-com, mede também uma revisão anterior do git (em um worktree temporário):
+
+    python scripts/benchmark_importacao.py
+    python scripts/benchmark_importacao.py --comparar-com HEAD~1 --repeticoes 9
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cenários medidos: nome -> código executado no processo novo
+CENARIOS = {
+    "import main": "import main",
+    "import src.config.settings": "import src.config.settings",
+    "import src.database": "import src.database",
+    "import src.services.openai_service": "import src.services.openai_service",
+    "import src.bot.cerebro_bot": "import src.bot.cerebro_bot",
+    "bot pronto (sem rede)": "from src.bot.cerebro_bot import cerebro_bot; cerebro_bot.dispatcher",
+}
+
+def medir(raiz, codigo, repeticoes):
+    """
+    Executa o código em processos novos e retorna a mediana do tempo em ms (ou None se falhar).
+    """
+    ambiente = dict(os.environ)
+    ambiente["PYTHONPATH"] = raiz
+    # Chaves fictícias: versões antigas validam as chaves já na importação
+    ambiente.setdefault("TELEGRAM_API_KEY", "123456:benchmark")
+    ambiente.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = subprocess.run(
+            [sys.executable, "-c", codigo], cwd=raiz, env=ambiente, capture_output=True
+        )
+        if resultado.returncode != 0:
+            return None
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+def medir_revisao(raiz, repeticoes):
+    """
+    Mede todos os cenários em um diretório do projeto.
+    """
+    return {nome: medir(raiz, codigo, repeticoes) for nome, codigo in CENARIOS.items()}
+
+def formatar(ms):
+    return "falhou" if ms is None else f"{ms:8.0f} ms"
+
+def main():
+    """Executa o benchmark e imprime a tabela de resultados."""
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização a frio do bot.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por cenário (usa a mediana)")
+    parser.add_argument("--comparar-com", metavar="REVISAO", help="Revisão do git para comparação (ex: HEAD~1)")
+    args = parser.parse_args()
+    
+    # Processo vazio, para descontar o custo do próprio interpretador
+    base = medir(RAIZ, "pass", args.repeticoes)
+    print(f"Interpretador vazio: {formatar(base)}\n")
+    
+    atual = medir_revisao(RAIZ, args.repeticoes)
+    
+    if not args.comparar_com:
+        for nome, ms in atual.items():
+            print(f"{nome:40s} {formatar(ms)}")
+        return
+    
+    worktree = tempfile.mkdtemp(prefix="cerebro-bench-")
+    try:
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", worktree, args.comparar_com],
+            cwd=RAIZ, check=True, capture_output=True
+        )
+        anterior = medir_revisao(worktree, args.repeticoes)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=RAIZ, capture_output=True)
+        shutil.rmtree(worktree, ignore_errors=True)
+    
+    print(f"{'cenário':40s} {args.comparar_com:>11s} {'atual':>11s}   redução")
+    for nome in CENARIOS:
+        antes, depois = anterior[nome], atual[nome]
+        reducao = f"{(1 - depois / antes) * 100:6.1f}%" if antes and depois else "     -"
+        print(f"{nome:40s} {formatar(antes)} {formatar(depois)}   {reducao}")
+
+if __name__ == "__main__":
+    main()
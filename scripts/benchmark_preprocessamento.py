@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pré-processamento de áudio (remoção de silêncios e normalização).
+
+Para cada áudio do corpus, mostra a duração antes e depois do pré-processamento, os segundos
+removidos e o tempo gasto no processamento. A latência de transcrição economizada é estimada
+pelos segundos removidos (--latencia-por-segundo) ou medida enviando o áudio original e o
+processado para a API (--transcrever, requer OPENAI_API_KEY):
+
+    python scripts/benchmark_preprocessamento.py test_audio/
+    python scripts/benchmark_preprocessamento.py --sinteticos 20
+    python scripts/benchmark_preprocessamento.py notas_de_voz/ --transcrever
+"""
+import argparse
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Extensões lidas quando um diretório é passado como corpus
+EXTENSOES = (".ogg", ".oga", ".opus", ".wav", ".mp3", ".m4a", ".mp4", ".flac", ".webm")
+
+def listar_corpus(caminhos):
+    """
+    Lista os arquivos de áudio dos caminhos informados (arquivos ou diretórios).
+    """
+    arquivos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for nome in sorted(os.listdir(caminho)):
+                if nome.lower().endswith(EXTENSOES):
+                    arquivos.append(os.path.join(caminho, nome))
+        else:
+            arquivos.append(caminho)
+    return arquivos
+
+def gerar_sinteticos(quantidade, semente=0):
+    """
+    Gera notas de voz sintéticas: trechos de "fala" (ruído modulado) com silêncio no início,
+    no fim e em algumas pausas, como em uma gravação real.
+    """
+    import numpy as np
+    from src.config.settings import WHISPER_SAMPLE_RATE
+    from src.transcription.audio_processor import gerar_wav
+    
+    gerador = np.random.default_rng(semente)
+    
+    def trecho(segundos, amplitude):
+        n = int(segundos * WHISPER_SAMPLE_RATE)
+        envelope = np.abs(np.sin(np.linspace(0, segundos * 6, n))) if amplitude > 100 else 1
+        return (gerador.normal(0, amplitude, n) * envelope).astype(np.int16)
+    
+    notas = []
+    for i in range(quantidade):
+        partes = [trecho(gerador.uniform(0.5, 4), 20)]
+        for _ in range(gerador.integers(2, 8)):
+            partes.append(trecho(gerador.uniform(2, 10), gerador.uniform(800, 4000)))
+            partes.append(trecho(gerador.choice([0.3, 0.6, 1.5, 3.0]), 20))
+        partes.append(trecho(gerador.uniform(0.5, 3), 20))
+        notas.append((f"sintetico_{i:02d}.wav", gerar_wav(np.concatenate(partes))))
+    return notas
+
+def medir_transcricao(transcriber, conteudo, formato):
+    """
+    Envia um áudio para a API de transcrição e retorna a latência em segundos.
+    """
+    inicio = time.perf_counter()
+    transcriber._enviar(conteudo, formato)
+    return time.perf_counter() - inicio
+
+def main():
+    """Executa o benchmark e imprime o relatório."""
+    parser = argparse.ArgumentParser(description="Mede o efeito do pré-processamento de áudio.")
+    parser.add_argument("corpus", nargs="*", help="Arquivos ou diretórios de áudio")
+    parser.add_argument("--sinteticos", type=int, default=0, help="Notas de voz sintéticas incluídas no corpus")
+    parser.add_argument(
+        "--latencia-por-segundo", type=float, default=0.08,
+        help="Segundos de latência da API por segundo de áudio (estimativa, sem --transcrever)"
+    )
+    parser.add_argument("--transcrever", action="store_true", help="Mede a latência real enviando os áudios à API")
+    args = parser.parse_args()
+    
+    from src.config.settings import WHISPER_SAMPLE_RATE
+    from src.transcription.audio_processor import audio_processor, gerar_wav
+    
+    corpus = []
+    for arquivo in listar_corpus(args.corpus):
+        with open(arquivo, "rb") as entrada:
+            corpus.append((os.path.basename(arquivo), entrada.read()))
+    corpus.extend(gerar_sinteticos(args.sinteticos))
+    if not corpus:
+        parser.error("informe arquivos de áudio ou use --sinteticos")
+    
+    transcriber = None
+    if args.transcrever:
+        from src.transcription.transcriber import audio_transcriber
+        transcriber = audio_transcriber.obter()
+    
+    print(f"{'áudio':24s} {'antes':>8s} {'depois':>8s} {'removido':>9s} {'proc.':>8s} {'economia':>9s}")
+    total_antes = total_removido = total_economia = 0.0
+    for nome, dados in corpus:
+        amostras = audio_processor.decodificar_pcm(dados)
+        if amostras is None:
+            print(f"{nome:24s} {'falhou (o ffmpeg está instalado?)':>45s}")
+            continue
+        
+        inicio = time.perf_counter()
+        processadas = audio_processor.preprocessar(amostras)
+        processamento = time.perf_counter() - inicio
+        
+        antes = len(amostras) / WHISPER_SAMPLE_RATE
+        removido = antes - len(processadas) / WHISPER_SAMPLE_RATE
+        if transcriber is not None:
+            economia = (
+                medir_transcricao(transcriber, gerar_wav(amostras), "wav")
+                - medir_transcricao(transcriber, gerar_wav(processadas), "wav")
+            )
+        else:
+            economia = removido * args.latencia_por_segundo
+        
+        total_antes += antes
+        total_removido += removido
+        total_economia += economia
+        print(
+            f"{nome:24s} {antes:7.1f}s {antes - removido:7.1f}s {removido:8.1f}s "
+            f"{processamento * 1000:6.1f}ms {economia * 1000:7.0f}ms"
+        )
+    
+    if total_antes:
+        origem = "medida" if transcriber is not None else f"estimada a {args.latencia_por_segundo:.2f}s/s"
+        print(
+            f"\nTotal: {total_removido:.1f}s removidos de {total_antes:.1f}s ({total_removido / total_antes:.0%}); "
+            f"latência economizada {total_economia:.2f}s ({origem})"
+        )
+
+if __name__ == "__main__":
+    main()
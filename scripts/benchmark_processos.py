@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark do preparo de áudios simultâneos: em threads do processo do bot (antes) e no pool
+de processos (depois).
+
+Prepara N notas de voz ao mesmo tempo (padrão: 20) pelo mesmo caminho do transcritor
+(`preparar_envios`, sem o envio pela rede) e mede o tempo total, a vazão e o maior atraso
+do event loop enquanto os áudios eram preparados (uma corrotina que acorda a cada 10 ms):
+
+    python scripts/benchmark_processos.py
+    python scripts/benchmark_processos.py --notas 20 --duracao 120 --processos 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Chaves fictícias: as configurações são validadas na importação de alguns módulos
+os.environ.setdefault("TELEGRAM_API_KEY", "123456:benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+# Intervalo (s) da corrotina que mede o atraso do event loop
+INTERVALO_PULSO = 0.01
+
+def gerar_notas(quantidade, duracao, semente=0):
+    """
+    Gera notas de voz sintéticas em WAV: trechos de "fala" (ruído modulado) entre pausas.
+    """
+    import numpy as np
+    from src.config.settings import WHISPER_SAMPLE_RATE
+    from src.transcription.audio_processor import gerar_wav
+    
+    gerador = np.random.default_rng(semente)
+    notas = []
+    for _ in range(quantidade):
+        partes = []
+        total = 0.0
+        while total < duracao:
+            fala, pausa = gerador.uniform(2, 8), gerador.choice([0.3, 0.8, 2.0])
+            n = int(fala * WHISPER_SAMPLE_RATE)
+            envelope = np.abs(np.sin(np.linspace(0, fala * 6, n)))
+            partes.append((gerador.normal(0, gerador.uniform(800, 4000), n) * envelope).astype(np.int16))
+            partes.append(gerador.normal(0, 20, int(pausa * WHISPER_SAMPLE_RATE)).astype(np.int16))
+            total += fala + pausa
+        notas.append(gerar_wav(np.concatenate(partes)))
+    return notas
+
+async def medir_atraso(parar, atrasos):
+    """
+    Acorda a cada INTERVALO_PULSO e registra quanto o event loop demorou a mais para acordá-la.
+    """
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(INTERVALO_PULSO)
+        atrasos.append(time.perf_counter() - inicio - INTERVALO_PULSO)
+
+async def aquecer(pool, processos):
+    """
+    Inicia os processos do pool para não medir a criação deles.
+    """
+    await asyncio.gather(*(pool.executar(abs, 0) for _ in range(processos)))
+
+async def cenario(preparar, notas):
+    """
+    Prepara todas as notas ao mesmo tempo e retorna o tempo total, as falhas e o maior atraso do loop.
+    """
+    parar = asyncio.Event()
+    atrasos = []
+    pulso = asyncio.ensure_future(medir_atraso(parar, atrasos))
+    
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(preparar(dados) for dados in notas), return_exceptions=True)
+    total = time.perf_counter() - inicio
+    
+    parar.set()
+    await pulso
+    falhas = sum(1 for resultado in resultados if isinstance(resultado, BaseException) or not resultado)
+    return total, falhas, max(atrasos, default=0.0)
+
+def main():
+    """Executa o benchmark e imprime a comparação."""
+    parser = argparse.ArgumentParser(description="Compara o preparo de áudios simultâneos em threads e em processos.")
+    parser.add_argument("--notas", type=int, default=20, help="Notas de voz preparadas ao mesmo tempo")
+    parser.add_argument("--duracao", type=float, default=60, help="Duração (s) de cada nota")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 2, help="Processos do pool")
+    args = parser.parse_args()
+    
+    from src.transcription.audio_processor import preparar_envios
+    from src.utils.async_runtime import async_runtime
+    from src.utils.process_pool import ProcessPool
+    
+    notas = gerar_notas(args.notas, args.duracao)
+    # A fila comporta todas as notas: o benchmark mede a vazão, não a recusa
+    pool = ProcessPool("benchmark", processos=args.processos, fila_max=args.notas, timeout=600)
+    
+    cenarios = {
+        "threads do bot (antes)": lambda dados: async_runtime.em_thread(preparar_envios, dados),
+        f"pool de {args.processos} processos (depois)": lambda dados: pool.executar(preparar_envios, dados),
+    }
+    
+    async_runtime.executar(aquecer(pool, args.processos))
+    
+    print(f"{args.notas} notas de {args.duracao:.0f}s, {os.cpu_count()} CPUs\n")
+    print(f"{'cenário':34s} {'total':>8s} {'vazão':>12s} {'atraso máx. do loop':>20s} {'falhas':>7s}")
+    try:
+        for nome, preparar in cenarios.items():
+            total, falhas, atraso = async_runtime.executar(cenario(preparar, notas))
+            print(f"{nome:34s} {total:7.2f}s {args.notas / total:8.2f} n/s {atraso * 1000:17.0f} ms {falhas:7d}")
+    finally:
+        pool.encerrar()
+        async_runtime.parar()
+
+if __name__ == "__main__":
+    main()
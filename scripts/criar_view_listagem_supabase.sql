@@ -0,0 +1,19 @@
+-- View usada pelo /listar: apenas as colunas exibidas e o início do conteúdo,
+-- cortado no servidor para que cada página transfira poucos bytes por ideia.
+-- O tamanho do corte deve ser LISTAR_DESCRICAO_MAX + 1 (src/config/settings.py):
+-- o caractere extra indica que o conteúdo foi cortado e recebe reticências.
+CREATE OR REPLACE VIEW ideias_listagem
+WITH (security_invoker = true) AS
+SELECT
+  id,
+  chat_id,
+  resumo,
+  LEFT(conteudo, 51) AS conteudo_inicio
+FROM ideias;
+
+-- Índice da paginação por chat (WHERE chat_id = ? AND id < ? ORDER BY id DESC LIMIT n)
+CREATE INDEX IF NOT EXISTS idx_ideias_chat_id_id ON ideias(chat_id, id DESC);
+
+-- Comentários para documentação
+COMMENT ON VIEW ideias_listagem IS 'Projeção das ideias para a listagem paginada do bot Cerebro';
+COMMENT ON COLUMN ideias_listagem.conteudo_inicio IS 'Primeiros caracteres do conteúdo da ideia';
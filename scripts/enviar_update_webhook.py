@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Script para enviar updates gravados ao servidor de webhook local do bot Cerebro.
+
+Permite testar o modo webhook de ponta a ponta sem depender do Telegram:
+
+    BOT_MODO_RECEBIMENTO=webhook python main.py
+    python scripts/enviar_update_webhook.py --texto "Um app para organizar jogos de tênis"
+    python scripts/enviar_update_webhook.py updates_gravados.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import WEBHOOK_HOST, WEBHOOK_PORTA, WEBHOOK_CAMINHO, WEBHOOK_SECRET_TOKEN, MY_CHAT_ID
+from src.bot.webhook_server import CABECALHO_SECRET_TOKEN
+
+def criar_update_texto(texto, chat_id, update_id):
+    """
+    Cria o JSON de um update de mensagem de texto, no formato enviado pelo Telegram.
+    """
+    agora = int(time.time())
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": agora,
+            "chat": {"id": chat_id, "type": "private", "first_name": "Teste"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Teste"},
+            "text": texto
+        }
+    }
+
+def enviar_update(url, update, secret_token):
+    """
+    Envia um update por POST e retorna o status HTTP e o tempo de resposta em ms.
+    """
+    corpo = json.dumps(update).encode("utf-8")
+    requisicao = urllib.request.Request(
+        url,
+        data=corpo,
+        headers={"Content-Type": "application/json", CABECALHO_SECRET_TOKEN: secret_token},
+        method="POST"
+    )
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(requisicao, timeout=10) as resposta:
+            status = resposta.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, (time.perf_counter() - inicio) * 1000
+
+def main():
+    """Envia os updates informados ao webhook local."""
+    chat_padrao = MY_CHAT_ID[0] if isinstance(MY_CHAT_ID, list) and MY_CHAT_ID else MY_CHAT_ID
+    
+    parser = argparse.ArgumentParser(description="Envia updates gravados ao webhook local do bot.")
+    parser.add_argument("arquivos", nargs="*", help="Arquivos JSON com um update ou uma lista de updates")
+    parser.add_argument("--texto", help="Cria e envia um update de texto com esta mensagem")
+    parser.add_argument("--chat-id", type=int, default=chat_padrao, help="chat_id usado com --texto")
+    parser.add_argument("--url", default=f"http://{WEBHOOK_HOST}:{WEBHOOK_PORTA}{WEBHOOK_CAMINHO}")
+    parser.add_argument("--token", default=WEBHOOK_SECRET_TOKEN, help="Secret token do webhook")
+    args = parser.parse_args()
+    
+    updates = []
+    for arquivo in args.arquivos:
+        with open(arquivo, encoding="utf-8") as f:
+            dados = json.load(f)
+        updates.extend(dados if isinstance(dados, list) else [dados])
+    
+    if args.texto:
+        updates.append(criar_update_texto(args.texto, args.chat_id, int(time.time())))
+    
+    if not updates:
+        parser.error("Informe ao menos um arquivo JSON ou --texto")
+    
+    for update in updates:
+        status, ms = enviar_update(args.url, update, args.token)
+        print(f"update_id={update.get('update_id')} -> HTTP {status} em {ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Verifica o plano de execução das consultas frequentes do banco SQLite.
+
+Aplica as migrações a um banco (por padrão, um banco vazio e temporário; com --db, uma cópia
+do banco informado, que não é alterado) e roda EXPLAIN QUERY PLAN em cada consulta usada
+pelos repositórios. Falha (código de saída 1) se alguma delas percorrer a tabela inteira ou
+precisar ordenar o resultado em uma B-tree temporária:
+
+    python scripts/verificar_planos_consultas.py
+    python scripts/verificar_planos_consultas.py --db var/db/cerebro.db
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Chaves fictícias: as configurações são validadas na importação de alguns módulos
+os.environ.setdefault("TELEGRAM_API_KEY", "123456:verificacao")
+os.environ.setdefault("OPENAI_API_KEY", "sk-verificacao")
+
+# Colunas da listagem paginada do /listar (o conteúdo é cortado no banco)
+COLUNAS_LISTAGEM = "SELECT id, chat_id, resumo, substr(conteudo, 1, 51) AS conteudo_inicio FROM ideias"
+
+# Consultas frequentes dos repositórios (mantenha em sincronia com idea_repository.py e
+# brainstorm_repository.py): nome -> (SQL, parâmetros, permite varrer a tabela)
+CONSULTAS = {
+    "listar ideias do chat (primeira página)": (
+        f"{COLUNAS_LISTAGEM} WHERE chat_id = ? ORDER BY id DESC LIMIT ?",
+        (1, 11), False
+    ),
+    "listar ideias do chat (página seguinte)": (
+        f"{COLUNAS_LISTAGEM} WHERE chat_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+        (1, 100, 11), False
+    ),
+    "listar ideias do chat (página anterior)": (
+        f"{COLUNAS_LISTAGEM} WHERE chat_id = ? AND id > ? ORDER BY id ASC LIMIT ?",
+        (1, 100, 11), False
+    ),
+    # Sem cursor, a primeira página do superusuário percorre a tabela pela chave primária,
+    # mas o LIMIT encerra a leitura nas primeiras linhas
+    "listar todas as ideias (primeira página)": (
+        f"{COLUNAS_LISTAGEM} ORDER BY id DESC LIMIT ?",
+        (11,), True
+    ),
+    "listar todas as ideias (página seguinte)": (
+        f"{COLUNAS_LISTAGEM} WHERE id < ? ORDER BY id DESC LIMIT ?",
+        (100, 11), False
+    ),
+    "obter ideia": ("SELECT * FROM ideias WHERE id = ? AND chat_id = ?", (1, 1), False),
+    "obter ideia por id": ("SELECT * FROM ideias WHERE id = ?", (1,), False),
+    "brainstorms da ideia": (
+        "SELECT * FROM brainstorms WHERE ideia_id = ? ORDER BY data_criacao DESC",
+        (1,), False
+    ),
+    "obter brainstorm": ("SELECT * FROM brainstorms WHERE id = ?", (1,), False),
+    "apagar brainstorms da ideia": ("DELETE FROM brainstorms WHERE ideia_id = ?", (1,), False),
+}
+
+def problemas_do_plano(plano, permite_varredura):
+    """
+    Retorna os passos do plano que indicam varredura completa ou ordenação temporária.
+    """
+    problemas = []
+    for passo in plano:
+        # Um "SCAN" com índice que cobre a consulta lê só o índice; sem índice, lê a tabela toda
+        varredura = passo.startswith("SCAN ") and "COVERING INDEX" not in passo
+        if (varredura and not permite_varredura) or "USE TEMP B-TREE" in passo:
+            problemas.append(passo)
+    return problemas
+
+def main():
+    """Aplica as migrações, verifica os planos e imprime o relatório."""
+    parser = argparse.ArgumentParser(description="Verifica se as consultas frequentes usam índices.")
+    parser.add_argument("--db", help="Banco SQLite a verificar (uma cópia é migrada e verificada)")
+    args = parser.parse_args()
+    
+    from src.database.connection_manager import ConnectionManager
+    from src.database.schema_migrator import SchemaMigrator
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "cerebro.db")
+        if args.db:
+            shutil.copyfile(args.db, caminho)
+        
+        conexoes = ConnectionManager(caminho)
+        migrator = SchemaMigrator(conexoes)
+        migrator.aplicar()
+        print(f"Esquema na versão {migrator.versao_atual()}\n")
+        
+        falhas = 0
+        for nome, (sql, parametros, permite_varredura) in CONSULTAS.items():
+            plano = [row["detail"] for row in conexoes.consultar(f"EXPLAIN QUERY PLAN {sql}", parametros)]
+            problemas = problemas_do_plano(plano, permite_varredura)
+            falhas += bool(problemas)
+            print(f"{'FALHA' if problemas else 'ok':5s} {nome}")
+            for passo in plano:
+                print(f"      {'!' if passo in problemas else ' '} {passo}")
+        conexoes.fechar()
+    
+    if falhas:
+        print(f"\n{falhas} consulta(s) sem índice adequado")
+        sys.exit(1)
+    print("\nNenhuma consulta frequente percorre a tabela inteira")
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,12 @@
 Utilitários para o bot Telegram.
 """
 import logging
-from telegram import Update
+from typing import Any
+
+from telegram import Message, Update
 
 from src.config.settings import MY_CHAT_ID, SUPERUSERS_CHAT_ID
+from src.utils.async_runtime import async_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -66,3 +69,45 @@ def is_superuser(chat_id: int) -> bool:
         return chat_id in SUPERUSERS_CHAT_ID
     else:
         return chat_id == SUPERUSERS_CHAT_ID
+
+async def responder(update: Update, texto: str, **kwargs: Any) -> Message:
+    """
+    Responde à mensagem do usuário sem bloquear o event loop.
+    
+    Args:
+        update: Objeto Update do Telegram
+        texto: Texto da resposta
+        **kwargs: Argumentos adicionais para reply_text (ex: parse_mode)
+        
+    Returns:
+        Message: Mensagem enviada
+    """
+    return await async_runtime.em_thread(update.message.reply_text, texto, **kwargs)
+
+async def editar(mensagem: Message, texto: str, **kwargs: Any) -> Any:
+    """
+    Edita uma mensagem já enviada sem bloquear o event loop.
+    
+    Args:
+        mensagem: Mensagem a ser editada
+        texto: Novo texto da mensagem
+        **kwargs: Argumentos adicionais para edit_text (ex: parse_mode)
+        
+    Returns:
+        Any: Resultado de edit_text
+    """
+    return await async_runtime.em_thread(mensagem.edit_text, texto, **kwargs)
+
+async def enviar_no_chat(mensagem: Message, texto: str, **kwargs: Any) -> Message:
+    """
+    Envia uma nova mensagem no chat de uma mensagem já enviada sem bloquear o event loop.
+    
+    Args:
+        mensagem: Mensagem do chat de destino
+        texto: Texto da nova mensagem
+        **kwargs: Argumentos adicionais para send_message (ex: parse_mode)
+        
+    Returns:
+        Message: Mensagem enviada
+    """
+    return await async_runtime.em_thread(mensagem.chat.send_message, texto, **kwargs)
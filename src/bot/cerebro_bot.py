@@ -3,13 +3,29 @@ Implementação principal do bot Telegram Cerebro.
 """
 import logging
 import os
+import signal
+import threading
 from typing import Dict, Any
 
-from telegram.ext import Updater, CommandHandler, MessageHandler, Filters
+from telegram import Update
+from telegram.ext import Updater, CommandHandler, CallbackQueryHandler, MessageHandler, Filters
 
-from src.config.settings import TELEGRAM_API_KEY
-from src.bot.command_handlers import start, listar_ideias, ver_ideia, apagar_ideia, listar_comandos, refazer_brainstorm
+from src.config.settings import (
+    validar_configuracao, TELEGRAM_API_KEY, BOT_MODO_RECEBIMENTO, WEBHOOK_URL_PUBLICA, WEBHOOK_HOST, WEBHOOK_PORTA,
+    WEBHOOK_CAMINHO, WEBHOOK_MAX_CONEXOES, WEBHOOK_SECRET_TOKEN, HTTP_AQUECER_CONEXOES, USE_SUPABASE
+)
+from src.bot.chat_scheduler import em_ordem
+from src.bot.command_handlers import (
+    start, listar_ideias, navegar_ideias, ver_ideia, apagar_ideia, listar_comandos, refazer_brainstorm, mostrar_metricas
+)
 from src.bot.message_handlers import handle_message
+from src.bot.webhook_server import WebhookServer
+from src.database.connection_manager import connection_manager
+from src.database.schema_migrator import schema_migrator
+from src.utils.async_runtime import async_runtime
+from src.utils.http_pool import http_pool
+from src.utils.lazy import LazyInstance
+from src.utils.process_pool import audio_pool
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +38,21 @@ class CerebroBot:
         """
         Inicializa o bot Telegram.
         """
-        self.updater = Updater(token=TELEGRAM_API_KEY, use_context=True)
+        validar_configuracao()
+        
+        # Atualiza o esquema do banco local antes de atender a primeira mensagem
+        if not USE_SUPABASE:
+            schema_migrator.aplicar()
+        
+        self.updater = Updater(
+            token=TELEGRAM_API_KEY,
+            use_context=True,
+            request_kwargs=http_pool.telegram_request_kwargs()
+        )
         self.dispatcher = self.updater.dispatcher
+        self.webhook_server = None
+        self._parar_evento = threading.Event()
+        self._parado = False
         
         # Registra os handlers
         self._register_handlers()
@@ -35,13 +64,17 @@ class CerebroBot:
         Registra os handlers para comandos e mensagens.
         """
         # Handlers de comandos
-        self.dispatcher.add_handler(CommandHandler("start", start))
-        self.dispatcher.add_handler(CommandHandler("listar", listar_ideias))
-        self.dispatcher.add_handler(CommandHandler("ver", ver_ideia))
-        self.dispatcher.add_handler(CommandHandler("apagar", apagar_ideia))
-        self.dispatcher.add_handler(CommandHandler("refazer", refazer_brainstorm))
-        self.dispatcher.add_handler(CommandHandler("comandos", listar_comandos))
-        self.dispatcher.add_handler(CommandHandler("help", listar_comandos))  # Alias para /comandos
+        # Os comandos passam pela fila do chat para manter a ordem com as mensagens
+        # (ex: o "sim" que confirma um /apagar nunca é processado antes dele)
+        self.dispatcher.add_handler(CommandHandler("start", em_ordem(start)))
+        self.dispatcher.add_handler(CommandHandler("listar", em_ordem(listar_ideias)))
+        self.dispatcher.add_handler(CallbackQueryHandler(em_ordem(navegar_ideias), pattern=r"^listar:"))
+        self.dispatcher.add_handler(CommandHandler("ver", em_ordem(ver_ideia)))
+        self.dispatcher.add_handler(CommandHandler("apagar", em_ordem(apagar_ideia)))
+        self.dispatcher.add_handler(CommandHandler("refazer", em_ordem(refazer_brainstorm)))
+        self.dispatcher.add_handler(CommandHandler("metricas", em_ordem(mostrar_metricas)))
+        self.dispatcher.add_handler(CommandHandler("comandos", em_ordem(listar_comandos)))
+        self.dispatcher.add_handler(CommandHandler("help", em_ordem(listar_comandos)))  # Alias para /comandos
         
         # Handler para mensagens de texto e áudio
         self.dispatcher.add_handler(MessageHandler(
@@ -52,10 +85,18 @@ class CerebroBot:
     
     def start(self) -> None:
         """
-        Inicia o bot em modo de polling.
+        Inicia o bot no modo de recebimento configurado (polling ou webhook).
         """
-        logger.info("Iniciando o bot...")
-        self.updater.start_polling()
+        logger.info(f"Iniciando o bot em modo {BOT_MODO_RECEBIMENTO}...")
+        
+        # Abre as conexões com os serviços externos em segundo plano
+        if HTTP_AQUECER_CONEXOES:
+            async_runtime.submeter(http_pool.aquecer(self.updater.bot.get_me))
+        
+        if BOT_MODO_RECEBIMENTO == "webhook":
+            self._iniciar_webhook()
+        else:
+            self.updater.start_polling()
         
         # Salva o PID para facilitar o gerenciamento do processo
         with open(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cerebro.pid"), "w") as f:
@@ -64,16 +105,85 @@ class CerebroBot:
         logger.info(f"Bot iniciado com PID {os.getpid()}")
         
         # Bloqueia até que o processo seja interrompido
-        self.updater.idle()
+        if BOT_MODO_RECEBIMENTO == "webhook":
+            self._aguardar_sinal()
+        else:
+            # O idle() para o updater ao receber o sinal; o restante é encerrado pelo stop()
+            self.updater.idle()
+            self.stop()
+    
+    def _iniciar_webhook(self) -> None:
+        """
+        Sobe o servidor HTTP embutido, inicia o dispatcher e registra o webhook no Telegram.
+        """
+        if not WEBHOOK_SECRET_TOKEN:
+            logger.error("WEBHOOK_SECRET_TOKEN não está definido; o modo webhook exige um token secreto")
+            raise ValueError("WEBHOOK_SECRET_TOKEN não está definido ou está vazio!")
+        
+        # O dispatcher consome a update_queue em sua própria thread
+        threading.Thread(target=self.dispatcher.start, name="dispatcher", daemon=True).start()
+        
+        self.webhook_server = WebhookServer(
+            WEBHOOK_HOST,
+            WEBHOOK_PORTA,
+            WEBHOOK_CAMINHO,
+            WEBHOOK_SECRET_TOKEN,
+            self._entregar_update
+        )
+        self.webhook_server.iniciar()
+        
+        if WEBHOOK_URL_PUBLICA:
+            self.updater.bot.set_webhook(
+                url=WEBHOOK_URL_PUBLICA.rstrip("/") + WEBHOOK_CAMINHO,
+                max_connections=WEBHOOK_MAX_CONEXOES,
+                api_kwargs={"secret_token": WEBHOOK_SECRET_TOKEN}
+            )
+            logger.info(f"Webhook registrado no Telegram: {WEBHOOK_URL_PUBLICA}")
+        else:
+            logger.warning("WEBHOOK_URL_PUBLICA não definida; o webhook não foi registrado no Telegram")
+    
+    def _entregar_update(self, dados: Dict[str, Any]) -> None:
+        """
+        Converte o JSON recebido pelo webhook e o coloca na fila do dispatcher.
+        
+        Args:
+            dados: JSON do update enviado pelo Telegram
+        """
+        self.dispatcher.update_queue.put(Update.de_json(dados, self.updater.bot))
+    
+    def _aguardar_sinal(self) -> None:
+        """
+        Bloqueia até receber SIGINT, SIGTERM ou SIGABRT e então para o bot.
+        """
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGABRT):
+            signal.signal(sig, lambda signum, frame: self._parar_evento.set())
+        
+        while not self._parar_evento.wait(1):
+            pass
+        
+        self.stop()
     
     def stop(self) -> None:
         """
-        Para o bot.
+        Para o bot. Chamadas seguintes não têm efeito.
         """
+        if self._parado:
+            return
+        self._parado = True
+        
         logger.info("Parando o bot...")
-        self.updater.stop()
+        if self.webhook_server:
+            self.webhook_server.parar()
+        # No polling, o updater já foi parado pelo idle() ao receber o sinal
+        if self.updater.running or self.dispatcher.has_running_threads:
+            self.updater.stop()
+        if audio_pool.construida:
+            audio_pool.encerrar()
+        connection_manager.fechar()
+        async_runtime.executar(http_pool.fechar(), timeout=5)
+        async_runtime.parar()
         logger.info("Bot parado com sucesso")
 
 
-# Instância global do bot
-cerebro_bot = CerebroBot()
+# Instância global do bot (construída no primeiro uso)
+cerebro_bot = LazyInstance(CerebroBot)
@@ -0,0 +1,189 @@
+"""
+Agendador de updates por chat do bot Cerebro.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+from telegram import Update
+from telegram.ext import CallbackContext
+
+from src.config.settings import (
+    ASYNC_MODE, SCHEDULER_MAX_WORKERS, SCHEDULER_MAX_FILA_POR_CHAT, SCHEDULER_MAX_FILA_GLOBAL
+)
+from src.utils.async_runtime import async_runtime
+
+logger = logging.getLogger(__name__)
+
+# Resultados possíveis ao enfileirar um update
+ACEITO = "aceito"
+FILA_CHAT_CHEIA = "fila_chat_cheia"
+FILA_GLOBAL_CHEIA = "fila_global_cheia"
+
+# Respostas enviadas ao usuário quando o update é recusado
+MENSAGENS_SOBRECARGA = {
+    FILA_CHAT_CHEIA: (
+        "⏳ Você enviou muitas mensagens seguidas. "
+        "Aguarde eu responder as anteriores e tente novamente."
+    ),
+    FILA_GLOBAL_CHEIA: (
+        "⏳ Estou sobrecarregado no momento. "
+        "Por favor, tente novamente em alguns instantes."
+    ),
+}
+
+class ChatScheduler:
+    """
+    Mantém uma fila ordenada de trabalhos por chat_id.
+    
+    Trabalhos do mesmo chat rodam um de cada vez, na ordem de chegada, de forma que
+    um "sim" nunca é processado antes da IDEIA que ele confirma. Chats diferentes rodam
+    em paralelo, limitados por um pool global de workers.
+    """
+    
+    def __init__(
+        self,
+        max_workers: int = SCHEDULER_MAX_WORKERS,
+        max_fila_por_chat: int = SCHEDULER_MAX_FILA_POR_CHAT,
+        max_fila_global: int = SCHEDULER_MAX_FILA_GLOBAL
+    ):
+        """
+        Inicializa o agendador.
+        
+        Args:
+            max_workers: Máximo de trabalhos executando ao mesmo tempo (todos os chats)
+            max_fila_por_chat: Máximo de trabalhos pendentes por chat
+            max_fila_global: Máximo de trabalhos pendentes somando todos os chats
+        """
+        self.max_workers = max_workers
+        self.max_fila_por_chat = max_fila_por_chat
+        self.max_fila_global = max_fila_global
+        self._filas: Dict[int, Deque[Callable[[], Awaitable[Any]]]] = {}
+        self._ativos: Set[int] = set()
+        self._pendentes = 0
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+    
+    def enfileirar(self, chat_id: int, fabrica: Callable[[], Awaitable[Any]]) -> str:
+        """
+        Adiciona um trabalho à fila do chat. Pode ser chamado de qualquer thread.
+        
+        Args:
+            chat_id: ID do chat dono do trabalho
+            fabrica: Função sem argumentos que cria a corrotina do trabalho
+            
+        Returns:
+            str: ACEITO, FILA_CHAT_CHEIA ou FILA_GLOBAL_CHEIA
+        """
+        with self._lock:
+            fila = self._filas.setdefault(chat_id, deque())
+            
+            if len(fila) >= self.max_fila_por_chat:
+                logger.warning(f"Fila do chat {chat_id} cheia ({len(fila)} trabalhos)")
+                return FILA_CHAT_CHEIA
+            
+            if self._pendentes >= self.max_fila_global:
+                if not fila and chat_id not in self._ativos:
+                    del self._filas[chat_id]
+                logger.warning(f"Fila global cheia ({self._pendentes} trabalhos)")
+                return FILA_GLOBAL_CHEIA
+            
+            fila.append(fabrica)
+            self._pendentes += 1
+            
+            iniciar = chat_id not in self._ativos
+            if iniciar:
+                self._ativos.add(chat_id)
+        
+        if iniciar:
+            asyncio.run_coroutine_threadsafe(self._drenar(chat_id), async_runtime.loop)
+        
+        return ACEITO
+    
+    def agendar(self, update: Update, fabrica: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Enfileira o trabalho de um update e avisa o usuário se ele for recusado.
+        
+        Args:
+            update: Objeto Update do Telegram
+            fabrica: Função sem argumentos que cria a corrotina do trabalho
+            
+        Returns:
+            bool: True se o trabalho foi aceito
+        """
+        resultado = self.enfileirar(update.effective_chat.id, fabrica)
+        
+        if resultado != ACEITO:
+            update.effective_message.reply_text(MENSAGENS_SOBRECARGA[resultado])
+            return False
+        
+        return True
+    
+    def estatisticas(self) -> Dict[str, int]:
+        """
+        Retorna a situação atual das filas.
+        
+        Returns:
+            Dict[str, int]: Trabalhos pendentes, chats ativos e maior fila
+        """
+        with self._lock:
+            return {
+                "pendentes": self._pendentes,
+                "chats_ativos": len(self._ativos),
+                "maior_fila": max((len(fila) for fila in self._filas.values()), default=0),
+            }
+    
+    async def _drenar(self, chat_id: int) -> None:
+        """
+        Executa, em ordem, os trabalhos pendentes de um chat até a fila esvaziar.
+        
+        Args:
+            chat_id: ID do chat
+        """
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_workers)
+        
+        while True:
+            with self._lock:
+                fila = self._filas.get(chat_id)
+                if not fila:
+                    self._filas.pop(chat_id, None)
+                    self._ativos.discard(chat_id)
+                    return
+                fabrica = fila.popleft()
+            
+            try:
+                async with self._semaforo:
+                    await fabrica()
+            except Exception as e:
+                logger.error(f"Erro ao processar trabalho do chat {chat_id}: {e}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._pendentes -= 1
+
+
+# Instância global do agendador
+chat_scheduler = ChatScheduler()
+
+def em_ordem(callback: Callable[[Update, CallbackContext], Any]) -> Callable[[Update, CallbackContext], None]:
+    """
+    Adapta um handler síncrono para rodar na fila do chat, preservando a ordem
+    em relação às mensagens de texto e áudio.
+    
+    Args:
+        callback: Handler síncrono do python-telegram-bot
+        
+    Returns:
+        Callable: Handler que apenas enfileira o callback original
+    """
+    @functools.wraps(callback)
+    def wrapper(update: Update, context: CallbackContext) -> None:
+        if not ASYNC_MODE:
+            callback(update, context)
+            return
+        chat_scheduler.agendar(update, lambda: async_runtime.em_thread(callback, update, context))
+    
+    return wrapper
@@ -2,18 +2,31 @@
 Handlers para comandos do bot Telegram.
 """
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
-from telegram import Update, ParseMode
+from telegram import Update, ParseMode, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import CallbackContext
 
 from src.bot.bot_utils import check_authorization, is_superuser
+from src.config.settings import LISTAR_IDEIAS_POR_PAGINA, LISTAR_DESCRICAO_MAX
 from src.database.idea_repository import idea_repository
 from src.database.brainstorm_repository import brainstorm_repository
 from src.services.openai_service import openai_service
+from src.services.local_classifier import local_classifier
+from src.services.model_router import model_router
+from src.services.response_cache import response_cache
+from src.services.speculative_brainstorm import speculative_brainstorm
+from src.transcription.transcription_cache import transcription_cache
+from src.utils.metricas import metricas
+from src.utils.resiliencia import resiliencia
 
 logger = logging.getLogger(__name__)
 
+# Respostas do /listar quando não há ideias ou quando a consulta falha
+MENSAGEM_SEM_IDEIAS = "Você ainda não tem ideias salvas. Envie uma mensagem com sua ideia para começar!"
+MENSAGEM_ERRO_LISTAGEM = "❌ Não foi possível listar suas ideias agora. Tente novamente mais tarde."
+
 def start(update: Update, context: CallbackContext) -> None:
     """
     Envia mensagem de boas-vindas ao usuário.
@@ -40,7 +53,7 @@ def start(update: Update, context: CallbackContext) -> None:
 
 def listar_ideias(update: Update, context: CallbackContext) -> None:
     """
-    Lista as ideias salvas no banco de dados.
+    Lista as ideias salvas no banco de dados, uma página por vez.
     
     Args:
         update: Objeto Update do Telegram
@@ -50,13 +63,92 @@ def listar_ideias(update: Update, context: CallbackContext) -> None:
         update.message.reply_text("Você não está autorizado a usar este bot.")
         return
     
+    chat_id = update.effective_chat.id
+    pagina = _pagina_de_ideias(chat_id, is_superuser(chat_id))
+    
+    if pagina is None:
+        update.message.reply_text(MENSAGEM_SEM_IDEIAS)
+        return
+    
+    mensagem, teclado = pagina
+    update.message.reply_text(mensagem, parse_mode=ParseMode.MARKDOWN, reply_markup=teclado)
+
+def navegar_ideias(update: Update, context: CallbackContext) -> None:
+    """
+    Mostra outra página do /listar quando um dos botões de navegação é pressionado.
+    
+    Args:
+        update: Objeto Update do Telegram (com o callback_query do botão)
+        context: Contexto do callback
+    """
+    query = update.callback_query
+    if not check_authorization(update):
+        query.answer("Você não está autorizado a usar este bot.")
+        return
+    query.answer()
+    
+    # O botão carrega a direção e o ID da ideia na borda da página atual (ex: "listar:antes:42")
+    _, direcao, cursor = query.data.split(":")
     chat_id = update.effective_chat.id
     superuser = is_superuser(chat_id)
-    ideias = idea_repository.listar_ideias(chat_id, superuser)
     
+    if direcao == "antes":
+        pagina = _pagina_de_ideias(chat_id, superuser, antes_de=int(cursor))
+    else:
+        pagina = _pagina_de_ideias(chat_id, superuser, depois_de=int(cursor))
+    
+    # As ideias da página foram apagadas desde a listagem: volta para a primeira página
+    if pagina is None:
+        pagina = _pagina_de_ideias(chat_id, superuser)
+    
+    try:
+        if pagina is None:
+            query.edit_message_text(MENSAGEM_SEM_IDEIAS)
+        else:
+            mensagem, teclado = pagina
+            query.edit_message_text(mensagem, parse_mode=ParseMode.MARKDOWN, reply_markup=teclado)
+    except BadRequest as e:
+        # Dois toques no mesmo botão pedem a mesma página
+        if "not modified" not in str(e).lower():
+            raise
+
+def _pagina_de_ideias(
+    chat_id: int,
+    superuser: bool,
+    antes_de: Optional[int] = None,
+    depois_de: Optional[int] = None
+) -> Optional[Tuple[str, Optional[InlineKeyboardMarkup]]]:
+    """
+    Monta o texto e os botões de navegação de uma página do /listar.
+    Busca uma ideia além do tamanho da página para saber se existe outra página na mesma direção.
+    
+    Args:
+        chat_id: ID do chat do usuário
+        superuser: Se o usuário é um superusuário (lista as ideias de todos)
+        antes_de: Mostra as ideias mais antigas que esta (página seguinte)
+        depois_de: Mostra as ideias mais recentes que esta (página anterior)
+        
+    Returns:
+        Optional[Tuple[str, Optional[InlineKeyboardMarkup]]]: Mensagem e botões (a mensagem de erro, sem
+        botões, se a consulta falhar), ou None se a página estiver vazia
+    """
+    ideias = idea_repository.listar_pagina_ideias(
+        chat_id, superuser, antes_de, depois_de, LISTAR_IDEIAS_POR_PAGINA + 1
+    )
+    if ideias is None:
+        return MENSAGEM_ERRO_LISTAGEM, None
     if not ideias:
-        update.message.reply_text("Você ainda não tem ideias salvas. Envie uma mensagem com sua ideia para começar!")
-        return
+        return None
+    
+    if depois_de is not None:
+        # Voltando: a ideia extra é a mais recente, e as mais antigas são a página de onde se veio
+        tem_recentes = len(ideias) > LISTAR_IDEIAS_POR_PAGINA
+        tem_antigas = True
+        ideias = ideias[-LISTAR_IDEIAS_POR_PAGINA:]
+    else:
+        tem_recentes = antes_de is not None
+        tem_antigas = len(ideias) > LISTAR_IDEIAS_POR_PAGINA
+        ideias = ideias[:LISTAR_IDEIAS_POR_PAGINA]
     
     # Formata a lista de ideias
     if superuser:
@@ -64,10 +156,10 @@ def listar_ideias(update: Update, context: CallbackContext) -> None:
     else:
         mensagem = "📋 *Suas ideias salvas:*\n\n"
     for ideia in ideias:
-        # Limita o tamanho da descrição para a listagem
-        descricao = ideia['conteudo']
-        if len(descricao) > 50:
-            descricao = descricao[:47] + "..."
+        # O banco já corta o conteúdo; um caractere além do limite indica que o texto continua
+        descricao = ideia['conteudo_inicio']
+        if len(descricao) > LISTAR_DESCRICAO_MAX:
+            descricao = descricao[:LISTAR_DESCRICAO_MAX - 3] + "..."
         
         # Para superusuários, mostra também o chat_id do autor
         if superuser and 'chat_id' in ideia and ideia['chat_id'] != chat_id:
@@ -77,7 +169,13 @@ def listar_ideias(update: Update, context: CallbackContext) -> None:
     
     mensagem += "\nUse /ver [id] para ver os detalhes de uma ideia específica."
     
-    update.message.reply_text(mensagem, parse_mode=ParseMode.MARKDOWN)
+    botoes = []
+    if tem_recentes:
+        botoes.append(InlineKeyboardButton("⬅️ Mais recentes", callback_data=f"listar:depois:{ideias[0]['id']}"))
+    if tem_antigas:
+        botoes.append(InlineKeyboardButton("Mais antigas ➡️", callback_data=f"listar:antes:{ideias[-1]['id']}"))
+    
+    return mensagem, InlineKeyboardMarkup([botoes]) if botoes else None
 
 def ver_ideia(update: Update, context: CallbackContext) -> None:
     """
@@ -254,21 +352,24 @@ def refazer_brainstorm(update: Update, context: CallbackContext) -> None:
         update.message.reply_text(f"Ideia com ID {ideia_id} não encontrada ou não pertence a você.")
         return
     
-    # Verifica se a ideia tem brainstorms
+    # Brainstorms existentes (uma ideia sem brainstorm, ex: geração que falhou, ganha o primeiro)
     brainstorms = brainstorm_repository.obter_brainstorms_por_ideia(ideia_id)
-    if not brainstorms:
-        update.message.reply_text(f"A ideia com ID {ideia_id} não tem brainstorms para refazer.")
-        return
     
     # Envia mensagem de processamento
     processing_message = update.message.reply_text("🧠 Gerando novo brainstorm... Isso pode levar alguns segundos.")
     
-    # Gera um novo brainstorm
-    novo_brainstorm = openai_service.gerar_brainstorm(ideia['conteudo'])
+    # Gera um novo brainstorm (ignorando o cache, já que o usuário pediu outra versão)
+    novo_brainstorm = openai_service.gerar_brainstorm(ideia['conteudo'], usar_cache=False)
+    if not novo_brainstorm:
+        update.message.reply_text(f"❌ Não consegui gerar o brainstorm para a ideia {ideia_id} agora. Tente novamente mais tarde.")
+        return
     
-    # Atualiza o brainstorm mais recente
-    brainstorm_id = brainstorms[0]['id']  # Pega o ID do brainstorm mais recente
-    sucesso = brainstorm_repository.atualizar_brainstorm(brainstorm_id, novo_brainstorm)
+    if brainstorms:
+        # Atualiza o brainstorm mais recente
+        brainstorm_id = brainstorms[0]['id']  # Pega o ID do brainstorm mais recente
+        sucesso = brainstorm_repository.atualizar_brainstorm(brainstorm_id, novo_brainstorm)
+    else:
+        sucesso = brainstorm_repository.salvar_brainstorm(ideia_id, novo_brainstorm) is not None
     
     if sucesso:
         # Formata a mensagem com o novo brainstorm
@@ -283,6 +384,65 @@ def refazer_brainstorm(update: Update, context: CallbackContext) -> None:
     else:
         update.message.reply_text(f"❌ Erro ao atualizar o brainstorm para a ideia {ideia_id}. Tente novamente mais tarde.")
 
+def mostrar_metricas(update: Update, context: CallbackContext) -> None:
+    """
+    Mostra as métricas de latência e de uso de cache (apenas superusuários).
+    
+    Args:
+        update: Objeto Update do Telegram
+        context: Contexto do callback
+    """
+    if not check_authorization(update) or not is_superuser(update.effective_chat.id):
+        update.message.reply_text("Você não está autorizado a usar este comando.")
+        return
+    
+    mensagem = "📊 *Latência por operação* (ms)\n\n"
+    estatisticas = metricas.estatisticas()
+    if not estatisticas:
+        mensagem += "Nenhuma operação registrada ainda.\n"
+    for operacao, valores in estatisticas.items():
+        mensagem += (
+            f"`{operacao}`: n={valores['n']} média={valores['media_ms']:.0f} "
+            f"p50={valores['p50_ms']:.0f} p95={valores['p95_ms']:.0f}\n"
+        )
+    
+    # Só mostra os componentes já construídos, para não criá-los apenas para o relatório
+    if response_cache.construida:
+        mensagem += "\n*Cache de respostas:*\n"
+        for operacao, contadores in response_cache.estatisticas().items():
+            mensagem += f"`{operacao}`: " + " ".join(f"{k}={v}" for k, v in contadores.items()) + "\n"
+    
+    if transcription_cache.construida:
+        mensagem += "\n*Cache de transcrições:*\n"
+        for operacao, contadores in transcription_cache.estatisticas().items():
+            mensagem += f"`{operacao}`: " + " ".join(f"{k}={v}" for k, v in contadores.items()) + "\n"
+    
+    if local_classifier.construida:
+        decisoes = local_classifier.estatisticas()["decisoes"]
+        mensagem += f"\n*Classificador local:* {decisoes['local']} locais, {decisoes['llm']} pela OpenAI\n"
+    
+    especulacao = speculative_brainstorm.estatisticas()
+    if especulacao["iniciadas"]:
+        mensagem += (
+            f"\n*Brainstorm especulativo:* {especulacao['iniciadas']} iniciados, "
+            f"{especulacao['taxa_acerto']:.0%} aproveitados, ~{especulacao['tokens_desperdicados']} tokens desperdiçados\n"
+        )
+    
+    mensagem += "\n*Rotas de modelo:*\n"
+    for operacao, rota in model_router.estado().items():
+        percentis = ""
+        if rota["p95_ms"] is not None:
+            percentis = f" p50={rota['p50_ms']:.0f} p95={rota['p95_ms']:.0f}"
+        rebaixada = " (fallback)" if rota["rebaixada"] else ""
+        mensagem += f"`{operacao}`: {rota['modelo']}{rebaixada}{percentis}\n"
+    
+    mensagem += "\n*Serviços externos:*\n"
+    mensagem += " ".join(f"`{nome}`={estado}" for nome, estado in resiliencia.estado_circuitos().items()) + "\n"
+    for evento, valor in metricas.contadores().items():
+        mensagem += f"`{evento}`: {valor}\n"
+    
+    update.message.reply_text(mensagem, parse_mode=ParseMode.MARKDOWN)
+
 def listar_comandos(update: Update, context: CallbackContext) -> None:
     """
     Lista todos os comandos disponíveis no bot.
@@ -2,19 +2,38 @@
 Handlers para mensagens de texto do bot Telegram.
 """
 import logging
+import time
 from typing import Optional
 
 from telegram import Update, ParseMode
 from telegram.ext import CallbackContext
 
-from src.bot.bot_utils import check_authorization
+from src.bot.bot_utils import check_authorization, responder
+from src.bot.chat_scheduler import chat_scheduler
+from src.bot.stream_editor import StreamEditor
+from src.config.settings import ASYNC_MODE, STREAMING_HABILITADO, CLASSIFICACAO_FUNDIDA, BRAINSTORM_ESPECULATIVO
 from src.database.idea_repository import idea_repository
 from src.database.brainstorm_repository import brainstorm_repository
+from src.services.local_classifier import resumir_localmente
 from src.services.openai_service import openai_service
+from src.services.speculative_brainstorm import speculative_brainstorm
+from src.utils.async_runtime import async_runtime
+from src.utils.metricas import metricas
 
 logger = logging.getLogger(__name__)
 
 def process_message(update: Update, context: CallbackContext, message_text: str) -> None:
+    """
+    Processa uma mensagem de texto (versão síncrona).
+    
+    Args:
+        update: Objeto Update do Telegram
+        context: Contexto do callback
+        message_text: Texto da mensagem a ser processada
+    """
+    async_runtime.executar(process_message_async(update, context, message_text))
+
+async def process_message_async(update: Update, context: CallbackContext, message_text: str) -> None:
     """
     Processa uma mensagem de texto.
     
@@ -24,22 +43,40 @@ def process_message(update: Update, context: CallbackContext, message_text: str)
         message_text: Texto da mensagem a ser processada
     """
     if not message_text:
-        update.message.reply_text("Não consegui entender sua mensagem. Por favor, tente novamente.")
+        await responder(update, "Não consegui entender sua mensagem. Por favor, tente novamente.")
         return
     
     # Verifica se é uma resposta a uma pergunta anterior
     if 'esperando_confirmacao_brainstorm' in context.user_data:
-        handle_brainstorm_response(update, context)
+        await handle_brainstorm_response_async(update, context)
         return
     
     # Verifica se é uma confirmação para apagar uma ideia
     if 'ideia_para_apagar' in context.user_data:
         from src.bot.command_handlers import confirmar_apagar_ideia
-        confirmar_apagar_ideia(update, context)
+        await async_runtime.em_thread(confirmar_apagar_ideia, update, context)
         return
     
-    # Classifica a mensagem
-    classificacao, categoria, acao = openai_service.classificar_mensagem(message_text)
+    inicio = time.perf_counter()
+    editor: Optional[StreamEditor] = None
+    resposta: Optional[str] = None
+    
+    async def transmitir_resposta(parcial: str) -> None:
+        # Na primeira parte da resposta, envia a mensagem de processamento que será editada
+        nonlocal editor
+        if editor is None:
+            processing_message = await responder(update, "🤔 Processando sua pergunta... Aguarde um momento.")
+            editor = StreamEditor(processing_message, cabecalho="*Resposta:*\n\n")
+        await editor.atualizar(parcial)
+    
+    # Classifica a mensagem (e, no modo fundido, já responde se for uma questão)
+    if CLASSIFICACAO_FUNDIDA:
+        classificacao, categoria, acao, resposta = await openai_service.classificar_e_responder_async(
+            message_text,
+            ao_receber=transmitir_resposta if STREAMING_HABILITADO else None
+        )
+    else:
+        classificacao, categoria, acao = await openai_service.classificar_mensagem_async(message_text)
     
     logger.info(f"Mensagem classificada: {classificacao} | Categoria: {categoria} | Ação: {acao}")
     
@@ -48,36 +85,67 @@ def process_message(update: Update, context: CallbackContext, message_text: str)
         chat_id = update.effective_chat.id
         
         # Usa o tipo, categoria e ação para salvar a ideia
+        # (classificada localmente, a ideia vem sem resumo e recebe um provisório)
         tipo = classificacao.lower()
-        resumo = categoria
-        ideia_id = idea_repository.salvar_ideia(message_text, chat_id, tipo, resumo)
+        resumo = categoria or resumir_localmente(message_text)
+        ideia_id = await async_runtime.em_thread(idea_repository.salvar_ideia, message_text, chat_id, tipo, resumo)
         
         if ideia_id:
+            # O resumo provisório é trocado pelo da OpenAI sem atrasar a resposta
+            if categoria is None:
+                async_runtime.submeter(completar_resumo(ideia_id, message_text))
+            
             # Pergunta se o usuário quer um brainstorm
             context.user_data['esperando_confirmacao_brainstorm'] = True
             context.user_data['ideia_atual'] = ideia_id
             
-            update.message.reply_text(
+            # Começa o brainstorm antes da resposta do usuário (descartado se ele disser "não")
+            if BRAINSTORM_ESPECULATIVO:
+                speculative_brainstorm.iniciar(ideia_id, message_text)
+            
+            await responder(
+                update,
                 f"✅ Sua ideia foi salva com ID: {ideia_id}\n\n"
                 "Deseja que eu faça um brainstorm para desenvolver esta ideia? Responda com 'sim' ou 'não'."
             )
         else:
-            update.message.reply_text("❌ Erro ao salvar sua ideia. Por favor, tente novamente mais tarde.")
+            await responder(update, "❌ Erro ao salvar sua ideia. Por favor, tente novamente mais tarde.")
     elif classificacao.upper() == "QUESTAO":
-        # Responde à questão usando a API da OpenAI
-        update.message.reply_text("🤔 Processando sua pergunta... Aguarde um momento.")
+        # Classificada localmente (sem resumo), a questão é respondida por uma chamada própria,
+        # mas sem a classificação pela OpenAI: não é nem o fluxo fundido nem o separado
+        if categoria is None:
+            fluxo = "fluxo.questao_local"
+        elif resposta is not None:
+            fluxo = "fluxo.questao_fundida"
+        else:
+            fluxo = "fluxo.questao_separada"
+        
+        if resposta is None:
+            # Responde à questão usando a API da OpenAI
+            processing_message = await responder(update, "🤔 Processando sua pergunta... Aguarde um momento.")
         
-        # Gera a resposta
-        resposta = openai_service.responder_questao(message_text)
+            if STREAMING_HABILITADO:
+                # Edita a mensagem de processamento conforme a resposta chega
+                editor = StreamEditor(processing_message, cabecalho="*Resposta:*\n\n")
+                resposta = await openai_service.responder_questao_async(message_text, ao_receber=editor.atualizar)
+            else:
+                resposta = await openai_service.responder_questao_async(message_text)
         
         # Envia a resposta formatada
-        update.message.reply_text(
-            f"*Resposta:*\n\n{resposta}",
-            parse_mode=ParseMode.MARKDOWN
-        )
+        if editor:
+            await editor.finalizar(f"*Resposta:*\n\n{resposta}")
+        else:
+            await responder(
+                update,
+                f"*Resposta:*\n\n{resposta}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        metricas.registrar(fluxo, time.perf_counter() - inicio)
     else:
         # Responde de acordo com a classificação para outros tipos de mensagem
-        update.message.reply_text(
+        await responder(
+            update,
             f"Entendi sua mensagem como: {classificacao}\n"
             f"Categoria: {categoria}\n"
             f"Ação recomendada: {acao}\n\n"
@@ -85,31 +153,71 @@ def process_message(update: Update, context: CallbackContext, message_text: str)
             "Para fazer uma pergunta, inicie com palavras como 'o que', 'como', 'por que', etc."
         )
 
+async def completar_resumo(ideia_id: int, texto: str) -> None:
+    """
+    Grava o resumo gerado pela OpenAI em uma ideia salva com o resumo provisório.
+    Se a chamada falhar, a ideia mantém o resumo provisório (as primeiras palavras).
+    
+    Args:
+        ideia_id: ID da ideia salva
+        texto: Texto da ideia
+    """
+    resumo = await openai_service.resumir_async(texto)
+    if resumo:
+        await async_runtime.em_thread(idea_repository.atualizar_resumo, ideia_id, resumo)
+
 def handle_message(update: Update, context: CallbackContext) -> None:
     """
     Lida com mensagens de texto ou áudio enviadas pelo usuário.
     
+    Em modo assíncrono (ASYNC_MODE), apenas coloca o processamento na fila do chat
+    e libera o dispatcher imediatamente. Caso contrário, aguarda o processamento terminar.
+    
+    Args:
+        update: Objeto Update do Telegram
+        context: Contexto do callback
+    """
+    if ASYNC_MODE:
+        chat_scheduler.agendar(update, lambda: handle_message_async(update, context))
+    else:
+        async_runtime.executar(handle_message_async(update, context))
+
+async def handle_message_async(update: Update, context: CallbackContext) -> None:
+    """
+    Lida com mensagens de texto ou áudio enviadas pelo usuário.
+    
     Args:
         update: Objeto Update do Telegram
         context: Contexto do callback
     """
     if not check_authorization(update):
-        update.message.reply_text("Você não está autorizado a usar este bot.")
+        await responder(update, "Você não está autorizado a usar este bot.")
         return
     
     # Verifica se a mensagem contém texto
     if update.message.text:
-        process_message(update, context, update.message.text)
+        await process_message_async(update, context, update.message.text)
     # Verifica se a mensagem contém áudio
     elif update.message.voice:
-        from src.bot.voice_handlers import handle_voice_message
-        handle_voice_message(update, context)
+        from src.bot.voice_handlers import handle_voice_message_async
+        await handle_voice_message_async(update, context)
     else:
-        update.message.reply_text(
+        await responder(
+            update,
             "Por favor, envie uma mensagem de texto ou áudio para que eu possa processar sua ideia."
         )
 
 def handle_brainstorm_response(update: Update, context: CallbackContext) -> None:
+    """
+    Lida com a resposta do usuário sobre fazer brainstorm (versão síncrona).
+    
+    Args:
+        update: Objeto Update do Telegram
+        context: Contexto do callback
+    """
+    async_runtime.executar(handle_brainstorm_response_async(update, context))
+
+async def handle_brainstorm_response_async(update: Update, context: CallbackContext) -> None:
     """
     Lida com a resposta do usuário sobre fazer brainstorm.
     
@@ -118,7 +226,7 @@ def handle_brainstorm_response(update: Update, context: CallbackContext) -> None
         context: Contexto do callback
     """
     if not check_authorization(update):
-        update.message.reply_text("Você não está autorizado a usar este bot.")
+        await responder(update, "Você não está autorizado a usar este bot.")
         return
     
     # Verifica se estamos esperando uma confirmação
@@ -134,7 +242,7 @@ def handle_brainstorm_response(update: Update, context: CallbackContext) -> None
     # Obtém o ID da ideia atual
     ideia_id = context.user_data.get('ideia_atual')
     if not ideia_id:
-        update.message.reply_text("Erro ao recuperar sua ideia. Por favor, tente novamente.")
+        await responder(update, "Erro ao recuperar sua ideia. Por favor, tente novamente.")
         return
     
     # Limpa o ID da ideia atual
@@ -144,35 +252,62 @@ def handle_brainstorm_response(update: Update, context: CallbackContext) -> None
     if resposta in ['sim', 's', 'yes', 'y']:
         # Busca a ideia no banco de dados
         chat_id = update.effective_chat.id
-        ideia = idea_repository.obter_ideia(ideia_id, chat_id)
+        ideia = await async_runtime.em_thread(idea_repository.obter_ideia, ideia_id, chat_id)
         
         if not ideia:
-            update.message.reply_text("Erro ao recuperar sua ideia. Por favor, tente novamente.")
+            speculative_brainstorm.descartar(ideia_id)
+            await responder(update, "Erro ao recuperar sua ideia. Por favor, tente novamente.")
             return
         
         # Envia mensagem de processamento
-        processing_message = update.message.reply_text("🧠 Gerando brainstorm... Isso pode levar alguns segundos.")
+        processing_message = await responder(update, "🧠 Gerando brainstorm... Isso pode levar alguns segundos.")
+        
+        # Trecho da ideia exibido acima do brainstorm
+        resumo_ideia = f"*Ideia:* {ideia['conteudo'][:100]}"
+        if len(ideia['conteudo']) > 100:
+            resumo_ideia += "..."
+        resumo_ideia += "\n\n*Brainstorm:*\n\n"
+        
+        # Gera o brainstorm (em streaming, editando a mensagem de processamento)
+        editor = None
+        ao_receber = None
+        if STREAMING_HABILITADO:
+            editor = StreamEditor(processing_message, cabecalho=f"🧠 *Gerando brainstorm...*\n\n{resumo_ideia}")
+            ao_receber = editor.atualizar
         
-        # Gera o brainstorm
-        brainstorm = openai_service.gerar_brainstorm(ideia['conteudo'])
+        # Usa o brainstorm especulativo, se já foi iniciado, e gera um novo caso contrário
+        brainstorm = await speculative_brainstorm.aguardar(ideia_id, ao_receber=ao_receber)
+        if not brainstorm:
+            brainstorm = await openai_service.gerar_brainstorm_async(ideia['conteudo'], ao_receber=ao_receber)
         
-        # Salva o brainstorm no banco de dados
-        brainstorm_id = brainstorm_repository.salvar_brainstorm(ideia_id, brainstorm)
+        # Salva o brainstorm no banco de dados (uma falha na geração nunca é salva)
+        brainstorm_id = None
+        if brainstorm:
+            brainstorm_id = await async_runtime.em_thread(brainstorm_repository.salvar_brainstorm, ideia_id, brainstorm)
         
         if brainstorm_id:
             # Formata a mensagem com o brainstorm
             mensagem = f"✅ *Brainstorm para sua ideia:*\n\n"
-            mensagem += f"*Ideia:* {ideia['conteudo'][:100]}"
-            if len(ideia['conteudo']) > 100:
-                mensagem += "..."
-            mensagem += "\n\n*Brainstorm:*\n\n"
+            mensagem += resumo_ideia
             mensagem += brainstorm
             
-            update.message.reply_text(mensagem, parse_mode=ParseMode.MARKDOWN)
+            if editor:
+                await editor.finalizar(mensagem)
+            else:
+                await responder(update, mensagem, parse_mode=ParseMode.MARKDOWN)
         else:
-            update.message.reply_text("❌ Erro ao salvar o brainstorm. Por favor, tente novamente mais tarde.")
+            if brainstorm:
+                erro = "❌ Erro ao salvar o brainstorm. Por favor, tente novamente mais tarde."
+            else:
+                erro = f"❌ Não consegui gerar o brainstorm agora. Tente novamente mais tarde com /refazer {ideia_id}."
+            if editor:
+                await editor.finalizar(erro)
+            else:
+                await responder(update, erro)
     else:
-        update.message.reply_text(
+        speculative_brainstorm.descartar(ideia_id)
+        await responder(
+            update,
             "Ok, não vou gerar um brainstorm para esta ideia agora.\n"
             "Você pode solicitar um brainstorm mais tarde usando o comando /refazer seguido do ID da ideia."
         )
@@ -0,0 +1,201 @@
+"""
+Edição progressiva de mensagens do Telegram durante respostas em streaming.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from telegram import Message, ParseMode
+from telegram.error import BadRequest, RetryAfter
+
+from src.bot.bot_utils import editar, enviar_no_chat
+from src.config.settings import STREAMING_INTERVALO_EDICAO, STREAMING_MIN_CARACTERES
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo do texto de uma mensagem do Telegram
+LIMITE_MENSAGEM = 4096
+
+def markdown_incompleto(texto: str) -> bool:
+    """
+    Verifica se um texto parcial tem marcações Markdown ainda não fechadas.
+    
+    Args:
+        texto: Texto a verificar
+        
+    Returns:
+        bool: True se alguma marcação (*, _, ` ou [) estiver aberta
+    """
+    return (
+        texto.count("*") % 2 == 1
+        or texto.count("_") % 2 == 1
+        or texto.count("`") % 2 == 1
+        or texto.count("[") != texto.count("]")
+    )
+
+def dividir_texto(texto: str, limite: int = LIMITE_MENSAGEM) -> List[str]:
+    """
+    Divide um texto em partes que cabem em uma mensagem do Telegram.
+    
+    Os cortes são feitos de preferência entre parágrafos, depois entre linhas e depois entre
+    palavras; só uma palavra maior que o limite é cortada no meio.
+    
+    Args:
+        texto: Texto a dividir
+        limite: Tamanho máximo de cada parte
+        
+    Returns:
+        List[str]: Partes do texto, em ordem (uma só, se o texto couber inteiro)
+    """
+    partes = []
+    while len(texto) > limite:
+        corte = -1
+        for separador in ("\n\n", "\n", " "):
+            corte = texto.rfind(separador, 0, limite)
+            if corte > 0:
+                break
+        if corte <= 0:
+            corte = limite
+        partes.append(texto[:corte].rstrip())
+        texto = texto[corte:].lstrip()
+    partes.append(texto)
+    return partes
+
+class StreamEditor:
+    """
+    Atualiza uma mensagem já enviada conforme o texto da resposta chega.
+    
+    As edições são espaçadas por um intervalo mínimo para respeitar o limite de edições
+    do Telegram, e cada edição roda em segundo plano para não atrasar a leitura do stream.
+    Enquanto o Markdown do texto parcial estiver incompleto, a mensagem é enviada sem formatação.
+    """
+    
+    def __init__(
+        self,
+        mensagem: Message,
+        cabecalho: str = "",
+        intervalo: float = STREAMING_INTERVALO_EDICAO,
+        min_caracteres: int = STREAMING_MIN_CARACTERES
+    ):
+        """
+        Inicializa o editor.
+        
+        Args:
+            mensagem: Mensagem de processamento que será editada
+            cabecalho: Texto fixo exibido antes da resposta parcial
+            intervalo: Segundos mínimos entre duas edições
+            min_caracteres: Caracteres novos necessários para justificar uma edição
+        """
+        self.mensagem = mensagem
+        self.cabecalho = cabecalho
+        self.intervalo = intervalo
+        self.min_caracteres = min_caracteres
+        self.edicoes = 0
+        self._inicio = time.monotonic()
+        self._primeiro_conteudo: Optional[float] = None
+        self._ultima_edicao = 0.0
+        self._ultimo_tamanho = 0
+        self._tarefa: Optional[asyncio.Future] = None
+    
+    async def atualizar(self, parcial: str) -> None:
+        """
+        Recebe o texto acumulado da resposta e, se for a hora, agenda uma edição.
+        
+        Args:
+            parcial: Texto da resposta recebido até agora
+        """
+        agora = time.monotonic()
+        if self._tarefa is not None and not self._tarefa.done():
+            return
+        if agora - self._ultima_edicao < self.intervalo:
+            return
+        if len(parcial) - self._ultimo_tamanho < self.min_caracteres:
+            return
+        
+        self._ultima_edicao = agora
+        self._ultimo_tamanho = len(parcial)
+        self._tarefa = asyncio.ensure_future(self._enviar(self.cabecalho + parcial, final=False))
+    
+    async def finalizar(self, texto: str) -> None:
+        """
+        Aguarda a edição pendente e substitui a mensagem pelo texto final formatado.
+        
+        Args:
+            texto: Texto completo da mensagem final (incluindo o cabeçalho desejado)
+        """
+        if self._tarefa is not None:
+            await asyncio.gather(self._tarefa, return_exceptions=True)
+        
+        # Um texto final maior que o limite continua em mensagens novas, em vez de ser cortado
+        partes = dividir_texto(texto)
+        await self._enviar(partes[0], final=True)
+        for parte in partes[1:]:
+            await self._continuar(parte)
+        
+        total_ms = (time.monotonic() - self._inicio) * 1000
+        primeiro_ms = (self._primeiro_conteudo - self._inicio) * 1000 if self._primeiro_conteudo else total_ms
+        logger.info(
+            f"Streaming concluído: primeiro conteúdo em {primeiro_ms:.0f} ms, "
+            f"total {total_ms:.0f} ms, {self.edicoes} edições"
+        )
+    
+    async def _enviar(self, texto: str, final: bool) -> None:
+        """
+        Edita a mensagem, caindo para texto simples se o Markdown for recusado.
+        
+        Args:
+            texto: Texto a exibir (as prévias maiores que uma mensagem são truncadas)
+            final: Se True, é a edição final (sempre tenta com Markdown)
+        """
+        if len(texto) > LIMITE_MENSAGEM:
+            logger.debug(f"Prévia com {len(texto)} caracteres truncada para caber em uma mensagem")
+            texto = texto[:LIMITE_MENSAGEM - 1] + "…"
+        
+        parse_mode = ParseMode.MARKDOWN if final or not markdown_incompleto(texto) else None
+        
+        try:
+            try:
+                await editar(self.mensagem, texto, parse_mode=parse_mode)
+            except BadRequest as e:
+                if "not modified" in str(e).lower():
+                    return
+                if parse_mode is None:
+                    raise
+                logger.debug(f"Markdown recusado pelo Telegram, enviando sem formatação: {e}")
+                await editar(self.mensagem, texto)
+        except RetryAfter as e:
+            # Limite de edições atingido: espaça as próximas edições parciais
+            logger.warning(f"Limite de edições do Telegram atingido, aguardando {e.retry_after}s")
+            self.intervalo = max(self.intervalo, float(e.retry_after))
+            if final:
+                await asyncio.sleep(e.retry_after)
+                await self._enviar(texto, final=True)
+            return
+        except Exception as e:
+            logger.warning(f"Erro ao editar mensagem durante o streaming: {e}")
+            return
+        
+        self.edicoes += 1
+        if self._primeiro_conteudo is None:
+            self._primeiro_conteudo = time.monotonic()
+    
+    async def _continuar(self, texto: str) -> None:
+        """
+        Envia uma parte seguinte do texto final como uma nova mensagem no mesmo chat.
+        
+        Args:
+            texto: Parte do texto final (já dentro do limite de uma mensagem)
+        """
+        try:
+            try:
+                await enviar_no_chat(self.mensagem, texto, parse_mode=ParseMode.MARKDOWN)
+            except BadRequest as e:
+                logger.debug(f"Markdown recusado pelo Telegram, enviando sem formatação: {e}")
+                await enviar_no_chat(self.mensagem, texto)
+        except RetryAfter as e:
+            logger.warning(f"Limite de mensagens do Telegram atingido, aguardando {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+            await self._continuar(texto)
+        except Exception as e:
+            logger.warning(f"Erro ao enviar a continuação da resposta: {e}")
@@ -2,19 +2,30 @@
 Handlers para mensagens de voz do bot Telegram.
 """
 import logging
-import os
-import tempfile
 from typing import Optional
 
 from telegram import Update, ParseMode
 from telegram.ext import CallbackContext
 
-from src.bot.bot_utils import check_authorization
+from src.bot.bot_utils import check_authorization, responder, editar
+from src.config.settings import TRANSCRICAO_CACHE_HABILITADO
 from src.transcription.transcriber import audio_transcriber
+from src.transcription.transcription_cache import transcription_cache
+from src.utils.async_runtime import async_runtime
 
 logger = logging.getLogger(__name__)
 
 def handle_voice_message(update: Update, context: CallbackContext) -> None:
+    """
+    Processa uma mensagem de voz (áudio) (versão síncrona).
+    
+    Args:
+        update: Objeto Update do Telegram
+        context: Contexto do callback
+    """
+    async_runtime.executar(handle_voice_message_async(update, context))
+
+async def handle_voice_message_async(update: Update, context: CallbackContext) -> None:
     """
     Processa uma mensagem de voz (áudio).
     
@@ -23,62 +34,68 @@ def handle_voice_message(update: Update, context: CallbackContext) -> None:
         context: Contexto do callback
     """
     if not check_authorization(update):
-        update.message.reply_text("Você não está autorizado a usar este bot.")
+        await responder(update, "Você não está autorizado a usar este bot.")
         return
     
     # Verifica se há uma mensagem de voz
     if not update.message.voice:
-        update.message.reply_text("Não consegui encontrar o áudio na sua mensagem.")
+        await responder(update, "Não consegui encontrar o áudio na sua mensagem.")
         return
     
     # Envia mensagem de processamento
-    processing_message = update.message.reply_text("🎙️ Processando seu áudio... Isso pode levar alguns segundos.")
+    processing_message = await responder(update, "🎙️ Processando seu áudio... Isso pode levar alguns segundos.")
     
     try:
-        # Obtém o arquivo de áudio
         voice = update.message.voice
-        voice_file = context.bot.get_file(voice.file_id)
+        em_cache = None
+        if TRANSCRICAO_CACHE_HABILITADO:
+            # Áudio já transcrito (reenviado ou encaminhado): pula o download e a transcrição
+            em_cache = await async_runtime.em_thread(transcription_cache.buscar_por_arquivo, voice.file_unique_id)
         
-        # Cria um diretório temporário para o arquivo de áudio
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Define o caminho para o arquivo de áudio
-            audio_path = os.path.join(temp_dir, f"audio_{voice.file_id}.ogg")
+        if em_cache is not None:
+            sucesso, transcricao = True, em_cache["texto"]
+        else:
+            # Obtém o arquivo de áudio
+            voice_file = await async_runtime.em_thread(context.bot.get_file, voice.file_id)
             
-            # Baixa o arquivo de áudio
-            voice_file.download(audio_path)
+            # Baixa o arquivo de áudio direto para a memória (sem arquivo temporário)
+            audio_data = await async_runtime.em_thread(voice_file.download_as_bytearray)
             
-            # Verifica se o arquivo existe
-            if not os.path.exists(audio_path):
-                update.message.reply_text("❌ Erro ao baixar o arquivo de áudio. Por favor, tente novamente.")
+            # Verifica se o download trouxe conteúdo
+            if not audio_data:
+                await responder(update, "❌ Erro ao baixar o arquivo de áudio. Por favor, tente novamente.")
                 return
             
             # Transcreve o áudio
-            processing_message.edit_text("🔍 Transcrevendo áudio... Isso pode levar alguns segundos.")
-            sucesso, transcricao = audio_transcriber.transcrever_audio(audio_path)
+            await editar(processing_message, "🔍 Transcrevendo áudio... Isso pode levar alguns segundos.")
+            sucesso, transcricao = await audio_transcriber.transcrever_bytes_async(audio_data, voice.file_unique_id)
             
-            if not sucesso:
-                update.message.reply_text(
-                    f"❌ Erro ao transcrever o áudio: {transcricao}\n\n"
-                    "Por favor, tente novamente ou envie uma mensagem de texto."
-                )
-                return
+        if not sucesso:
+            await responder(
+                update,
+                f"❌ Erro ao transcrever o áudio: {transcricao}\n\n"
+                "Por favor, tente novamente ou envie uma mensagem de texto."
+            )
+            return
             
-            # Processa a transcrição como uma mensagem de texto
-            processing_message.edit_text("✅ Áudio transcrito com sucesso! Processando sua ideia...")
+        # Processa a transcrição como uma mensagem de texto
+        await editar(processing_message, "✅ Áudio transcrito com sucesso! Processando sua ideia...")
             
-            # Envia a transcrição para o usuário
-            update.message.reply_text(
-                f"🎙️ *Transcrição do seu áudio:*\n\n{transcricao}",
-                parse_mode=ParseMode.MARKDOWN
-            )
+        # Envia a transcrição para o usuário
+        await responder(
+            update,
+            f"🎙️ *Transcrição do seu áudio:*\n\n{transcricao}",
+            parse_mode=ParseMode.MARKDOWN
+        )
             
-            # Processa a mensagem transcrita
-            from src.bot.message_handlers import process_message
-            process_message(update, context, transcricao)
+        # Processa a mensagem transcrita
+        from src.bot.message_handlers import process_message_async
+        await process_message_async(update, context, transcricao)
     
     except Exception as e:
         logger.error(f"Erro ao processar mensagem de voz: {str(e)}", exc_info=True)
-        update.message.reply_text(
+        await responder(
+            update,
             f"❌ Ocorreu um erro ao processar seu áudio: {str(e)}\n\n"
             "Por favor, tente novamente ou envie uma mensagem de texto."
         )
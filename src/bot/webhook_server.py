@@ -0,0 +1,139 @@
+"""
+Servidor HTTP embutido para receber updates do Telegram via webhook.
+"""
+import hmac
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho enviado pelo Telegram com o secret_token configurado no setWebhook
+CABECALHO_SECRET_TOKEN = "X-Telegram-Bot-Api-Secret-Token"
+
+# Tamanho máximo aceito para o corpo de um update
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+class WebhookServer:
+    """
+    Recebe updates do Telegram por HTTP e os entrega a um callback.
+    
+    O servidor confere o secret token, responde 200 imediatamente e só então entrega
+    o update, de forma que o Telegram nunca espera pelo processamento da mensagem.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        porta: int,
+        caminho: str,
+        secret_token: str,
+        ao_receber: Callable[[Dict[str, Any]], None]
+    ):
+        """
+        Inicializa o servidor (sem começar a escutar).
+        
+        Args:
+            host: Endereço em que o servidor escuta
+            porta: Porta em que o servidor escuta
+            caminho: Caminho HTTP que recebe os updates (ex: /telegram/webhook)
+            secret_token: Token que o Telegram envia no cabeçalho de cada update
+            ao_receber: Callback chamado com o JSON de cada update aceito
+        """
+        self.host = host
+        self.porta = porta
+        self.caminho = caminho
+        self.secret_token = secret_token
+        self.ao_receber = ao_receber
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def iniciar(self) -> None:
+        """
+        Começa a escutar em uma thread própria.
+        """
+        servidor = self
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                servidor._tratar_post(self)
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"Webhook: {format % args}")
+        
+        self._httpd = ThreadingHTTPServer((self.host, self.porta), _Handler)
+        self._httpd.daemon_threads = True
+        self.porta = self._httpd.server_address[1]
+        
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="cerebro-webhook", daemon=True)
+        self._thread.start()
+        
+        logger.info(f"Servidor de webhook escutando em http://{self.host}:{self.porta}{self.caminho}")
+    
+    def parar(self) -> None:
+        """
+        Para o servidor e aguarda a thread terminar.
+        """
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=5)
+        self._httpd = None
+        self._thread = None
+        logger.info("Servidor de webhook parado")
+    
+    def _tratar_post(self, requisicao: BaseHTTPRequestHandler) -> None:
+        """
+        Valida e confirma um POST recebido, depois entrega o update.
+        
+        Args:
+            requisicao: Handler HTTP da requisição atual
+        """
+        if requisicao.path != self.caminho:
+            self._responder(requisicao, 404)
+            return
+        
+        token_recebido = requisicao.headers.get(CABECALHO_SECRET_TOKEN, "")
+        if not hmac.compare_digest(token_recebido.encode(), self.secret_token.encode()):
+            logger.warning(f"Update recusado: secret token inválido (origem {requisicao.client_address[0]})")
+            self._responder(requisicao, 403)
+            return
+        
+        try:
+            tamanho = int(requisicao.headers.get("Content-Length", 0))
+        except ValueError:
+            tamanho = -1
+        
+        if tamanho <= 0 or tamanho > TAMANHO_MAXIMO_CORPO:
+            self._responder(requisicao, 413 if tamanho > TAMANHO_MAXIMO_CORPO else 400)
+            return
+        
+        try:
+            dados = json.loads(requisicao.rfile.read(tamanho))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._responder(requisicao, 400)
+            return
+        
+        # Confirma o recebimento antes de processar
+        self._responder(requisicao, 200)
+        
+        try:
+            self.ao_receber(dados)
+        except Exception as e:
+            logger.error(f"Erro ao entregar update {dados.get('update_id')}: {e}", exc_info=True)
+    
+    @staticmethod
+    def _responder(requisicao: BaseHTTPRequestHandler, status: int) -> None:
+        """
+        Envia uma resposta HTTP vazia.
+        
+        Args:
+            requisicao: Handler HTTP da requisição atual
+            status: Código de status HTTP
+        """
+        requisicao.send_response(status)
+        requisicao.send_header("Content-Length", "0")
+        requisicao.end_headers()
@@ -10,10 +10,13 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(BASE_DIR))
 
+logger = logging.getLogger(__name__)
+
 try:
     from secrets_cerebro import TELEGRAM_API_KEY, OPENAI_API_KEY, MY_CHAT_ID, SUPERUSERS_CHAT_ID
 except ImportError:
-    logging.error("Arquivo secrets_cerebro.py não encontrado ou não contém as chaves necessárias.")
+    # Usa o logger do módulo: logging.error() configuraria o logging raiz na importação
+    logger.error("Arquivo secrets_cerebro.py não encontrado ou não contém as chaves necessárias.")
     TELEGRAM_API_KEY = os.environ.get("TELEGRAM_API_KEY", "")
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
     MY_CHAT_ID = os.environ.get("MY_CHAT_ID", "")
@@ -25,10 +28,16 @@ LOGS_DIR = VAR_DIR / "logs"
 DB_DIR = VAR_DIR / "db"
 RUN_DIR = VAR_DIR / "run"
 
-# Cria diretórios se não existirem
-os.makedirs(LOGS_DIR, exist_ok=True)
-os.makedirs(DB_DIR, exist_ok=True)
-os.makedirs(RUN_DIR, exist_ok=True)
+# Indica se validar_configuracao() já foi executada com sucesso
+_configuracao_validada = False
+
+def garantir_diretorios() -> None:
+    """
+    Cria os diretórios de dados do bot se não existirem.
+    """
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    os.makedirs(DB_DIR, exist_ok=True)
+    os.makedirs(RUN_DIR, exist_ok=True)
 
 # Função para configurar o logging
 def configure_logging(log_file="var/logs/cerebro.log"):
@@ -38,6 +47,7 @@ def configure_logging(log_file="var/logs/cerebro.log"):
     Args:
         log_file (str): Nome do arquivo de log. Padrão: "cerebro.log"
     """
+    garantir_diretorios()
     logging.basicConfig(
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         level=logging.INFO,
@@ -48,19 +58,32 @@ def configure_logging(log_file="var/logs/cerebro.log"):
     )
     return logging.getLogger(__name__)
 
-# Configura o logging
-logger = configure_logging()
+def validar_configuracao() -> None:
+    """
+    Verifica se as chaves de API estão definidas.
 
-# Verifica se as chaves de API estão definidas
-if not TELEGRAM_API_KEY:
-    logger.error("TELEGRAM_API_KEY não está definida ou está vazia!")
-    raise ValueError("TELEGRAM_API_KEY não está definida ou está vazia!")
+    É chamada apenas por quem realmente precisa das chaves (o bot e os clientes de API),
+    para que importar as configurações não tenha efeitos colaterais.
+    A validação é feita uma única vez por processo.
+    
+    Raises:
+        ValueError: Se alguma chave obrigatória estiver vazia
+    """
+    global _configuracao_validada
+    if _configuracao_validada:
+        return
+    
+    if not TELEGRAM_API_KEY:
+        logger.error("TELEGRAM_API_KEY não está definida ou está vazia!")
+        raise ValueError("TELEGRAM_API_KEY não está definida ou está vazia!")
 
-if not OPENAI_API_KEY:
-    logger.error("OPENAI_API_KEY não está definida ou está vazia!")
-    raise ValueError("OPENAI_API_KEY não está definida ou está vazia!")
-else:
-    logger.info(f"OPENAI_API_KEY está definida e tem {len(OPENAI_API_KEY)} caracteres")
+    if not OPENAI_API_KEY:
+        logger.error("OPENAI_API_KEY não está definida ou está vazia!")
+        raise ValueError("OPENAI_API_KEY não está definida ou está vazia!")
+    else:
+        logger.info(f"OPENAI_API_KEY está definida e tem {len(OPENAI_API_KEY)} caracteres")
+    
+    _configuracao_validada = True
 
 # Configurações do banco de dados
 DB_PATH = BASE_DIR / "var/db/cerebro.db"
@@ -68,11 +91,187 @@ DB_PATH = BASE_DIR / "var/db/cerebro.db"
 # Configuração para usar Supabase em vez do SQLite
 USE_SUPABASE = True  # Mude para False para usar o SQLite local
 
+# Configurações das conexões com o SQLite (uma conexão persistente por thread, em modo WAL)
+SQLITE_CACHE_KB = 8 * 1024  # Cache de páginas de cada conexão
+SQLITE_MMAP_BYTES = 64 * 1024 * 1024  # Trecho do arquivo lido por memória mapeada (0 para desativar)
+SQLITE_CACHE_INSTRUCOES = 64  # Instruções preparadas mantidas por conexão
+SQLITE_BUSY_TIMEOUT = 5.0  # Espera (s) pelo lock de escrita antes de falhar
+
+# Listagem de ideias (/listar), paginada pelo ID da última ideia exibida
+LISTAR_IDEIAS_POR_PAGINA = 10  # Ideias por página (cada página é uma consulta e uma mensagem limitadas)
+LISTAR_DESCRICAO_MAX = 50  # Caracteres do conteúdo exibidos por ideia (a view do Supabase corta em 51)
+
 # Configurações da OpenAI
 OPENAI_MODEL = "gpt-3.5-turbo"
+OPENAI_MODEL_PEQUENO = "gpt-4o-mini"  # Modelo rápido e barato para tarefas curtas (classificação)
 OPENAI_WHISPER_MODEL = "whisper-1"
 OPENAI_TEMPERATURE = 0.7
 
+# Roteamento de modelos por operação
+# modelo: modelo principal; fallback: modelo usado enquanto o p95 do principal passa do SLO;
+# max_tokens: limite de custo por resposta (None = sem limite); timeout: segundos por tentativa;
+# slo_p95: latência máxima aceitável (s) no percentil 95
+OPENAI_ROTAS = {
+    "classificacao": {
+        "modelo": OPENAI_MODEL_PEQUENO, "fallback": OPENAI_MODEL, "temperatura": 0.0,
+        "max_tokens": 1000, "timeout": 15.0, "slo_p95": 4.0,
+    },
+    "resumo": {
+        "modelo": OPENAI_MODEL_PEQUENO, "fallback": OPENAI_MODEL, "temperatura": 0.0,
+        "max_tokens": 30, "timeout": 15.0, "slo_p95": 4.0,
+    },
+    "classificacao_resposta": {
+        "modelo": OPENAI_MODEL, "fallback": OPENAI_MODEL_PEQUENO, "temperatura": 0.3,
+        "max_tokens": 1500, "timeout": 60.0, "slo_p95": 20.0,
+    },
+    "questao": {
+        "modelo": OPENAI_MODEL, "fallback": OPENAI_MODEL_PEQUENO, "temperatura": OPENAI_TEMPERATURE,
+        "max_tokens": 1500, "timeout": 60.0, "slo_p95": 20.0,
+    },
+    "brainstorm": {
+        "modelo": OPENAI_MODEL, "fallback": OPENAI_MODEL_PEQUENO, "temperatura": OPENAI_TEMPERATURE,
+        "max_tokens": 2000, "timeout": 90.0, "slo_p95": 45.0,
+    },
+    "brainstorm_secao": {
+        "modelo": OPENAI_MODEL, "fallback": OPENAI_MODEL_PEQUENO, "temperatura": OPENAI_TEMPERATURE,
+        "max_tokens": 700, "timeout": 60.0, "slo_p95": 20.0,
+    },
+}
+ROTEAMENTO_MIN_AMOSTRAS = 20  # Amostras do modelo principal antes de avaliar o SLO
+ROTEAMENTO_TEMPO_REBAIXADO = 10 * 60  # Segundos no fallback antes de voltar a testar o modelo principal
+
 # Configurações de transcrição de áudio
-AUDIO_FORMATS = ["ogg", "mp3", "wav", "m4a"]
+AUDIO_FORMATS = ["ogg", "mp3", "wav", "m4a", "mp4", "flac", "webm"]  # Contêineres enviados sem conversão à API
 WHISPER_SAMPLE_RATE = 16000
+FFMPEG_BINARIO = "ffmpeg"  # Executável usado na conversão (stdin/stdout, sem arquivos temporários)
+AUDIO_CONVERSAO_TIMEOUT = 60  # Segundos máximos de uma conversão
+AUDIO_LIMITE_UPLOAD = 25 * 1024 * 1024  # Tamanho máximo aceito pela API de transcrição (bytes)
+AUDIO_OPUS_BITRATE = "24k"  # Taxa do Opus gerado quando o áudio precisa ser convertido
+
+# Áudios longos são divididos nos silêncios e as partes são transcritas em paralelo
+AUDIO_SEGMENTACAO = True  # Mude para False para enviar sempre o áudio inteiro
+AUDIO_SEGMENTACAO_LIMIAR = 90  # Duração (s) a partir da qual o áudio é dividido
+AUDIO_SEGMENTO_MIN = 20  # Duração mínima (s) de uma parte antes de procurar um silêncio para o corte
+AUDIO_SEGMENTO_MAX = 45  # Duração máxima (s) de uma parte
+AUDIO_SEGMENTO_SOBREPOSICAO = 1.0  # Segundos repetidos entre partes quando não há silêncio para o corte
+AUDIO_SEGMENTOS_PARALELOS = 4  # Partes enviadas ao mesmo tempo para a API
+AUDIO_SILENCIO_MARGEM_DB = 10  # Quanto (dB) acima do ruído de fundo um trecho ainda conta como silêncio
+AUDIO_SILENCIO_MAX_DBFS = -35  # Trechos acima desse nível nunca contam como silêncio (evita cortar fala baixa)
+
+# Pré-processamento do áudio antes do envio (remoção de silêncios e normalização do volume)
+AUDIO_PREPROCESSAMENTO = True  # Mude para False para enviar sempre o áudio original
+AUDIO_PREPROCESSAMENTO_MIN_REMOVIDO = 1.0  # Segundos removidos para enviar o áudio processado no lugar do original
+AUDIO_PREPROCESSAMENTO_MIN_DURACAO = 30  # Áudios mais curtos (s) seguem sem decodificar: há pouco silêncio a remover
+AUDIO_PREPROCESSAMENTO_MIN_BYTES = 256 * 1024  # Sem a duração no cabeçalho, o tamanho mínimo (bytes) para decodificar
+AUDIO_VAD_MARGEM = 0.2  # Segundos mantidos antes e depois da fala ao cortar o início e o fim
+AUDIO_PAUSA_MAX = 1.0  # Pausas internas mais longas (s) são encurtadas para esse valor (None para não encurtar)
+AUDIO_PICO_DBFS = -1.0  # Pico do áudio depois da normalização
+AUDIO_GANHO_MAX_DB = 20.0  # Ganho máximo da normalização (evita amplificar demais o ruído)
+
+# Pool de processos para o preparo do áudio (decodificação, pré-processamento e conversão)
+# O trabalho de CPU roda fora do processo do bot, que continua atendendo as outras mensagens
+AUDIO_PROCESSOS = 2  # Processos do pool (0 para preparar o áudio em uma thread do próprio bot)
+AUDIO_PROCESSOS_FILA = 8  # Áudios aguardando um processo livre antes de recusar novos
+AUDIO_PROCESSO_TIMEOUT = 120  # Tempo máximo (s) do preparo de um áudio, incluindo a espera na fila
+
+# Configurações do modo assíncrono
+# Com ASYNC_MODE ativo, o dispatcher apenas agenda cada mensagem no event loop
+# e fica livre para atender outros chats enquanto a OpenAI responde
+ASYNC_MODE = True  # Mude para False para processar cada mensagem dentro do dispatcher
+ASYNC_MAX_THREADS = 16  # Threads para chamadas bloqueantes (Telegram, banco de dados, áudio)
+
+# Configurações do agendador de mensagens por chat
+# Mensagens do mesmo chat são processadas em ordem; chats diferentes, em paralelo
+SCHEDULER_MAX_WORKERS = 50  # Máximo de mensagens processadas ao mesmo tempo (todos os chats)
+SCHEDULER_MAX_FILA_POR_CHAT = 10  # Mensagens pendentes por chat antes de recusar novas
+SCHEDULER_MAX_FILA_GLOBAL = 500  # Mensagens pendentes no total antes de recusar novas
+
+# Configurações de recebimento de updates
+# "polling" consulta o Telegram periodicamente; "webhook" recebe os updates por HTTP
+BOT_MODO_RECEBIMENTO = os.environ.get("BOT_MODO_RECEBIMENTO", "polling")
+WEBHOOK_URL_PUBLICA = os.environ.get("WEBHOOK_URL_PUBLICA", "")  # Ex: https://cerebro.exemplo.com
+WEBHOOK_HOST = os.environ.get("WEBHOOK_HOST", "127.0.0.1")  # Endereço local do servidor embutido
+WEBHOOK_PORTA = int(os.environ.get("WEBHOOK_PORTA", "8443"))
+WEBHOOK_CAMINHO = "/telegram/webhook"
+WEBHOOK_MAX_CONEXOES = 40  # Conexões simultâneas que o Telegram pode abrir
+
+try:
+    from secrets_cerebro import WEBHOOK_SECRET_TOKEN
+except ImportError:
+    WEBHOOK_SECRET_TOKEN = os.environ.get("WEBHOOK_SECRET_TOKEN", "")
+
+# Configurações do cache de respostas da OpenAI
+CACHE_HABILITADO = True  # Mude para False para sempre consultar a API
+CACHE_DB_PATH = DB_DIR / "cache_openai.db"
+CACHE_TTL_SEGUNDOS = 24 * 60 * 60  # Tempo de vida de cada resposta em cache
+CACHE_MEMORIA_MAX_ITENS = 500  # Entradas mantidas na camada em memória (LRU)
+CACHE_DISCO_MAX_BYTES = 20 * 1024 * 1024  # Tamanho máximo da camada em disco
+CACHE_OPERACOES = {  # Habilita o cache por operação
+    "classificacao": True,
+    "resumo": True,
+    "classificacao_resposta": True,
+    "questao": True,
+    "brainstorm": True,
+    "brainstorm_secao": True,
+}
+
+# Configurações do cache de transcrições (áudios reenviados ou encaminhados não são transcritos de novo)
+TRANSCRICAO_CACHE_HABILITADO = True  # Mude para False para sempre baixar e transcrever o áudio
+TRANSCRICAO_CACHE_DB_PATH = DB_DIR / "cache_transcricoes.db"
+TRANSCRICAO_CACHE_TTL_SEGUNDOS = 30 * 24 * 60 * 60  # Tempo de vida de cada transcrição em cache
+TRANSCRICAO_CACHE_MEMORIA_MAX_ITENS = 200  # Entradas mantidas na camada em memória (LRU)
+TRANSCRICAO_CACHE_DISCO_MAX_BYTES = 10 * 1024 * 1024  # Tamanho máximo da camada em disco
+
+# Configurações de streaming das respostas (brainstorm e questões)
+# A mensagem de processamento é editada conforme a resposta chega da OpenAI
+STREAMING_HABILITADO = True  # Mude para False para enviar apenas a resposta completa
+STREAMING_INTERVALO_EDICAO = 1.5  # Segundos mínimos entre edições (limite de edições do Telegram)
+STREAMING_MIN_CARACTERES = 30  # Caracteres novos necessários para uma nova edição
+
+# Configurações do classificador local (IDEIA x QUESTAO sem chamar a OpenAI)
+CLASSIFICADOR_LOCAL_HABILITADO = True  # Mude para False para sempre classificar com a OpenAI
+CLASSIFICADOR_DB_PATH = DB_DIR / "classificador.db"
+CLASSIFICADOR_LIMIAR = 0.95  # Probabilidade mínima para decidir localmente
+CLASSIFICADOR_MIN_EXEMPLOS = 20  # Exemplos de cada classe antes de decidir localmente
+CLASSIFICADOR_NUM_FEATURES = 2 ** 18  # Tamanho do espaço de hashing dos n-gramas
+
+# Brainstorm em seções paralelas
+# Com BRAINSTORM_SECIONADO, cada seção (Passos, Desafios, Pontos de atenção, Oportunidades) é uma
+# completion própria, feitas ao mesmo tempo: o brainstorm leva o tempo da seção mais lenta
+BRAINSTORM_SECIONADO = True  # Mude para False para gerar o brainstorm em uma única completion
+
+# Brainstorm especulativo
+# Com BRAINSTORM_ESPECULATIVO, o brainstorm começa a ser gerado assim que a ideia é salva,
+# enquanto o bot espera o "sim"; um "não" ou o fim do prazo cancela a geração
+BRAINSTORM_ESPECULATIVO = False  # Mude para True para gerar antes da confirmação (gasta tokens em "não")
+BRAINSTORM_ESPECULATIVO_PRAZO = 10 * 60  # Segundos esperando a resposta antes de descartar a geração
+
+# Classificação e resposta em uma única chamada
+# Com CLASSIFICACAO_FUNDIDA, uma questão é classificada e respondida pela mesma completion
+CLASSIFICACAO_FUNDIDA = True  # Mude para False para classificar e responder em chamadas separadas
+
+# Configurações das métricas de latência
+METRICAS_JANELA = 1000  # Amostras mantidas por operação para o cálculo dos percentis
+
+# Configurações das conexões HTTP
+# Cada serviço externo tem seu próprio pool de conexões persistentes (keep-alive)
+HTTP_POOLS = {
+    "openai": {"conexoes": 20, "timeout_conexao": 5.0, "timeout_leitura": 90.0},
+    "whisper": {"conexoes": 8, "timeout_conexao": 5.0, "timeout_leitura": 120.0},
+    "telegram": {"conexoes": ASYNC_MAX_THREADS + 4, "timeout_conexao": 5.0, "timeout_leitura": 10.0},
+    "supabase": {"conexoes": 10, "timeout_conexao": 5.0, "timeout_leitura": 30.0},
+}
+HTTP_KEEPALIVE_SEGUNDOS = 60  # Tempo que uma conexão ociosa fica aberta no pool
+HTTP2_HABILITADO = True  # Usa HTTP/2 onde o cliente suporta (Supabase, via httpx + h2)
+HTTP_AQUECER_CONEXOES = True  # Abre as conexões (TCP + TLS) na inicialização do bot
+
+# Configurações de resiliência das chamadas a serviços externos
+# tentativas: máximo de tentativas por requisição; prazo: tempo total (s) para todas elas;
+# limite_falhas: falhas temporárias seguidas que abrem o circuito; tempo_aberto: segundos recusando chamadas
+RESILIENCIA_UPSTREAMS = {
+    "openai": {"tentativas": 3, "prazo": 90.0, "limite_falhas": 5, "tempo_aberto": 30.0},
+    "whisper": {"tentativas": 3, "prazo": 120.0, "limite_falhas": 5, "tempo_aberto": 30.0},
+    "supabase": {"tentativas": 3, "prazo": 15.0, "limite_falhas": 5, "tempo_aberto": 15.0},
+}
+RESILIENCIA_ESPERA_BASE = 0.5  # Espera base do backoff exponencial (s)
+RESILIENCIA_ESPERA_MAXIMA = 8.0  # Espera máxima entre tentativas (s)
@@ -29,6 +29,7 @@ SUPABASE_SERVICE_KEY: Optional[str] = SECRET_SERVICE_KEY
 # Configurações das tabelas
 TABELA_IDEIAS = "ideias"
 TABELA_BRAINSTORMS = "brainstorms"
+VIEW_LISTAGEM_IDEIAS = "ideias_listagem"  # Criada por scripts/criar_view_listagem_supabase.sql
 
 def get_supabase_key(use_service_key: bool = False) -> str:
     """Retorna a chave apropriada do Supabase.
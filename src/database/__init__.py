@@ -4,3 +4,4 @@ Módulo de banco de dados do bot Cerebro.
 from src.database.idea_repository import idea_repository
 from src.database.brainstorm_repository import brainstorm_repository
 from src.database.db_manager import db_manager
+from src.database.connection_manager import connection_manager
@@ -2,11 +2,11 @@
 Repositório para gerenciamento de brainstorms no banco de dados.
 """
 import logging
-import sqlite3
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 from src.config.settings import DB_PATH, USE_SUPABASE
+from src.database.connection_manager import ConnectionManager, connection_manager
 from src.database.supabase_service import supabase_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,7 @@ class BrainstormRepository:
             db_path: Caminho para o arquivo do banco de dados
         """
         self.db_path = db_path
+        self.conexoes = connection_manager if db_path == DB_PATH else ConnectionManager(db_path)
     
     def salvar_brainstorm(self, ideia_id: int, conteudo: str) -> Optional[int]:
         """
@@ -46,7 +47,7 @@ class BrainstormRepository:
                 }
                 
                 # Inserir o brainstorm no Supabase
-                response = supabase_service.supabase.table("brainstorms").insert(dados).execute()
+                response = supabase_service.executar(supabase_service.supabase.table("brainstorms").insert(dados))
                 
                 # Verificar se a inserção foi bem-sucedida
                 if response.data and len(response.data) > 0:
@@ -63,23 +64,14 @@ class BrainstormRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Obtém a data atual
             data_criacao = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Insere o brainstorm no banco de dados
-            cursor.execute(
+            # Insere o brainstorm no banco de dados e obtém o ID do brainstorm inserido
+            brainstorm_id = self.conexoes.executar(
                 "INSERT INTO brainstorms (ideia_id, conteudo, data_criacao) VALUES (?, ?, ?)",
                 (ideia_id, conteudo, data_criacao)
-            )
-            
-            # Obtém o ID do brainstorm inserido
-            brainstorm_id = cursor.lastrowid
-            
-            conn.commit()
-            conn.close()
+            ).lastrowid
             
             logger.info(f"Brainstorm salvo com sucesso no SQLite. ID: {brainstorm_id}")
             return brainstorm_id
@@ -113,7 +105,7 @@ class BrainstormRepository:
                 query = query.order("created_at", desc=True)
                 
                 # Executar a query
-                response = query.execute()
+                response = supabase_service.executar(query)
                 
                 # Verificar se a consulta foi bem-sucedida
                 if response.data is not None:
@@ -128,22 +120,11 @@ class BrainstormRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # Busca os brainstorms da ideia
-            cursor.execute(
+            return self.conexoes.consultar(
                 "SELECT * FROM brainstorms WHERE ideia_id = ? ORDER BY data_criacao DESC",
                 (ideia_id,)
             )
-            
-            # Converte os resultados para dicionários
-            brainstorms = [dict(row) for row in cursor.fetchall()]
-            
-            conn.close()
-            
-            return brainstorms
         
         except Exception as e:
             logger.error(f"Erro ao obter brainstorms no SQLite: {str(e)}", exc_info=True)
@@ -171,7 +152,7 @@ class BrainstormRepository:
                 query = query.eq("id", brainstorm_id)
                 
                 # Executar a query
-                response = query.execute()
+                response = supabase_service.executar(query)
                 
                 # Verificar se a consulta foi bem-sucedida e se retornou algum resultado
                 if response.data is not None and len(response.data) > 0:
@@ -186,27 +167,15 @@ class BrainstormRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # Busca o brainstorm
-            cursor.execute(
+            brainstorm = self.conexoes.consultar_um(
                 "SELECT * FROM brainstorms WHERE id = ?",
                 (brainstorm_id,)
             )
             
-            # Obtém o resultado
-            row = cursor.fetchone()
-            
-            conn.close()
-            
-            # Converte o resultado para dicionário se existir
-            if row:
-                return dict(row)
-            else:
+            if brainstorm is None:
                 logger.warning(f"Brainstorm com ID {brainstorm_id} não encontrado no SQLite")
-                return None
+            return brainstorm
         
         except Exception as e:
             logger.error(f"Erro ao obter brainstorm no SQLite: {str(e)}", exc_info=True)
@@ -241,7 +210,7 @@ class BrainstormRepository:
                 }
                 
                 # Atualizar o brainstorm no Supabase
-                response = supabase_service.supabase.table("brainstorms").update(dados).eq("id", brainstorm_id).execute()
+                response = supabase_service.executar(supabase_service.supabase.table("brainstorms").update(dados).eq("id", brainstorm_id))
                 
                 # Verificar se a atualização foi bem-sucedida
                 if response.data and len(response.data) > 0:
@@ -257,31 +226,18 @@ class BrainstormRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Verifica se o brainstorm existe
-            cursor.execute(
-                "SELECT id FROM brainstorms WHERE id = ?",
-                (brainstorm_id,)
-            )
-            
-            if not cursor.fetchone():
-                conn.close()
-                logger.warning(f"Brainstorm com ID {brainstorm_id} não encontrado no SQLite")
-                return False
-            
             # Obtém a data atual
             data_criacao = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Atualiza o brainstorm
-            cursor.execute(
+            # Atualiza o brainstorm (nenhuma linha alterada indica que ele não existe)
+            cursor = self.conexoes.executar(
                 "UPDATE brainstorms SET conteudo = ?, data_criacao = ? WHERE id = ?",
                 (novo_conteudo, data_criacao, brainstorm_id)
             )
             
-            conn.commit()
-            conn.close()
+            if cursor.rowcount == 0:
+                logger.warning(f"Brainstorm com ID {brainstorm_id} não encontrado no SQLite")
+                return False
             
             logger.info(f"Brainstorm {brainstorm_id} atualizado com sucesso no SQLite")
             return True
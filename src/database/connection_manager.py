@@ -0,0 +1,160 @@
+"""
+Conexões persistentes com o banco SQLite.
+"""
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from src.config.settings import (
+    DB_PATH, SQLITE_CACHE_KB, SQLITE_MMAP_BYTES, SQLITE_CACHE_INSTRUCOES, SQLITE_BUSY_TIMEOUT
+)
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+class ConnectionManager:
+    """
+    Mantém uma conexão aberta por thread com um banco SQLite.
+    
+    Cada conexão é aberta uma única vez, em modo WAL (leituras não esperam pelas escritas e
+    vice-versa) e com os pragmas de cache ajustados, e guarda as instruções já preparadas para
+    reutilizá-las. As conexões ficam em autocommit: escritas com mais de uma instrução devem
+    usar `transacao()`.
+    """
+    
+    def __init__(self, db_path: str = DB_PATH):
+        """
+        Inicializa o gerenciador. As conexões são abertas no primeiro uso de cada thread.
+        
+        Args:
+            db_path: Caminho para o arquivo do banco de dados
+        """
+        self.db_path = str(db_path)
+        self._local = threading.local()
+        self._conexoes: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+    
+    def conexao(self) -> sqlite3.Connection:
+        """
+        Retorna a conexão da thread atual, abrindo-a se necessário.
+        
+        Returns:
+            sqlite3.Connection: Conexão (linhas como sqlite3.Row)
+        """
+        conn = getattr(self._local, "conexao", None)
+        if conn is None:
+            conn = self._local.conexao = self._abrir()
+        return conn
+    
+    def executar(self, sql: str, parametros: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """
+        Executa uma instrução na conexão da thread atual.
+        
+        Args:
+            sql: Instrução SQL
+            parametros: Parâmetros da instrução
+            
+        Returns:
+            sqlite3.Cursor: Cursor com o resultado (ex: lastrowid, rowcount)
+        """
+        return self.conexao().execute(sql, parametros)
+    
+    def consultar(self, sql: str, parametros: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Executa uma consulta e retorna todas as linhas.
+        
+        Args:
+            sql: Consulta SQL
+            parametros: Parâmetros da consulta
+            
+        Returns:
+            List[Dict[str, Any]]: Linhas como dicionários
+        """
+        return [dict(row) for row in self.executar(sql, parametros)]
+    
+    def consultar_um(self, sql: str, parametros: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        """
+        Executa uma consulta e retorna a primeira linha.
+        
+        Args:
+            sql: Consulta SQL
+            parametros: Parâmetros da consulta
+            
+        Returns:
+            Optional[Dict[str, Any]]: Linha como dicionário, ou None se não houver resultado
+        """
+        row = self.executar(sql, parametros).fetchone()
+        return dict(row) if row else None
+    
+    @contextmanager
+    def transacao(self, imediata: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Executa o bloco em uma transação: confirma no fim ou desfaz se houver exceção.
+        Dentro de outra transação, o bloco apenas faz parte da transação externa.
+        
+        Args:
+            imediata: Se True, reserva o lock de escrita já no início (BEGIN IMMEDIATE),
+                evitando que a transação falhe ao passar de leitura para escrita
+                
+        Returns:
+            Iterator[sqlite3.Connection]: Conexão da thread atual
+        """
+        conn = self.conexao()
+        if conn.in_transaction:
+            yield conn
+            return
+        
+        conn.execute("BEGIN IMMEDIATE" if imediata else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    def fechar(self) -> None:
+        """
+        Fecha todas as conexões abertas. As threads abrem novas conexões no próximo uso.
+        """
+        with self._lock:
+            conexoes, self._conexoes = self._conexoes, []
+            self._local = threading.local()
+        for conn in conexoes:
+            conn.close()
+        if conexoes:
+            logger.info(f"{len(conexoes)} conexões com {self.db_path} fechadas")
+    
+    def _abrir(self) -> sqlite3.Connection:
+        """
+        Abre uma conexão e aplica os pragmas de desempenho.
+        """
+        # check_same_thread=False apenas para que fechar() possa ser chamado de outra thread;
+        # cada conexão é usada somente pela thread que a abriu
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=SQLITE_BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHE_INSTRUCOES
+        )
+        conn.row_factory = sqlite3.Row
+        
+        modo = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if modo.lower() != "wal":
+            logger.warning(f"Não foi possível ativar o modo WAL em {self.db_path} (modo atual: {modo})")
+        # Com WAL, NORMAL só sincroniza o disco nos checkpoints e continua seguro contra corrupção
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        with self._lock:
+            self._conexoes.append(conn)
+        metricas.contar("sqlite.conexoes")
+        return conn
+
+
+# Instância global das conexões com o banco de ideias e brainstorms
+connection_manager = ConnectionManager()
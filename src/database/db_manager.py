@@ -8,6 +8,7 @@ from typing import Tuple, List, Dict, Any, Optional
 
 from src.database.idea_repository import idea_repository
 from src.database.brainstorm_repository import brainstorm_repository
+from src.database.schema_migrator import schema_migrator
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +27,9 @@ class DatabaseManager:
     
     def init_db(self) -> None:
         """
-        Inicializa o banco de dados SQLite.
-        Este método é mantido para compatibilidade, mas não faz nada.
+        Inicializa o banco de dados SQLite, aplicando as migrações pendentes do esquema.
         """
-        # Não faz nada, pois a inicialização é feita nos repositórios
-        pass
+        schema_migrator.aplicar()
     
     def salvar_ideia(self, conteudo: str, chat_id: int) -> Optional[int]:
         """
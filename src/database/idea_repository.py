@@ -2,11 +2,11 @@
 Repositório para gerenciamento de ideias no banco de dados.
 """
 import logging
-import sqlite3
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-from src.config.settings import DB_PATH, USE_SUPABASE
+from src.config.settings import DB_PATH, USE_SUPABASE, LISTAR_DESCRICAO_MAX
+from src.database.connection_manager import ConnectionManager, connection_manager
 from src.database.supabase_service import supabase_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,7 @@ class IdeaRepository:
             db_path: Caminho para o arquivo do banco de dados
         """
         self.db_path = db_path
+        self.conexoes = connection_manager if db_path == DB_PATH else ConnectionManager(db_path)
     
     def salvar_ideia(self, conteudo: str, chat_id: int, tipo: str = "ideia", resumo: str = "") -> Optional[int]:
         """
@@ -48,23 +49,14 @@ class IdeaRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Obtém a data atual
             data_criacao = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Insere a ideia no banco de dados
-            cursor.execute(
+            # Insere a ideia no banco de dados e obtém o ID da ideia inserida
+            ideia_id = self.conexoes.executar(
                 "INSERT INTO ideias (tipo, conteudo, resumo, chat_id, data_criacao) VALUES (?, ?, ?, ?, ?)",
                 (tipo, conteudo, resumo, chat_id, data_criacao)
-            )
-            
-            # Obtém o ID da ideia inserida
-            ideia_id = cursor.lastrowid
-            
-            conn.commit()
-            conn.close()
+            ).lastrowid
             
             logger.info(f"Ideia salva com sucesso. ID: {ideia_id}")
             return ideia_id
@@ -90,32 +82,79 @@ class IdeaRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # Se for superusuário, busca todas as ideias
             # Senão, busca apenas as ideias do usuário
             if is_superuser:
-                cursor.execute(
+                return self.conexoes.consultar(
                     "SELECT id, tipo, conteudo, resumo, data_criacao, chat_id FROM ideias ORDER BY id DESC"
                 )
-            else:
-                cursor.execute(
-                    "SELECT id, tipo, conteudo, resumo, data_criacao, chat_id FROM ideias WHERE chat_id = ? ORDER BY id DESC",
-                    (chat_id,)
-                )
+            return self.conexoes.consultar(
+                "SELECT id, tipo, conteudo, resumo, data_criacao, chat_id FROM ideias WHERE chat_id = ? ORDER BY id DESC",
+                (chat_id,)
+            )
+        
+        except Exception as e:
+            logger.error(f"Erro ao listar ideias: {str(e)}", exc_info=True)
+            return []
+    
+    def listar_pagina_ideias(
+        self,
+        chat_id: int,
+        is_superuser: bool = False,
+        antes_de: Optional[int] = None,
+        depois_de: Optional[int] = None,
+        limite: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Lista uma página de ideias, da mais recente para a mais antiga.
+        
+        A paginação é por keyset (WHERE id < ? ORDER BY id DESC LIMIT n): cada página é uma
+        consulta limitada pelo índice, sem OFFSET, independente de quantas ideias existam.
+        Só as colunas da listagem são lidas, e o conteúdo é cortado no banco em
+        LISTAR_DESCRICAO_MAX + 1 caracteres (o extra indica que o texto continua).
+        
+        Args:
+            chat_id: ID do chat do usuário
+            is_superuser: Se True, lista as ideias de todos os usuários
+            antes_de: Retorna as ideias com ID menor que este (página seguinte)
+            depois_de: Retorna as ideias com ID maior que este (página anterior)
+            limite: Máximo de ideias retornadas
             
-            # Converte os resultados para dicionários
-            ideias = [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Optional[List[Dict[str, Any]]]: Ideias ("id", "chat_id", "resumo" e "conteudo_inicio") em ordem
+            decrescente de ID, ou None em caso de erro
+        """
+        # Verifica se deve usar o Supabase
+        if USE_SUPABASE:
+            return supabase_service.listar_pagina_ideias(chat_id, is_superuser, antes_de, depois_de, limite)
+        
+        # Caso contrário, usa o SQLite
+        try:
+            condicoes, parametros = [], []
+            if not is_superuser:
+                condicoes.append("chat_id = ?")
+                parametros.append(chat_id)
             
-            conn.close()
+            # A página anterior é buscada em ordem crescente a partir do cursor e depois invertida
+            if depois_de is not None:
+                condicoes.append("id > ?")
+                parametros.append(depois_de)
+            elif antes_de is not None:
+                condicoes.append("id < ?")
+                parametros.append(antes_de)
             
-            return ideias
+            filtro = f"WHERE {' AND '.join(condicoes)} " if condicoes else ""
+            ordem = "ASC" if depois_de is not None else "DESC"
+            ideias = self.conexoes.consultar(
+                "SELECT id, chat_id, resumo, substr(conteudo, 1, ?) AS conteudo_inicio "
+                f"FROM ideias {filtro}ORDER BY id {ordem} LIMIT ?",
+                [LISTAR_DESCRICAO_MAX + 1] + parametros + [limite]
+            )
+            return ideias[::-1] if depois_de is not None else ideias
         
         except Exception as e:
-            logger.error(f"Erro ao listar ideias: {str(e)}", exc_info=True)
-            return []
+            logger.error(f"Erro ao listar página de ideias: {str(e)}", exc_info=True)
+            return None
     
     def obter_ideia_por_id(self, ideia_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -140,20 +179,8 @@ class IdeaRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # Busca a ideia pelo ID
-            cursor.execute("SELECT * FROM ideias WHERE id = ?", (ideia_id,))
-            row = cursor.fetchone()
-            
-            conn.close()
-            
-            if row:
-                return dict(row)
-            else:
-                return None
+            return self.conexoes.consultar_um("SELECT * FROM ideias WHERE id = ?", (ideia_id,))
                 
         except Exception as e:
             logger.error(f"Erro ao obter ideia por ID no SQLite: {str(e)}", exc_info=True)
@@ -177,27 +204,14 @@ class IdeaRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             # Se for superusuário, busca a ideia apenas pelo ID
             # Senão, busca pelo ID e chat_id
             if is_superuser:
-                cursor.execute("SELECT * FROM ideias WHERE id = ?", (ideia_id,))
-            else:
-                cursor.execute(
-                    "SELECT * FROM ideias WHERE id = ? AND chat_id = ?",
-                    (ideia_id, chat_id)
-                )
-            row = cursor.fetchone()
-            
-            conn.close()
-            
-            if row:
-                return dict(row)
-            else:
-                return None
+                return self.conexoes.consultar_um("SELECT * FROM ideias WHERE id = ?", (ideia_id,))
+            return self.conexoes.consultar_um(
+                "SELECT * FROM ideias WHERE id = ? AND chat_id = ?",
+                (ideia_id, chat_id)
+            )
                 
         except Exception as e:
             logger.error(f"Erro ao obter ideia: {str(e)}", exc_info=True)
@@ -221,49 +235,62 @@ class IdeaRepository:
         
         # Caso contrário, usa o SQLite
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Verifica se a ideia existe e pertence ao usuário (ou se é superusuário)
-            if is_superuser:
-                cursor.execute("SELECT id FROM ideias WHERE id = ?", (ideia_id,))
-            else:
-                cursor.execute(
-                    "SELECT id FROM ideias WHERE id = ? AND chat_id = ?",
-                    (ideia_id, chat_id)
+            # A verificação e a remoção ficam na mesma transação
+            with self.conexoes.transacao() as conn:
+                # Verifica se a ideia existe e pertence ao usuário (ou se é superusuário)
+                if is_superuser:
+                    cursor = conn.execute("SELECT id FROM ideias WHERE id = ?", (ideia_id,))
+                else:
+                    cursor = conn.execute(
+                        "SELECT id FROM ideias WHERE id = ? AND chat_id = ?",
+                        (ideia_id, chat_id)
+                    )
+                
+                if not cursor.fetchone():
+                    return False
+                
+                # Apaga os brainstorms relacionados e a ideia
+                conn.execute(
+                    "DELETE FROM brainstorms WHERE ideia_id = ?",
+                    (ideia_id,)
                 )
+                conn.execute("DELETE FROM ideias WHERE id = ?", (ideia_id,))
             
-            if not cursor.fetchone():
-                conn.close()
-                return False
-            
-            # Inicia uma transação
-            conn.execute("BEGIN TRANSACTION")
-            
-            # Apaga os brainstorms relacionados
-            cursor.execute(
-                "DELETE FROM brainstorms WHERE ideia_id = ?",
-                (ideia_id,)
-            )
+            logger.info(f"Ideia {ideia_id} apagada com sucesso")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Erro ao apagar ideia: {str(e)}", exc_info=True)
+            return False
+
+    def atualizar_resumo(self, ideia_id: int, resumo: str) -> bool:
+        """
+        Atualiza o resumo de uma ideia.
+        
+        Args:
+            ideia_id: ID da ideia
+            resumo: Novo resumo
             
-            # Apaga a ideia
-            if is_superuser:
-                cursor.execute("DELETE FROM ideias WHERE id = ?", (ideia_id,))
-            else:
-                cursor.execute(
-                    "DELETE FROM ideias WHERE id = ? AND chat_id = ?",
-                    (ideia_id, chat_id)
-                )
+        Returns:
+            bool: True se o resumo foi atualizado, False caso contrário
+        """
+        # Verifica se deve usar o Supabase
+        if USE_SUPABASE:
+            return supabase_service.atualizar_resumo(ideia_id, resumo)
+        
+        # Caso contrário, usa o SQLite
+        try:
+            cursor = self.conexoes.executar("UPDATE ideias SET resumo = ? WHERE id = ?", (resumo, ideia_id))
             
-            # Confirma a transação
-            conn.commit()
-            conn.close()
+            if cursor.rowcount == 0:
+                logger.warning(f"Ideia {ideia_id} não encontrada para atualizar o resumo")
+                return False
             
-            logger.info(f"Ideia {ideia_id} apagada com sucesso")
+            logger.info(f"Resumo da ideia {ideia_id} atualizado")
             return True
         
         except Exception as e:
-            logger.error(f"Erro ao apagar ideia: {str(e)}", exc_info=True)
+            logger.error(f"Erro ao atualizar resumo da ideia: {str(e)}", exc_info=True)
             return False
 
 # Instância global do repositório de ideias
@@ -0,0 +1,143 @@
+"""
+Migrações versionadas do esquema do banco SQLite.
+"""
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from src.database.connection_manager import ConnectionManager, connection_manager
+
+logger = logging.getLogger(__name__)
+
+def _esquema_inicial(conn: sqlite3.Connection) -> None:
+    """
+    Cria as tabelas de ideias e brainstorms (bancos já existentes não são alterados).
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS ideias ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "tipo TEXT NOT NULL, "
+        "conteudo TEXT NOT NULL, "
+        "resumo TEXT NOT NULL, "
+        "data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+        "chat_id INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS brainstorms ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "ideia_id INTEGER NOT NULL, "
+        "conteudo TEXT NOT NULL, "
+        "data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+        "FOREIGN KEY (ideia_id) REFERENCES ideias (id))"
+    )
+
+def _coluna_chat_id(conn: sqlite3.Connection) -> None:
+    """
+    Adiciona a coluna chat_id aos bancos criados antes dela (o que scripts/migrate_chat_id.py fazia).
+    """
+    colunas = [row[1] for row in conn.execute("PRAGMA table_info(ideias)")]
+    if "chat_id" not in colunas:
+        conn.execute("ALTER TABLE ideias ADD COLUMN chat_id INTEGER")
+
+def _indice_ideias_por_chat(conn: sqlite3.Connection) -> None:
+    """
+    Índice da listagem de ideias de um chat (WHERE chat_id = ? ORDER BY id DESC).
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ideias_chat_id_id ON ideias (chat_id, id DESC)")
+
+def _indice_brainstorms_por_ideia(conn: sqlite3.Connection) -> None:
+    """
+    Índice dos brainstorms de uma ideia (WHERE ideia_id = ? ORDER BY data_criacao DESC).
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_brainstorms_ideia_id_data ON brainstorms (ideia_id, data_criacao)")
+
+# Migrações em ordem: (versão, descrição, função que recebe a conexão).
+# Uma migração aplicada nunca deve ser alterada; mudanças no esquema entram como uma nova versão.
+MIGRACOES: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "Tabelas de ideias e brainstorms", _esquema_inicial),
+    (2, "Coluna chat_id em ideias", _coluna_chat_id),
+    (3, "Índice de ideias por chat", _indice_ideias_por_chat),
+    (4, "Índice de brainstorms por ideia", _indice_brainstorms_por_ideia),
+]
+
+class SchemaMigrator:
+    """
+    Aplica as migrações do esquema que ainda não foram aplicadas ao banco.
+    
+    A versão atual fica na tabela `schema_versao`, com uma linha por migração aplicada. Cada
+    migração roda em sua própria transação junto com o registro da versão, então uma falha
+    não deixa o esquema pela metade e a migração é repetida na próxima inicialização.
+    """
+    
+    def __init__(
+        self,
+        conexoes: ConnectionManager = connection_manager,
+        migracoes: Optional[List[Tuple[int, str, Callable[[sqlite3.Connection], None]]]] = None
+    ):
+        """
+        Inicializa o executor de migrações.
+        
+        Args:
+            conexoes: Conexões com o banco a migrar
+            migracoes: Migrações disponíveis (padrão: MIGRACOES)
+        """
+        self.conexoes = conexoes
+        self.migracoes = sorted(migracoes or MIGRACOES, key=lambda migracao: migracao[0])
+    
+    def versao_atual(self) -> int:
+        """
+        Retorna a versão mais recente aplicada ao banco.
+        
+        Returns:
+            int: Número da versão (0 para um banco sem migrações)
+        """
+        self._criar_tabela_versao()
+        row = self.conexoes.consultar_um("SELECT MAX(versao) AS versao FROM schema_versao")
+        return row["versao"] or 0
+    
+    def aplicar(self) -> List[int]:
+        """
+        Aplica, em ordem, as migrações com versão maior que a atual.
+        
+        Returns:
+            List[int]: Versões aplicadas nesta chamada
+            
+        Raises:
+            sqlite3.Error: Se uma migração falhar (as anteriores continuam aplicadas)
+        """
+        aplicadas = []
+        for versao, descricao, migrar in self.migracoes:
+            if versao <= self.versao_atual():
+                continue
+            
+            with self.conexoes.transacao() as conn:
+                # Outra instância pode ter aplicado a migração enquanto esta esperava o lock
+                if conn.execute("SELECT 1 FROM schema_versao WHERE versao = ?", (versao,)).fetchone():
+                    continue
+                migrar(conn)
+                conn.execute(
+                    "INSERT INTO schema_versao (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                    (versao, descricao, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                )
+            
+            logger.info(f"Migração {versao} aplicada: {descricao}")
+            aplicadas.append(versao)
+        
+        if aplicadas:
+            # Atualiza as estatísticas usadas pelo planejador de consultas
+            self.conexoes.executar("PRAGMA optimize")
+        return aplicadas
+    
+    def _criar_tabela_versao(self) -> None:
+        """
+        Cria a tabela de versões, se ainda não existir.
+        """
+        self.conexoes.executar(
+            "CREATE TABLE IF NOT EXISTS schema_versao ("
+            "versao INTEGER PRIMARY KEY, descricao TEXT NOT NULL, aplicada_em TEXT NOT NULL)"
+        )
+
+
+# Instância global do executor de migrações do banco de ideias e brainstorms
+schema_migrator = SchemaMigrator()
@@ -2,14 +2,23 @@
 Serviço para interação com o Supabase.
 """
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
 
-from supabase import create_client, Client
+from src.config.settings import LISTAR_DESCRICAO_MAX
+from src.config.supabase_config import (
+    SUPABASE_URL, TABELA_IDEIAS, TABELA_BRAINSTORMS, VIEW_LISTAGEM_IDEIAS, get_supabase_key
+)
+from src.utils.lazy import LazyInstance
+from src.utils.resiliencia import resiliencia
 
-from src.config.supabase_config import SUPABASE_URL, TABELA_IDEIAS, TABELA_BRAINSTORMS, get_supabase_key
+if TYPE_CHECKING:
+    from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Códigos de erro do PostgREST para tabela ou view inexistente
+ERROS_RELACAO_INEXISTENTE = ("42P01", "PGRST205")
+
 class SupabaseService:
     """
     Serviço para interação com o Supabase.
@@ -24,11 +33,19 @@ class SupabaseService:
                              Por padrão, usa a chave de serviço para evitar problemas com RLS.
         """
         try:
+            # Importado aqui porque o pacote supabase é pesado
+            from supabase import ClientOptions, create_client
+            from src.utils.http_pool import http_pool
+            
             # Obter a chave apropriada (serviço ou anônima)
             key = get_supabase_key(use_service_key)
             
-            # Inicializar o cliente Supabase
-            self.supabase: Client = create_client(SUPABASE_URL, key)
+            # Inicializar o cliente Supabase (usando o pool de conexões HTTP compartilhado)
+            opcoes = ClientOptions(httpx_client=http_pool.httpx_cliente("supabase"))
+            self.supabase: "Client" = create_client(SUPABASE_URL, key, options=opcoes)
+            
+            # Desligado se a view de listagem não existir (a listagem passa a usar a tabela)
+            self._view_listagem = True
             
             # Registrar o tipo de chave usada
             key_type = "serviço" if use_service_key and key != get_supabase_key(False) else "anônima"
@@ -37,6 +54,21 @@ class SupabaseService:
             logger.error(f"Erro ao inicializar cliente Supabase: {e}")
             raise
     
+    def executar(self, query: Any, idempotente: bool = True) -> Any:
+        """
+        Executa uma consulta com retentativas, prazo e circuit breaker do serviço "supabase".
+        
+        Args:
+            query: Consulta montada com o cliente (ex: self.supabase.table(...).select("*"))
+            idempotente: Se False (ex: inserções), a consulta não é repetida após uma falha,
+                         pois uma resposta perdida não garante que nada foi gravado
+            
+        Returns:
+            Any: Resposta da consulta
+        """
+        pode_repetir = None if idempotente else (lambda: False)
+        return resiliencia.executar_sincrono("supabase", query.execute, pode_repetir=pode_repetir)
+    
     def criar_tabelas(self) -> None:
         """
         Cria as tabelas necessárias no Supabase se elas não existirem.
@@ -76,7 +108,7 @@ class SupabaseService:
             logger.info(f"Dados a serem inseridos: {dados}")
             
             # Inserir a ideia no Supabase
-            response = self.supabase.table(TABELA_IDEIAS).insert(dados).execute()
+            response = self.executar(self.supabase.table(TABELA_IDEIAS).insert(dados), idempotente=False)
             
             # Verificar se a inserção foi bem-sucedida
             if response.data and len(response.data) > 0:
@@ -117,7 +149,7 @@ class SupabaseService:
                 query = query.eq("chat_id", chat_id)
             
             # Executar a query
-            response = query.select("*").order("id").execute()
+            response = self.executar(query.select("*").order("id"))
             
             # Verificar se a consulta foi bem-sucedida
             if response.data is not None:
@@ -130,6 +162,107 @@ class SupabaseService:
             logger.error(f"Erro ao listar ideias: {e}")
             return []
     
+    def listar_pagina_ideias(
+        self,
+        chat_id: int,
+        is_superuser: bool = False,
+        antes_de: Optional[int] = None,
+        depois_de: Optional[int] = None,
+        limite: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Lista uma página de ideias, da mais recente para a mais antiga, a partir de um ID (keyset).
+        
+        Consulta a view de listagem, que traz só o ID, o autor, o resumo e o início do conteúdo
+        (cortado no servidor), então o volume transferido depende apenas do tamanho da página.
+        Se a view não existir (scripts/criar_view_listagem_supabase.sql não foi executado),
+        consulta a tabela de ideias e corta o conteúdo aqui.
+        
+        Args:
+            chat_id: ID do chat do usuário
+            is_superuser: Se o usuário é um superusuário (lista as ideias de todos)
+            antes_de: Retorna as ideias com ID menor que este (página seguinte)
+            depois_de: Retorna as ideias com ID maior que este (página anterior)
+            limite: Máximo de ideias retornadas
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: Ideias ("id", "chat_id", "resumo" e "conteudo_inicio") em ordem
+            decrescente de ID, ou None em caso de erro
+        """
+        if self._view_listagem:
+            try:
+                return self._consultar_pagina(
+                    VIEW_LISTAGEM_IDEIAS, "id, chat_id, resumo, conteudo_inicio",
+                    chat_id, is_superuser, antes_de, depois_de, limite
+                )
+            except Exception as e:
+                if getattr(e, "code", None) not in ERROS_RELACAO_INEXISTENTE:
+                    logger.error(f"Erro ao listar página de ideias: {e}")
+                    return None
+                logger.error(
+                    f"View '{VIEW_LISTAGEM_IDEIAS}' não encontrada no Supabase (execute "
+                    f"scripts/criar_view_listagem_supabase.sql); listando pela tabela '{TABELA_IDEIAS}'"
+                )
+                self._view_listagem = False
+        
+        try:
+            ideias = self._consultar_pagina(
+                TABELA_IDEIAS, "id, chat_id, resumo, conteudo",
+                chat_id, is_superuser, antes_de, depois_de, limite
+            )
+        except Exception as e:
+            logger.error(f"Erro ao listar página de ideias: {e}")
+            return None
+        
+        if ideias is None:
+            return None
+        return [
+            {
+                "id": ideia["id"],
+                "chat_id": ideia["chat_id"],
+                "resumo": ideia["resumo"],
+                "conteudo_inicio": (ideia["conteudo"] or "")[:LISTAR_DESCRICAO_MAX + 1]
+            }
+            for ideia in ideias
+        ]
+    
+    def _consultar_pagina(
+        self,
+        tabela: str,
+        colunas: str,
+        chat_id: int,
+        is_superuser: bool,
+        antes_de: Optional[int],
+        depois_de: Optional[int],
+        limite: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Consulta uma página de ideias por keyset em uma tabela ou view.
+        Retorna None se a resposta não trouxer dados; erros da consulta são propagados.
+        """
+        query = self.supabase.table(tabela).select(colunas)
+        
+        # Se não for superusuário, filtrar por chat_id
+        if not is_superuser:
+            query = query.eq("chat_id", chat_id)
+        
+        # A página anterior é buscada em ordem crescente a partir do cursor e depois invertida
+        if depois_de is not None:
+            query = query.gt("id", depois_de).order("id")
+        else:
+            if antes_de is not None:
+                query = query.lt("id", antes_de)
+            query = query.order("id", desc=True)
+        
+        response = self.executar(query.limit(limite))
+        
+        # Verificar se a consulta foi bem-sucedida
+        if response.data is not None:
+            return response.data[::-1] if depois_de is not None else response.data
+        
+        logger.error(f"Erro ao listar página de ideias: {response.error}")
+        return None
+    
     def obter_ideia(self, ideia_id: int, chat_id: int, is_superuser: bool = False) -> Optional[Dict[str, Any]]:
         """
         Obtém uma ideia específica.
@@ -156,7 +289,7 @@ class SupabaseService:
                 query = query.eq("chat_id", chat_id)
             
             # Executar a query
-            response = query.execute()
+            response = self.executar(query)
             
             # Verificar se a consulta foi bem-sucedida e se retornou algum resultado
             if response.data and len(response.data) > 0:
@@ -192,7 +325,7 @@ class SupabaseService:
                     return False
             
             # Apagar a ideia
-            response = self.supabase.table(TABELA_IDEIAS).delete().eq("id", ideia_id).execute()
+            response = self.executar(self.supabase.table(TABELA_IDEIAS).delete().eq("id", ideia_id))
             
             # Verificar se a exclusão foi bem-sucedida
             if response.data is not None:
@@ -206,6 +339,32 @@ class SupabaseService:
             logger.error(f"Erro ao apagar ideia: {e}")
             return False
     
+    def atualizar_resumo(self, ideia_id: int, resumo: str) -> bool:
+        """
+        Atualiza o resumo de uma ideia.
+        
+        Args:
+            ideia_id: ID da ideia
+            resumo: Novo resumo
+            
+        Returns:
+            bool: True se o resumo foi atualizado, False caso contrário
+        """
+        try:
+            response = self.executar(self.supabase.table(TABELA_IDEIAS).update({"resumo": resumo}).eq("id", ideia_id))
+            
+            # Verificar se a atualização foi bem-sucedida
+            if response.data and len(response.data) > 0:
+                logger.info(f"Resumo da ideia {ideia_id} atualizado")
+                return True
+            
+            logger.warning(f"Ideia {ideia_id} não encontrada para atualizar o resumo")
+            return False
+        
+        except Exception as e:
+            logger.error(f"Erro ao atualizar resumo da ideia: {e}")
+            return False
+    
     def salvar_brainstorm(self, ideia_id: int, conteudo: str) -> Optional[int]:
         """
         Salva um brainstorm no Supabase.
@@ -221,10 +380,10 @@ class SupabaseService:
             logger.info(f"Salvando brainstorm para ideia {ideia_id}")
             
             # Inserir o brainstorm no Supabase
-            response = self.supabase.table(TABELA_BRAINSTORMS).insert({
+            response = self.executar(self.supabase.table(TABELA_BRAINSTORMS).insert({
                 "ideia_id": ideia_id,
                 "conteudo": conteudo
-            }).execute()
+            }), idempotente=False)
             
             # Verificar se a inserção foi bem-sucedida
             if response.data and len(response.data) > 0:
@@ -253,7 +412,7 @@ class SupabaseService:
             logger.info(f"Obtendo brainstorm para ideia {ideia_id}")
             
             # Executar a query
-            response = self.supabase.table(TABELA_BRAINSTORMS).eq("ideia_id", ideia_id).select("*").execute()
+            response = self.executar(self.supabase.table(TABELA_BRAINSTORMS).eq("ideia_id", ideia_id).select("*"))
             
             # Verificar se a consulta foi bem-sucedida e se retornou algum resultado
             if response.data and len(response.data) > 0:
@@ -267,6 +426,6 @@ class SupabaseService:
             return None
 
 
-# Instância global do serviço Supabase
+# Instância global do serviço Supabase (construída no primeiro uso)
 # Por padrão, tenta usar a chave de serviço para operações administrativas
-supabase_service = SupabaseService(use_service_key=True)
+supabase_service = LazyInstance(lambda: SupabaseService(use_service_key=True))
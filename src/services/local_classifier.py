@@ -0,0 +1,261 @@
+"""
+Classificador local (naive Bayes sobre n-gramas com hashing) para IDEIA x QUESTAO.
+"""
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import (
+    CLASSIFICADOR_DB_PATH, CLASSIFICADOR_LIMIAR, CLASSIFICADOR_MIN_EXEMPLOS, CLASSIFICADOR_NUM_FEATURES
+)
+from src.services.response_cache import gerar_chave, normalizar_texto
+from src.utils.lazy import LazyInstance
+
+logger = logging.getLogger(__name__)
+
+# Classes reconhecidas pelo classificador
+CLASSES = ("IDEIA", "QUESTAO")
+
+def extrair_features(texto: str, num_features: int = CLASSIFICADOR_NUM_FEATURES) -> List[int]:
+    """
+    Converte um texto em índices de features (unigramas e bigramas de palavras com hashing).
+    A interrogação conta como palavra, já que é um bom indício de pergunta.
+    
+    Args:
+        texto: Texto original
+        num_features: Tamanho do espaço de hashing
+        
+    Returns:
+        List[int]: Índices das features (com repetição)
+    """
+    tokens = re.findall(r"\w+|\?", normalizar_texto(texto))
+    ngramas = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return [zlib.crc32(ngrama.encode("utf-8")) % num_features for ngrama in ngramas]
+
+class LocalClassifier:
+    """
+    Naive Bayes multinomial treinado com o histórico rotulado.
+    
+    Os exemplos ficam em uma tabela SQLite própria. Ela é inicializada com as ideias já
+    salvas (coluna tipo) e cresce com as decisões tomadas pelo modelo da OpenAI, já que
+    as questões não são gravadas na tabela ideias.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = CLASSIFICADOR_DB_PATH,
+        limiar: float = CLASSIFICADOR_LIMIAR,
+        min_exemplos: int = CLASSIFICADOR_MIN_EXEMPLOS,
+        importar_historico: bool = True
+    ):
+        """
+        Inicializa o classificador e treina com os exemplos salvos.
+        
+        Args:
+            db_path: Caminho do arquivo SQLite com os exemplos
+            limiar: Probabilidade mínima para decidir sem consultar a OpenAI
+            min_exemplos: Exemplos mínimos de cada classe antes de decidir localmente
+            importar_historico: Se True, importa as ideias salvas quando não há exemplos
+        """
+        self.limiar = limiar
+        self.min_exemplos = min_exemplos
+        # _lock protege o modelo em memória (usado no event loop); _lock_db, a conexão SQLite,
+        # para que o commit de um exemplo novo não segure quem só quer classificar
+        self._lock = threading.Lock()
+        self._lock_db = threading.Lock()
+        self._contagens: Dict[str, Dict[int, int]] = {classe: defaultdict(int) for classe in CLASSES}
+        self._total_features: Dict[str, int] = {classe: 0 for classe in CLASSES}
+        self._documentos: Dict[str, int] = {classe: 0 for classe in CLASSES}
+        self._vocabulario = set()
+        self._decisoes = {"local": 0, "llm": 0}
+        
+        os.makedirs(os.path.dirname(str(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS exemplos ("
+            "chave TEXT PRIMARY KEY, texto TEXT NOT NULL, tipo TEXT NOT NULL, "
+            "origem TEXT NOT NULL, data_criacao TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        
+        if importar_historico and self._conn.execute("SELECT COUNT(*) FROM exemplos").fetchone()[0] == 0:
+            self.importar_historico()
+        
+        for texto, tipo in self._conn.execute("SELECT texto, tipo FROM exemplos ORDER BY data_criacao"):
+            self._treinar(texto, tipo)
+        
+        logger.info(f"Classificador local treinado com {self._documentos}")
+    
+    def importar_historico(self) -> int:
+        """
+        Importa como exemplos as mensagens já salvas na tabela ideias.
+        
+        Returns:
+            int: Quantidade de exemplos novos
+        """
+        from src.database.idea_repository import idea_repository
+        
+        try:
+            ideias = idea_repository.listar_ideias(0, is_superuser=True)
+        except Exception as e:
+            logger.error(f"Erro ao importar histórico para o classificador local: {e}")
+            return 0
+        
+        novos = sum(self._gravar(ideia["conteudo"], ideia["tipo"], "historico") for ideia in ideias if ideia.get("conteudo"))
+        logger.info(f"{novos} exemplos importados do histórico de ideias")
+        return novos
+    
+    def prever(self, texto: str) -> Tuple[str, float]:
+        """
+        Calcula a classe mais provável de um texto.
+        
+        Args:
+            texto: Texto a classificar
+            
+        Returns:
+            Tuple[str, float]: Classe prevista e sua probabilidade
+        """
+        features = extrair_features(texto)
+        
+        with self._lock:
+            total_documentos = sum(self._documentos.values())
+            tamanho_vocabulario = len(self._vocabulario) + 1
+            log_probs = {}
+            for classe in CLASSES:
+                # Suavização de Laplace nas contagens e na probabilidade a priori
+                log_prob = math.log((self._documentos[classe] + 1) / (total_documentos + len(CLASSES)))
+                denominador = self._total_features[classe] + tamanho_vocabulario
+                contagens = self._contagens[classe]
+                for feature in features:
+                    log_prob += math.log((contagens.get(feature, 0) + 1) / denominador)
+                log_probs[classe] = log_prob
+        
+        maximo = max(log_probs.values())
+        soma = sum(math.exp(valor - maximo) for valor in log_probs.values())
+        classe = max(log_probs, key=log_probs.get)
+        return classe, 1 / soma
+    
+    def classificar(self, texto: str) -> Optional[str]:
+        """
+        Classifica um texto se o modelo estiver confiante o bastante.
+        
+        Args:
+            texto: Texto a classificar
+            
+        Returns:
+            Optional[str]: Classe prevista, ou None se a decisão deve ficar com a OpenAI
+        """
+        if not self.pronto:
+            with self._lock:
+                self._decisoes["llm"] += 1
+            return None
+        
+        classe, probabilidade = self.prever(texto)
+        if probabilidade < self.limiar:
+            logger.info(f"Classificador local incerto ({classe}, p={probabilidade:.3f}), consultando a OpenAI")
+            with self._lock:
+                self._decisoes["llm"] += 1
+            return None
+        
+        logger.info(f"Mensagem classificada localmente: {classe} (p={probabilidade:.3f})")
+        with self._lock:
+            self._decisoes["local"] += 1
+        return classe
+    
+    def aprender(self, texto: str, tipo: str, origem: str = "llm") -> None:
+        """
+        Adiciona um exemplo rotulado (ex: a decisão da OpenAI) e atualiza o modelo.
+        Textos já conhecidos são ignorados.
+        
+        Args:
+            texto: Texto da mensagem
+            tipo: Classe atribuída (IDEIA ou QUESTAO)
+            origem: Origem do rótulo
+        """
+        if self._gravar(texto, tipo, origem):
+            self._treinar(texto, tipo)
+    
+    @property
+    def pronto(self) -> bool:
+        """
+        Indica se há exemplos suficientes de todas as classes para decidir localmente.
+        """
+        return all(self._documentos[classe] >= self.min_exemplos for classe in CLASSES)
+    
+    def estatisticas(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna os exemplos por classe e as decisões tomadas (locais ou pela OpenAI).
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Estatísticas do classificador
+        """
+        with self._lock:
+            return {"exemplos": dict(self._documentos), "decisoes": dict(self._decisoes)}
+    
+    def exemplos(self) -> Iterable[Tuple[str, str]]:
+        """
+        Retorna os exemplos gravados, na ordem em que foram aprendidos.
+        
+        Returns:
+            Iterable[Tuple[str, str]]: Pares (texto, tipo)
+        """
+        with self._lock_db:
+            return self._conn.execute("SELECT texto, tipo FROM exemplos ORDER BY data_criacao").fetchall()
+    
+    def _gravar(self, texto: str, tipo: str, origem: str) -> bool:
+        """
+        Grava um exemplo na tabela, retornando False se o tipo for desconhecido ou o texto repetido.
+        """
+        tipo = tipo.upper()
+        if tipo not in CLASSES:
+            return False
+        
+        with self._lock_db:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO exemplos (chave, texto, tipo, origem, data_criacao) VALUES (?, ?, ?, ?, ?)",
+                (gerar_chave(normalizar_texto(texto)), texto, tipo, origem, datetime.now().isoformat())
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+    
+    def _treinar(self, texto: str, tipo: str) -> None:
+        """
+        Soma as features de um exemplo às contagens da classe.
+        """
+        tipo = tipo.upper()
+        features = extrair_features(texto)
+        
+        with self._lock:
+            contagens = self._contagens[tipo]
+            for feature in features:
+                contagens[feature] += 1
+                self._vocabulario.add(feature)
+            self._total_features[tipo] += len(features)
+            self._documentos[tipo] += 1
+
+def resumir_localmente(texto: str, max_palavras: int = 5) -> str:
+    """
+    Gera o resumo provisório de uma mensagem classificada localmente (as primeiras palavras),
+    usado até o resumo da OpenAI ficar pronto.
+    
+    Args:
+        texto: Texto da mensagem
+        max_palavras: Quantidade máxima de palavras
+        
+    Returns:
+        str: Resumo da mensagem
+    """
+    palavras = texto.split()
+    resumo = " ".join(palavras[:max_palavras])
+    return resumo + "..." if len(palavras) > max_palavras else resumo
+
+
+# Instância global do classificador local (construída no primeiro uso)
+local_classifier = LazyInstance(LocalClassifier)
@@ -0,0 +1,147 @@
+"""
+Roteamento de modelos da OpenAI por operação, com SLO de latência.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from src.config.settings import OPENAI_ROTAS, ROTEAMENTO_MIN_AMOSTRAS, ROTEAMENTO_TEMPO_REBAIXADO
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+class ModelRouter:
+    """
+    Escolhe o modelo, a temperatura, o max_tokens e o timeout de cada operação.
+    
+    A latência de cada rota (operação + modelo) é registrada nas métricas como
+    "rota.<operacao>.<modelo>". Quando o p95 do modelo principal passa do SLO da rota,
+    ela é rebaixada para o modelo de fallback por um tempo; depois o principal volta a
+    ser usado e é reavaliado com amostras novas.
+    """
+    
+    def __init__(
+        self,
+        rotas: Dict[str, Dict[str, Any]] = OPENAI_ROTAS,
+        min_amostras: int = ROTEAMENTO_MIN_AMOSTRAS,
+        tempo_rebaixado: float = ROTEAMENTO_TEMPO_REBAIXADO
+    ):
+        """
+        Inicializa o roteador com todas as rotas no modelo principal.
+        
+        Args:
+            rotas: Configuração por operação (modelo, fallback, temperatura, max_tokens, timeout, slo_p95)
+            min_amostras: Amostras do modelo principal antes de avaliar o SLO
+            tempo_rebaixado: Segundos no fallback antes de voltar ao modelo principal
+        """
+        self.rotas = rotas
+        self.min_amostras = min_amostras
+        self.tempo_rebaixado = tempo_rebaixado
+        self._rebaixada_ate: Dict[str, float] = {}
+        self._amostras: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def rota(self, operacao: str) -> Dict[str, Any]:
+        """
+        Retorna a configuração a usar agora para uma operação.
+        
+        Args:
+            operacao: Nome da operação (ex: "classificacao")
+            
+        Returns:
+            Dict[str, Any]: Configuração da rota, com "modelo" já trocado pelo fallback se rebaixada
+        """
+        config = dict(self.rotas[operacao])
+        with self._lock:
+            ate = self._rebaixada_ate.get(operacao)
+            if ate is not None and time.monotonic() >= ate:
+                # Fim do rebaixamento: o modelo principal é reavaliado com amostras novas
+                del self._rebaixada_ate[operacao]
+                self._amostras[operacao] = 0
+                metricas.descartar(self._nome(operacao, config["modelo"]))
+                logger.info(f"Rota '{operacao}' voltou para o modelo {config['modelo']}")
+                ate = None
+        
+        if ate is not None:
+            config["modelo"] = config["fallback"]
+        return config
+    
+    @contextmanager
+    def medir(self, operacao: str, modelo: str) -> Iterator[None]:
+        """
+        Mede uma chamada bem-sucedida da rota e verifica o SLO.
+        Chamadas que falham não são registradas (erros rápidos distorceriam os percentis).
+        
+        Args:
+            operacao: Nome da operação
+            modelo: Modelo usado na chamada
+        """
+        inicio = time.perf_counter()
+        yield
+        self.registrar(operacao, modelo, time.perf_counter() - inicio)
+    
+    def registrar(self, operacao: str, modelo: str, segundos: float) -> None:
+        """
+        Registra a latência de uma chamada e rebaixa a rota se o p95 do principal passar do SLO.
+        
+        Args:
+            operacao: Nome da operação
+            modelo: Modelo usado na chamada
+            segundos: Duração da chamada
+        """
+        config = self.rotas[operacao]
+        nome = self._nome(operacao, modelo)
+        metricas.registrar(nome, segundos)
+        if modelo != config["modelo"]:
+            return
+        
+        with self._lock:
+            self._amostras[operacao] = self._amostras.get(operacao, 0) + 1
+            if operacao in self._rebaixada_ate or self._amostras[operacao] < self.min_amostras:
+                return
+            
+            p95 = metricas.percentil(nome, 95)
+            if p95 is None or p95 <= config["slo_p95"]:
+                return
+            
+            self._rebaixada_ate[operacao] = time.monotonic() + self.tempo_rebaixado
+        
+        metricas.contar(f"rota.{operacao}.rebaixamentos")
+        logger.warning(
+            f"Rota '{operacao}' rebaixada para {config['fallback']} por {self.tempo_rebaixado:.0f}s: "
+            f"p95 de {modelo} = {p95:.1f}s (SLO {config['slo_p95']:.1f}s)"
+        )
+    
+    def estado(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna o modelo em uso e os percentis de cada rota.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Modelo atual, se está rebaixada e p50/p95 (ms) do modelo atual
+        """
+        resultado = {}
+        for operacao in self.rotas:
+            modelo = self.rota(operacao)["modelo"]
+            nome = self._nome(operacao, modelo)
+            p50 = metricas.percentil(nome, 50)
+            p95 = metricas.percentil(nome, 95)
+            resultado[operacao] = {
+                "modelo": modelo,
+                "rebaixada": modelo != self.rotas[operacao]["modelo"],
+                "p50_ms": p50 * 1000 if p50 is not None else None,
+                "p95_ms": p95 * 1000 if p95 is not None else None,
+            }
+        return resultado
+    
+    @staticmethod
+    def _nome(operacao: str, modelo: str) -> str:
+        """
+        Nome da métrica de latência de uma rota.
+        """
+        return f"rota.{operacao}.{modelo}"
+
+
+# Instância global do roteador de modelos
+model_router = ModelRouter()
@@ -1,127 +1,548 @@
 """
 Serviço para interação com a API da OpenAI.
 """
+import asyncio
 import json
 import logging
-from typing import Tuple, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
-import openai
-import requests
-
-from src.config.settings import OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE
-from src.config.prompts import CLASSIFICADOR_PROMPT, BRAINSTORM_PROMPT, QUESTAO_PROMPT
-
-# Configuração da API da OpenAI
-openai.api_key = OPENAI_API_KEY
+from src.config.settings import (
+    OPENAI_API_KEY, CACHE_HABILITADO, CACHE_OPERACOES, BRAINSTORM_SECIONADO,
+    CLASSIFICADOR_LOCAL_HABILITADO, validar_configuracao
+)
+from src.config.prompts import (
+    CLASSIFICADOR_PROMPT, BRAINSTORM_PROMPT, QUESTAO_PROMPT, CLASSIFICAR_E_RESPONDER_PROMPT,
+    BRAINSTORM_SECOES, BRAINSTORM_SECAO_PROMPT, RESUMO_PROMPT
+)
+from src.services.local_classifier import local_classifier
+from src.services.model_router import model_router
+from src.services.response_cache import response_cache, gerar_chave, normalizar_texto
+from src.utils.async_runtime import async_runtime
+from src.utils.http_pool import http_pool
+from src.utils.lazy import LazyInstance
+from src.utils.metricas import metricas
+from src.utils.resiliencia import resiliencia, CircuitoAberto
+from src.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 class OpenAIService:
     """
     Serviço para interação com a API da OpenAI.
+    
+    Os métodos *_async são a implementação principal e não bloqueiam o event loop.
+    Os métodos síncronos de mesmo nome executam a versão assíncrona no runtime compartilhado.
     """
     
-    @staticmethod
-    def classificar_mensagem(texto: str) -> Tuple[str, str, str]:
+    def __init__(self):
+        """
+        Inicializa o serviço e configura a chave da API.
+        O módulo openai é importado aqui, e não no topo do arquivo, porque é pesado.
+        """
+        validar_configuracao()
+        
+        import openai
+        openai.api_key = OPENAI_API_KEY
+        
+        # Chamadas idênticas simultâneas (ex: /refazer tocado duas vezes) vão uma vez só à API
+        self._em_andamento = SingleFlight("openai")
+    
+    async def _chat_completion(
+        self,
+        operacao: str,
+        system: str,
+        prompt_base: str,
+        texto: str,
+        usar_cache: bool = True,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """
+        Faz uma chamada assíncrona ao endpoint de chat da OpenAI, consultando o cache antes.
+        
+        A chave do cache combina a operação, o modelo, a versão do prompt (hash do texto
+        do prompt) e a entrada normalizada, então mudar o prompt invalida as respostas antigas.
+        Com ao_receber, a resposta é pedida em streaming e o callback recebe o texto acumulado
+        a cada trecho recebido (uma resposta vinda do cache é apenas retornada).
+        Chamadas simultâneas com a mesma chave compartilham uma única requisição à API.
+        
+        Args:
+            operacao: Nome da operação ("classificacao", "questao" ou "brainstorm")
+            system: Mensagem de sistema
+            prompt_base: Prompt ao qual o texto do usuário é anexado
+            texto: Texto do usuário
+            usar_cache: Se False, ignora respostas em cache (mas atualiza o cache com a nova)
+            ao_receber: Callback assíncrono opcional chamado com o texto parcial
+            
+        Returns:
+            str: Conteúdo da resposta, sem espaços nas extremidades
+            
+        Raises:
+            CircuitoAberto: Se a OpenAI estiver indisponível
+            Exception: Erro da API após esgotar as tentativas
+        """
+        cache_ativo = CACHE_HABILITADO and CACHE_OPERACOES.get(operacao, False)
+        versao_prompt = gerar_chave(system, prompt_base)[:12]
+        # A chave usa o modelo principal da rota: respostas do fallback continuam válidas
+        chave = gerar_chave(operacao, model_router.rotas[operacao]["modelo"], versao_prompt, normalizar_texto(texto))
+        
+        if cache_ativo and usar_cache:
+            # O cache pode ler do SQLite: a consulta fica fora do event loop
+            em_cache = await async_runtime.em_thread(response_cache.buscar, operacao, chave)
+            if em_cache is not None:
+                logger.info(f"Resposta de {operacao} obtida do cache")
+                return em_cache
+        
+        return await self._em_andamento.executar(
+            chave,
+            lambda transmitir: self._chamar_api(operacao, system, prompt_base, texto, chave if cache_ativo else None, transmitir),
+            ao_receber
+        )
+    
+    async def _chamar_api(
+        self,
+        operacao: str,
+        system: str,
+        prompt_base: str,
+        texto: str,
+        chave_cache: Optional[str],
+        ao_receber: Optional[Callable[[str], Awaitable[None]]]
+    ) -> str:
+        """
+        Faz a requisição à OpenAI e salva a resposta no cache.
+        
+        O modelo, a temperatura, o max_tokens e o timeout vêm da rota da operação
+        (ver ModelRouter), que também registra a latência da chamada.
+        A chamada passa pela política de resiliência do serviço "openai": erros temporários
+        são repetidos, a menos que parte da resposta já tenha sido entregue ao callback.
+        
+        Args:
+            operacao: Nome da operação
+            system: Mensagem de sistema
+            prompt_base: Prompt ao qual o texto do usuário é anexado
+            texto: Texto do usuário
+            chave_cache: Chave para salvar a resposta, ou None se o cache estiver desativado
+            ao_receber: Callback assíncrono opcional chamado com o texto parcial
+            
+        Returns:
+            str: Conteúdo da resposta, sem espaços nas extremidades
+        """
+        import openai
+        
+        # Usa a sessão com keep-alive compartilhada em vez de abrir uma conexão por chamada
+        openai.aiosession.set(http_pool.aiohttp_sessao("openai"))
+        
+        rota = model_router.rota(operacao)
+        parametros = {
+            "model": rota["modelo"],
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": f"{prompt_base}\n{texto}"}
+            ],
+            "temperature": rota["temperatura"],
+            "stream": ao_receber is not None,
+            "request_timeout": (http_pool.timeout("openai")[0], rota["timeout"]),
+        }
+        if rota["max_tokens"] is not None:
+            parametros["max_tokens"] = rota["max_tokens"]
+        
+        entregou_parcial = False
+        
+        async def tentativa() -> str:
+            nonlocal entregou_parcial
+            response = await openai.ChatCompletion.acreate(**parametros)
+            
+            if ao_receber is None:
+                return response.choices[0].message.content.strip()
+            
+            partes = []
+            async for chunk in response:
+                trecho = chunk.choices[0].delta.get("content")
+                if trecho:
+                    partes.append(trecho)
+                    entregou_parcial = True
+                    await ao_receber("".join(partes))
+            return "".join(partes).strip()
+        
+        with metricas.medir(f"openai.{operacao}"), model_router.medir(operacao, rota["modelo"]):
+            conteudo = await resiliencia.executar("openai", tentativa, pode_repetir=lambda: not entregou_parcial)
+        
+        if chave_cache:
+            await async_runtime.em_thread(response_cache.salvar, operacao, chave_cache, conteudo)
+        
+        return conteudo
+    
+    def classificar_mensagem(self, texto: str) -> Tuple[str, str, Optional[str]]:
+        """
+        Classifica a mensagem usando o modelo de IA (versão síncrona).
+        
+        Args:
+            texto: Texto a ser classificado
+            
+        Returns:
+            Tuple[str, str, Optional[str]]: Tipo, conteúdo e resumo da mensagem (None se classificada localmente)
+        """
+        return async_runtime.executar(self.classificar_mensagem_async(texto))
+    
+    async def classificar_mensagem_async(self, texto: str) -> Tuple[str, str, Optional[str]]:
         """
         Classifica a mensagem usando o modelo de IA.
         
+        Com o classificador local habilitado, ele decide primeiro; a OpenAI só é consultada
+        quando ele não está confiante, e a decisão dela vira um novo exemplo de treino.
+        O classificador local não gera resumo: nesse caso o resumo vem como None e pode ser
+        obtido depois com resumir_async.
+        
         Args:
             texto: Texto a ser classificado
             
         Returns:
-            Tuple[str, str, str]: Tipo, conteúdo e resumo da mensagem
+            Tuple[str, str, Optional[str]]: Tipo, conteúdo e resumo da mensagem (None se classificada localmente)
         """
+        tipo = await self._classificar_localmente(texto)
+        if tipo:
+            return tipo, texto, None
+        
         try:
             logger.info("Classificando mensagem...")
             
-            # Prepara o prompt completo
-            prompt_completo = f"{CLASSIFICADOR_PROMPT}\n{texto}"
-            
-            # Faz a chamada para a API da OpenAI
-            response = openai.ChatCompletion.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "Você é um assistente que classifica mensagens."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=OPENAI_TEMPERATURE
+            # Faz a chamada para a API da OpenAI (ou obtém do cache)
+            resposta = await self._chat_completion(
+                "classificacao",
+                "Você é um assistente que classifica mensagens.",
+                CLASSIFICADOR_PROMPT,
+                texto
             )
-            
-            # Extrai a resposta
-            resposta = response.choices[0].message.content.strip()
             logger.info(f"Resposta da classificação: {resposta}")
             
-            # Tenta extrair os dados da resposta
-            try:
-                # Tenta interpretar como JSON
-                dados = json.loads(resposta)
-                if isinstance(dados, list) and len(dados) == 3:
-                    tipo, conteudo, resumo = dados
-                    return tipo, conteudo, resumo
-            except json.JSONDecodeError:
-                # Se não for JSON, tenta extrair manualmente
-                pass
-            
-            # Tenta extrair usando regex ou parsing manual
-            import re
-            match = re.search(r'\["([^"]+)","([^"]+)","([^"]+)"\]', resposta)
-            if match:
-                tipo, conteudo, resumo = match.groups()
-                return tipo, conteudo, resumo
+            classificacao = self._interpretar_classificacao(resposta)
+            if classificacao:
+                await self._aprender_localmente(texto, classificacao[0])
+                return classificacao
             
             # Fallback: retorna a mensagem original como QUESTAO
             logger.warning("Não foi possível classificar a mensagem, usando fallback")
             return "QUESTAO", texto, texto[:30] + "..." if len(texto) > 30 else texto
-            
+        
         except Exception as e:
             logger.error(f"Erro ao classificar mensagem: {e}")
             return "QUESTAO", texto, texto[:30] + "..." if len(texto) > 30 else texto
     
+    def classificar_e_responder(self, texto: str) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """
+        Classifica a mensagem e, se for uma questão, já a responde (versão síncrona).
+        
+        Args:
+            texto: Texto da mensagem
+            
+        Returns:
+            Tuple[str, str, Optional[str], Optional[str]]: Tipo, conteúdo, resumo (None se classificada
+            localmente) e resposta (None para ideias)
+        """
+        return async_runtime.executar(self.classificar_e_responder_async(texto))
+    
+    async def classificar_e_responder_async(
+        self,
+        texto: str,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """
+        Classifica a mensagem e, se for uma questão, já a responde.
+        
+        A completion devolve a classificação na primeira linha e a resposta nas seguintes,
+        então uma questão custa uma única chamada em vez de duas. Para ideias o modelo devolve
+        apenas a primeira linha. Se a classificação não puder ser interpretada, a resposta
+        retorna como None e o chamador deve usar responder_questao_async.
+        Mensagens decididas pelo classificador local vêm sem resumo (None), como em
+        classificar_mensagem_async.
+        
+        Args:
+            texto: Texto da mensagem
+            ao_receber: Callback opcional que recebe o texto parcial da resposta (só para questões)
+            
+        Returns:
+            Tuple[str, str, Optional[str], Optional[str]]: Tipo, conteúdo, resumo (None se classificada
+            localmente) e resposta (None para ideias)
+        """
+        tipo = await self._classificar_localmente(texto)
+        if tipo == "IDEIA":
+            return tipo, texto, None, None
+        if tipo == "QUESTAO":
+            resposta = await self.responder_questao_async(texto, ao_receber=ao_receber)
+            return tipo, texto, None, resposta
+        
+        fallback = ("QUESTAO", texto, texto[:30] + "..." if len(texto) > 30 else texto, None)
+        
+        async def repassar_resposta(parcial: str) -> None:
+            # Só repassa o texto depois da primeira linha, e apenas se for uma questão
+            linha, separador, resto = parcial.partition("\n")
+            if separador and resto.strip() and "QUESTAO" in linha.upper():
+                await ao_receber(resto.lstrip())
+        
+        try:
+            logger.info("Classificando e respondendo mensagem...")
+            
+            resposta = await self._chat_completion(
+                "classificacao_resposta",
+                "Você é um assistente que classifica mensagens e responde perguntas.",
+                CLASSIFICAR_E_RESPONDER_PROMPT,
+                texto,
+                ao_receber=repassar_resposta if ao_receber else None
+            )
+            
+            linha, _, resto = resposta.partition("\n")
+            classificacao = self._interpretar_classificacao(linha.strip())
+            if not classificacao:
+                logger.warning("Não foi possível interpretar a classificação, usando fallback")
+                return fallback
+            
+            await self._aprender_localmente(texto, classificacao[0])
+            
+            tipo, conteudo, resumo = classificacao
+            logger.info(f"Mensagem classificada e respondida em uma chamada: {tipo}")
+            if tipo.upper() == "QUESTAO":
+                return tipo, conteudo, resumo, resto.strip() or None
+            return tipo, conteudo, resumo, None
+        
+        except Exception as e:
+            logger.error(f"Erro ao classificar e responder mensagem: {e}")
+            return fallback
+    
+    def resumir(self, texto: str) -> Optional[str]:
+        """
+        Gera o resumo curto de uma mensagem (versão síncrona).
+        
+        Args:
+            texto: Texto da mensagem
+            
+        Returns:
+            Optional[str]: Resumo da mensagem, ou None em caso de erro
+        """
+        return async_runtime.executar(self.resumir_async(texto))
+    
+    async def resumir_async(self, texto: str) -> Optional[str]:
+        """
+        Gera o resumo curto (3 a 5 palavras) de uma mensagem, como o que a classificação da
+        OpenAI devolve. Usado para as ideias classificadas localmente.
+        
+        Args:
+            texto: Texto da mensagem
+            
+        Returns:
+            Optional[str]: Resumo da mensagem, ou None em caso de erro
+        """
+        try:
+            resumo = await self._chat_completion(
+                "resumo",
+                "Você é um assistente que resume mensagens.",
+                RESUMO_PROMPT,
+                texto
+            )
+            return resumo.strip().strip('"') or None
+        except Exception as e:
+            logger.error(f"Erro ao resumir mensagem: {e}")
+            return None
+    
+    async def _classificar_localmente(self, texto: str) -> Optional[str]:
+        """
+        Consulta o classificador local, se habilitado.
+        
+        Args:
+            texto: Texto da mensagem
+            
+        Returns:
+            Optional[str]: Tipo decidido localmente, ou None se a OpenAI deve decidir
+        """
+        if not CLASSIFICADOR_LOCAL_HABILITADO:
+            return None
+        
+        # A primeira construção lê os exemplos do disco, então não roda no event loop
+        if not local_classifier.construida:
+            await async_runtime.em_thread(local_classifier.obter)
+        
+        with metricas.medir("classificador_local"):
+            return local_classifier.classificar(texto)
+    
+    async def _aprender_localmente(self, texto: str, tipo: str) -> None:
+        """
+        Registra a decisão da OpenAI como exemplo do classificador local, se habilitado.
+        
+        Args:
+            texto: Texto da mensagem
+            tipo: Tipo decidido pela OpenAI
+        """
+        if CLASSIFICADOR_LOCAL_HABILITADO:
+            await async_runtime.em_thread(local_classifier.aprender, texto, tipo)
+    
     @staticmethod
-    def gerar_brainstorm(ideia: str) -> str:
+    def _interpretar_classificacao(resposta: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Extrai tipo, conteúdo e resumo da resposta do classificador.
+        
+        Args:
+            resposta: Texto retornado pelo modelo
+            
+        Returns:
+            Optional[Tuple[str, str, str]]: Tipo, conteúdo e resumo, ou None se não for possível extrair
+        """
+        try:
+            # Tenta interpretar como JSON
+            dados = json.loads(resposta)
+            if isinstance(dados, list) and len(dados) == 3:
+                tipo, conteudo, resumo = dados
+                return tipo, conteudo, resumo
+        except json.JSONDecodeError:
+            # Se não for JSON, tenta extrair manualmente
+            pass
+        
+        # Tenta extrair usando regex ou parsing manual
+        import re
+        match = re.search(r'\["([^"]+)","([^"]+)","([^"]+)"\]', resposta)
+        if match:
+            tipo, conteudo, resumo = match.groups()
+            return tipo, conteudo, resumo
+        
+        return None
+    
+    def gerar_brainstorm(self, ideia: str, usar_cache: bool = True) -> Optional[str]:
+        """
+        Gera um brainstorm para uma ideia usando o modelo de IA (versão síncrona).
+        
+        Args:
+            ideia: Texto da ideia
+            usar_cache: Se False, sempre gera um brainstorm novo (ex: /refazer)
+            
+        Returns:
+            Optional[str]: Texto do brainstorm gerado ou None em caso de erro
+        """
+        return async_runtime.executar(self.gerar_brainstorm_async(ideia, usar_cache))
+    
+    async def gerar_brainstorm_async(
+        self,
+        ideia: str,
+        usar_cache: bool = True,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
         """
         Gera um brainstorm para uma ideia usando o modelo de IA.
+        Com BRAINSTORM_SECIONADO, as seções são geradas em paralelo (ver _gerar_secoes).
         
         Args:
             ideia: Texto da ideia
+            usar_cache: Se False, sempre gera um brainstorm novo (ex: /refazer)
+            ao_receber: Callback opcional que recebe o texto parcial durante o streaming
             
         Returns:
-            str: Texto do brainstorm gerado
+            Optional[str]: Texto do brainstorm gerado ou None em caso de erro
+                           (o erro nunca deve ser salvo como brainstorm)
         """
         try:
             logger.info("Gerando brainstorm...")
             
-            # Prepara o prompt completo
-            prompt_completo = f"{BRAINSTORM_PROMPT}\n{ideia}"
-            
-            # Faz a chamada para a API da OpenAI
-            response = openai.ChatCompletion.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "Você é um especialista em inovação e brainstorming."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=OPENAI_TEMPERATURE
-            )
+            if BRAINSTORM_SECIONADO:
+                with metricas.medir("brainstorm.secionado"):
+                    brainstorm = await self._gerar_secoes(ideia, usar_cache, ao_receber)
+                logger.info("Brainstorm gerado com sucesso")
+                return brainstorm
             
-            # Extrai a resposta
-            brainstorm = response.choices[0].message.content.strip()
+            # Faz a chamada para a API da OpenAI (ou obtém do cache)
+            brainstorm = await self._chat_completion(
+                "brainstorm",
+                "Você é um especialista em inovação e brainstorming.",
+                BRAINSTORM_PROMPT,
+                ideia,
+                usar_cache=usar_cache,
+                ao_receber=ao_receber
+            )
             logger.info("Brainstorm gerado com sucesso")
             
             return brainstorm
-            
+        
         except Exception as e:
             logger.error(f"Erro ao gerar brainstorm: {e}")
-            return f"Erro ao gerar brainstorm: {e}"
+            return None
     
-    @staticmethod
-    def responder_questao(questao: str) -> str:
+    async def _gerar_secoes(
+        self,
+        ideia: str,
+        usar_cache: bool,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]]
+    ) -> str:
+        """
+        Gera cada seção do brainstorm em uma completion própria, todas ao mesmo tempo.
+        
+        Cada seção é repassada ao callback assim que começa a chegar, montada na ordem fixa
+        das seções, então o usuário vê as seções mais rápidas antes de as outras terminarem.
+        Se uma seção falhar, as que ainda estão sendo geradas são canceladas.
+        
+        Args:
+            ideia: Texto da ideia
+            usar_cache: Se False, ignora as seções em cache
+            ao_receber: Callback opcional que recebe o brainstorm parcial
+            
+        Returns:
+            str: Brainstorm com as seções na ordem de BRAINSTORM_SECOES
+            
+        Raises:
+            Exception: Se alguma seção falhar (um brainstorm incompleto não é salvo)
+        """
+        textos: Dict[str, str] = {}
+        
+        def montar() -> str:
+            return "\n\n".join(f"*{secao}*\n{textos[secao]}" for secao in BRAINSTORM_SECOES if textos.get(secao))
+        
+        async def gerar(secao: str) -> None:
+            async def repassar(parcial: str) -> None:
+                textos[secao] = parcial
+                await ao_receber(montar())
+            
+            textos[secao] = await self._chat_completion(
+                "brainstorm_secao",
+                "Você é um especialista em inovação e brainstorming.",
+                BRAINSTORM_SECAO_PROMPT.format(secao=secao),
+                ideia,
+                usar_cache=usar_cache,
+                ao_receber=repassar if ao_receber is not None else None
+            )
+            if ao_receber is not None:
+                await ao_receber(montar())
+        
+        tarefas = [asyncio.ensure_future(gerar(secao)) for secao in BRAINSTORM_SECOES]
+        try:
+            await asyncio.wait(tarefas, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Uma seção falhou (ou o brainstorm foi cancelado): as outras não serão usadas
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+        
+        for tarefa in tarefas:
+            if not tarefa.cancelled() and tarefa.exception() is not None:
+                raise tarefa.exception()
+        return montar()
+    
+    def responder_questao(self, questao: str) -> str:
+        """
+        Responde a uma questão do usuário usando o modelo de IA (versão síncrona).
+        
+        Args:
+            questao: Texto da questão
+            
+        Returns:
+            str: Texto da resposta gerada
+        """
+        return async_runtime.executar(self.responder_questao_async(questao))
+    
+    async def responder_questao_async(
+        self,
+        questao: str,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
         """
         Responde a uma questão do usuário usando o modelo de IA.
         
         Args:
             questao: Texto da questão
+            ao_receber: Callback opcional que recebe o texto parcial durante o streaming
             
         Returns:
             str: Texto da resposta gerada
@@ -129,29 +550,25 @@ class OpenAIService:
         try:
             logger.info("Respondendo questão...")
             
-            # Prepara o prompt completo
-            prompt_completo = f"{QUESTAO_PROMPT}\n{questao}"
-            
-            # Faz a chamada para a API da OpenAI
-            response = openai.ChatCompletion.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "Você é um assistente virtual útil e informativo."},
-                    {"role": "user", "content": prompt_completo}
-                ],
-                temperature=OPENAI_TEMPERATURE
+            # Faz a chamada para a API da OpenAI (ou obtém do cache)
+            resposta = await self._chat_completion(
+                "questao",
+                "Você é um assistente virtual útil e informativo.",
+                QUESTAO_PROMPT,
+                questao,
+                ao_receber=ao_receber
             )
-            
-            # Extrai a resposta
-            resposta = response.choices[0].message.content.strip()
             logger.info("Resposta gerada com sucesso")
             
             return resposta
-            
+        
+        except CircuitoAberto as e:
+            logger.error(f"Erro ao responder questão: {e}")
+            return "Desculpe, o serviço de IA está temporariamente indisponível. Tente novamente em alguns instantes."
         except Exception as e:
             logger.error(f"Erro ao responder questão: {e}")
             return f"Desculpe, não consegui processar sua pergunta devido a um erro: {e}"
 
 
-# Instância global do serviço OpenAI
-openai_service = OpenAIService()
+# Instância global do serviço OpenAI (construída no primeiro uso)
+openai_service = LazyInstance(OpenAIService)
@@ -0,0 +1,231 @@
+"""
+Cache persistente de respostas com camada em memória (LRU) e em disco (SQLite).
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    CACHE_DB_PATH, CACHE_TTL_SEGUNDOS, CACHE_MEMORIA_MAX_ITENS, CACHE_DISCO_MAX_BYTES
+)
+from src.utils.lazy import LazyInstance
+
+logger = logging.getLogger(__name__)
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza um texto para uso em chaves de cache.
+    Ignora diferenças de caixa, de espaços e de forma Unicode.
+    
+    Args:
+        texto: Texto original
+        
+    Returns:
+        str: Texto normalizado
+    """
+    texto = unicodedata.normalize("NFC", texto)
+    return re.sub(r"\s+", " ", texto).strip().casefold()
+
+def gerar_chave(*partes: str) -> str:
+    """
+    Gera uma chave de cache estável a partir de várias partes.
+    
+    Args:
+        *partes: Partes da chave (ex: operação, modelo, versão do prompt, texto normalizado)
+        
+    Returns:
+        str: Hash SHA-256 das partes
+    """
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Cache de duas camadas: um LRU em memória na frente de uma tabela SQLite em disco.
+    
+    As entradas expiram após o TTL configurado. O disco é limitado em bytes, e as entradas
+    acessadas há mais tempo são removidas primeiro quando o limite é ultrapassado. O total em
+    bytes é mantido em memória, atualizado a cada gravação e remoção, para que salvar não
+    precise somar a tabela inteira.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = CACHE_DB_PATH,
+        ttl_segundos: float = CACHE_TTL_SEGUNDOS,
+        max_itens_memoria: int = CACHE_MEMORIA_MAX_ITENS,
+        max_bytes_disco: int = CACHE_DISCO_MAX_BYTES
+    ):
+        """
+        Inicializa o cache e cria a tabela em disco se necessário.
+        
+        Args:
+            db_path: Caminho do arquivo SQLite
+            ttl_segundos: Tempo de vida de cada entrada
+            max_itens_memoria: Máximo de entradas na camada em memória
+            max_bytes_disco: Tamanho máximo (soma dos valores) da camada em disco
+        """
+        self.ttl_segundos = ttl_segundos
+        self.max_itens_memoria = max_itens_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._contadores: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(str(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "chave TEXT PRIMARY KEY, valor TEXT NOT NULL, tamanho INTEGER NOT NULL, "
+            "expira_em REAL NOT NULL, acessado_em REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_acessado_em ON cache(acessado_em)")
+        self._conn.commit()
+        self._bytes_disco = self._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM cache").fetchone()[0]
+    
+    def buscar(self, operacao: str, chave: str) -> Optional[Any]:
+        """
+        Busca um valor no cache, primeiro em memória e depois em disco.
+        
+        Args:
+            operacao: Nome da operação (usado nos contadores)
+            chave: Chave gerada por gerar_chave()
+            
+        Returns:
+            Optional[Any]: Valor armazenado ou None se ausente/expirado
+        """
+        agora = time.time()
+        
+        with self._lock:
+            entrada = self._memoria.get(chave)
+            if entrada and entrada[0] > agora:
+                self._memoria.move_to_end(chave)
+                self._contar(operacao, "acertos_memoria")
+                return entrada[1]
+            if entrada:
+                del self._memoria[chave]
+            
+            row = self._conn.execute(
+                "SELECT valor, expira_em FROM cache WHERE chave = ?", (chave,)
+            ).fetchone()
+            
+            if row and row[1] > agora:
+                valor = json.loads(row[0])
+                self._conn.execute("UPDATE cache SET acessado_em = ? WHERE chave = ?", (agora, chave))
+                self._conn.commit()
+                self._guardar_em_memoria(chave, row[1], valor)
+                self._contar(operacao, "acertos_disco")
+                return valor
+            
+            if row:
+                self._remover_do_disco("DELETE FROM cache WHERE chave = ?", (chave,))
+                self._conn.commit()
+            
+            self._contar(operacao, "faltas")
+            return None
+    
+    def salvar(self, operacao: str, chave: str, valor: Any) -> None:
+        """
+        Armazena um valor nas duas camadas do cache.
+        
+        Args:
+            operacao: Nome da operação (usado nos contadores)
+            chave: Chave gerada por gerar_chave()
+            valor: Valor serializável em JSON
+        """
+        agora = time.time()
+        expira_em = agora + self.ttl_segundos
+        serializado = json.dumps(valor, ensure_ascii=False)
+        tamanho = len(serializado.encode("utf-8"))
+        
+        with self._lock:
+            self._guardar_em_memoria(chave, expira_em, valor)
+            # A entrada substituída (mesma chave) deixa de contar no total
+            self._remover_do_disco("DELETE FROM cache WHERE chave = ?", (chave,))
+            self._conn.execute(
+                "INSERT INTO cache (chave, valor, tamanho, expira_em, acessado_em) VALUES (?, ?, ?, ?, ?)",
+                (chave, serializado, tamanho, expira_em, agora)
+            )
+            self._bytes_disco += tamanho
+            if self._bytes_disco > self.max_bytes_disco:
+                self._remover_excedente_disco(agora)
+            self._conn.commit()
+            self._contar(operacao, "gravacoes")
+    
+    def estatisticas(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna os contadores de acertos e faltas por operação.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Contadores por operação
+        """
+        with self._lock:
+            return {operacao: dict(contadores) for operacao, contadores in self._contadores.items()}
+    
+    def limpar(self) -> None:
+        """
+        Remove todas as entradas das duas camadas.
+        """
+        with self._lock:
+            self._memoria.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._bytes_disco = 0
+    
+    def _guardar_em_memoria(self, chave: str, expira_em: float, valor: Any) -> None:
+        """
+        Insere uma entrada na camada em memória, removendo a menos usada se necessário.
+        """
+        self._memoria[chave] = (expira_em, valor)
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_itens_memoria:
+            self._memoria.popitem(last=False)
+    
+    def _remover_excedente_disco(self, agora: float) -> None:
+        """
+        Remove as entradas expiradas e, se o disco continuar acima do limite, as acessadas há mais tempo.
+        """
+        antes = self._bytes_disco
+        self._remover_do_disco("DELETE FROM cache WHERE expira_em <= ?", (agora,))
+        
+        while self._bytes_disco > self.max_bytes_disco:
+            chaves = self._remover_do_disco(
+                "DELETE FROM cache WHERE chave IN (SELECT chave FROM cache ORDER BY acessado_em LIMIT 1)"
+            )
+            if not chaves:
+                break
+            for chave in chaves:
+                self._memoria.pop(chave, None)
+        
+        logger.info(f"Cache em disco acima do limite: {antes - self._bytes_disco} bytes removidos")
+    
+    def _remover_do_disco(self, sql: str, parametros: Tuple[Any, ...] = ()) -> List[str]:
+        """
+        Executa um DELETE na tabela do cache e desconta do total os bytes removidos.
+        
+        Returns:
+            List[str]: Chaves removidas
+        """
+        removidas = self._conn.execute(f"{sql} RETURNING chave, tamanho", parametros).fetchall()
+        self._bytes_disco -= sum(tamanho for _, tamanho in removidas)
+        return [chave for chave, _ in removidas]
+    
+    def _contar(self, operacao: str, evento: str) -> None:
+        """
+        Incrementa um contador de eventos da operação.
+        """
+        contadores = self._contadores.setdefault(
+            operacao, {"acertos_memoria": 0, "acertos_disco": 0, "faltas": 0, "gravacoes": 0}
+        )
+        contadores[evento] += 1
+
+
+# Instância global do cache de respostas da OpenAI (construída no primeiro uso)
+response_cache = LazyInstance(ResponseCache)
@@ -0,0 +1,164 @@
+"""
+Geração especulativa de brainstorms enquanto o usuário decide se quer um.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.config.prompts import BRAINSTORM_PROMPT, BRAINSTORM_SECAO_PROMPT, BRAINSTORM_SECOES
+from src.config.settings import BRAINSTORM_ESPECULATIVO_PRAZO, BRAINSTORM_SECIONADO
+from src.services.openai_service import openai_service
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+# Aproximação usada para estimar tokens a partir do texto (sem depender de um tokenizador)
+CARACTERES_POR_TOKEN = 4
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estima a quantidade de tokens de um texto.
+    
+    Args:
+        texto: Texto enviado ou recebido da API
+        
+    Returns:
+        int: Quantidade aproximada de tokens
+    """
+    return len(texto) // CARACTERES_POR_TOKEN
+
+class _Especulacao:
+    """
+    Um brainstorm sendo gerado antes da confirmação do usuário.
+    """
+    
+    def __init__(self, ideia: str):
+        self.ideia = ideia
+        self.tarefa: Optional["asyncio.Task[Optional[str]]"] = None
+        self.expiracao: Optional[asyncio.TimerHandle] = None
+        self.ouvintes: List[Callable[[str], Awaitable[None]]] = []
+        self.ultimo_parcial: Optional[str] = None
+
+class SpeculativeBrainstorm:
+    """
+    Começa a gerar o brainstorm de uma ideia assim que ela é salva, enquanto o bot espera o "sim".
+    
+    Um "sim" recebe o brainstorm pronto (ou acompanha o que falta da geração); um "não" ou o fim
+    do prazo cancela a geração. As métricas "especulacao.*" registram as especulações
+    iniciadas, aproveitadas e descartadas e os tokens gastos em brainstorms descartados.
+    Deve ser usado sempre no event loop do runtime assíncrono.
+    """
+    
+    def __init__(self, prazo: float = BRAINSTORM_ESPECULATIVO_PRAZO):
+        """
+        Inicializa o gerenciador.
+        
+        Args:
+            prazo: Segundos esperando a confirmação antes de descartar a geração
+        """
+        self.prazo = prazo
+        self._especulacoes: Dict[int, _Especulacao] = {}
+    
+    def iniciar(self, ideia_id: int, ideia: str) -> None:
+        """
+        Começa a gerar o brainstorm de uma ideia em segundo plano.
+        
+        Args:
+            ideia_id: ID da ideia salva
+            ideia: Texto da ideia
+        """
+        self.descartar(ideia_id, "substituida")
+        
+        especulacao = _Especulacao(ideia)
+        
+        async def repassar(parcial: str) -> None:
+            especulacao.ultimo_parcial = parcial
+            for ouvinte in list(especulacao.ouvintes):
+                await ouvinte(parcial)
+        
+        # Em streaming, para que um "sim" no meio da geração já veja o texto parcial
+        especulacao.tarefa = asyncio.ensure_future(openai_service.gerar_brainstorm_async(ideia, ao_receber=repassar))
+        especulacao.expiracao = asyncio.get_event_loop().call_later(self.prazo, self.descartar, ideia_id, "expirada")
+        self._especulacoes[ideia_id] = especulacao
+        metricas.contar("especulacao.iniciadas")
+        logger.info(f"Brainstorm especulativo iniciado para a ideia {ideia_id}")
+    
+    async def aguardar(
+        self,
+        ideia_id: int,
+        ao_receber: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """
+        Obtém o brainstorm especulativo de uma ideia confirmada pelo usuário.
+        
+        Args:
+            ideia_id: ID da ideia
+            ao_receber: Callback opcional que recebe o texto parcial, se a geração ainda não terminou
+            
+        Returns:
+            Optional[str]: Brainstorm gerado, ou None se não houver especulação ou ela tiver falhado
+        """
+        especulacao = self._especulacoes.pop(ideia_id, None)
+        if especulacao is None:
+            return None
+        
+        especulacao.expiracao.cancel()
+        pronta = especulacao.tarefa.done()
+        if ao_receber is not None and not pronta:
+            especulacao.ouvintes.append(ao_receber)
+            if especulacao.ultimo_parcial is not None:
+                await ao_receber(especulacao.ultimo_parcial)
+        
+        brainstorm = await especulacao.tarefa
+        metricas.contar("especulacao.aproveitadas" if brainstorm else "especulacao.falhas")
+        logger.info(f"Brainstorm especulativo da ideia {ideia_id} usado ({'pronto' if pronta else 'em andamento'})")
+        return brainstorm
+    
+    def descartar(self, ideia_id: int, motivo: str = "recusada") -> None:
+        """
+        Cancela e descarta o brainstorm especulativo de uma ideia, se houver.
+        
+        Args:
+            ideia_id: ID da ideia
+            motivo: Motivo do descarte, usado na métrica (ex: "recusada", "expirada")
+        """
+        especulacao = self._especulacoes.pop(ideia_id, None)
+        if especulacao is None:
+            return
+        
+        especulacao.expiracao.cancel()
+        especulacao.tarefa.cancel()
+        
+        # Sem texto parcial a resposta veio do cache (ou nem começou): nenhum token foi gasto
+        desperdicados = 0
+        if especulacao.ultimo_parcial is not None:
+            if BRAINSTORM_SECIONADO:
+                # Uma completion por seção, cada uma com o prompt da seção e a ideia
+                entrada = (BRAINSTORM_SECAO_PROMPT + especulacao.ideia) * len(BRAINSTORM_SECOES)
+            else:
+                entrada = BRAINSTORM_PROMPT + especulacao.ideia
+            desperdicados = estimar_tokens(entrada) + estimar_tokens(especulacao.ultimo_parcial)
+        
+        metricas.contar(f"especulacao.{motivo}s")
+        metricas.contar("especulacao.tokens_desperdicados", desperdicados)
+        logger.info(f"Brainstorm especulativo da ideia {ideia_id} descartado ({motivo}, ~{desperdicados} tokens)")
+    
+    def estatisticas(self) -> Dict[str, float]:
+        """
+        Retorna a taxa de acerto e os tokens desperdiçados das especulações.
+        
+        Returns:
+            Dict[str, float]: Especulações iniciadas, taxa de aproveitamento e tokens desperdiçados
+        """
+        contadores = metricas.contadores()
+        iniciadas = contadores.get("especulacao.iniciadas", 0)
+        aproveitadas = contadores.get("especulacao.aproveitadas", 0)
+        return {
+            "iniciadas": iniciadas,
+            "taxa_acerto": aproveitadas / iniciadas if iniciadas else 0.0,
+            "tokens_desperdicados": contadores.get("especulacao.tokens_desperdicados", 0),
+        }
+
+
+# Instância global do brainstorm especulativo
+speculative_brainstorm = SpeculativeBrainstorm()
@@ -0,0 +1,423 @@
+"""
+Identificação do formato de áudio pelos bytes iniciais (sem subprocessos).
+"""
+import logging
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class InfoAudio:
+    """
+    Formato e parâmetros de um áudio lidos do cabeçalho do contêiner.
+    
+    Campos que o contêiner não informa (ex: duração de um WebM gravado ao vivo) ficam como None.
+    """
+    
+    def __init__(
+        self,
+        formato: str,
+        codec: Optional[str] = None,
+        canais: Optional[int] = None,
+        taxa_amostragem: Optional[int] = None,
+        duracao: Optional[float] = None,
+        bits: Optional[int] = None
+    ):
+        """
+        Inicializa as informações do áudio.
+        
+        Args:
+            formato: Contêiner, como extensão de arquivo (ex: "ogg", "wav", "mp3", "m4a", "flac", "webm")
+            codec: Codec do áudio (ex: "opus", "pcm", "aac")
+            canais: Quantidade de canais
+            taxa_amostragem: Taxa de amostragem em Hz
+            duracao: Duração em segundos
+            bits: Bits por amostra (apenas formatos sem compressão com perdas)
+        """
+        self.formato = formato
+        self.codec = codec
+        self.canais = canais
+        self.taxa_amostragem = taxa_amostragem
+        self.duracao = duracao
+        self.bits = bits
+    
+    def __repr__(self) -> str:
+        duracao = f"{self.duracao:.1f}s" if self.duracao is not None else "?"
+        return (
+            f"InfoAudio({self.formato}/{self.codec}, {self.canais} canal(is), "
+            f"{self.taxa_amostragem} Hz, {duracao})"
+        )
+
+def identificar_audio(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Identifica o formato de um áudio pelos números mágicos e lê os parâmetros do cabeçalho.
+    
+    Reconhece OGG (Opus/Vorbis), RIFF/WAV, MP3 (com ou sem ID3), MP4/M4A, FLAC e WebM.
+    
+    Args:
+        dados: Conteúdo do arquivo de áudio
+        
+    Returns:
+        Optional[InfoAudio]: Informações do áudio, ou None se o formato não for reconhecido
+    """
+    inicio = _pular_id3(dados)
+    
+    if dados.startswith(b"OggS"):
+        leitor = _ler_ogg
+    elif dados[:4] == b"RIFF" and dados[8:12] == b"WAVE":
+        leitor = _ler_wav
+    elif dados[4:8] == b"ftyp":
+        leitor = _ler_mp4
+    elif dados[inicio:inicio + 4] == b"fLaC":
+        leitor = _ler_flac
+    elif dados.startswith(b"\x1a\x45\xdf\xa3"):
+        leitor = _ler_webm
+    elif inicio or dados[:2] >= b"\xff\xe0":
+        # MP3 com tag ID3 ou começando direto em um quadro (11 bits de sincronismo)
+        leitor = _ler_mp3
+    else:
+        return None
+    
+    try:
+        info = leitor(dados)
+    except (struct.error, IndexError, ValueError) as e:
+        logger.warning(f"Cabeçalho de áudio inválido ({leitor.__name__}): {e}")
+        return None
+    
+    if info is not None:
+        logger.debug(f"Áudio identificado: {info}")
+    return info
+
+def _pular_id3(dados: bytes) -> int:
+    """
+    Retorna a posição logo após uma tag ID3v2 no início do arquivo (0 se não houver).
+    """
+    if len(dados) < 10 or not dados.startswith(b"ID3"):
+        return 0
+    # Tamanho "syncsafe": 7 bits por byte, mais o rodapé opcional
+    tamanho = (dados[6] << 21) | (dados[7] << 14) | (dados[8] << 7) | dados[9]
+    rodape = 10 if dados[5] & 0x10 else 0
+    return 10 + tamanho + rodape
+
+def _ler_ogg(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Lê o pacote de identificação da primeira página e a posição (granule) da última.
+    """
+    # Primeira página: versão 0, flag de início de stream e tabela de segmentos
+    if dados[4] != 0 or not dados[5] & 0x02:
+        return None
+    segmentos = dados[26]
+    inicio = 27 + segmentos
+    pacote = dados[inicio:inicio + sum(dados[27:inicio])]
+    
+    if pacote.startswith(b"OpusHead") and len(pacote) >= 19:
+        # O Opus sempre decodifica a 48 kHz; o cabeçalho guarda a taxa original da gravação
+        canais = pacote[9]
+        pre_skip, taxa_original = struct.unpack_from("<HI", pacote, 10)
+        granule = _ultimo_granule_ogg(dados)
+        duracao = max(granule - pre_skip, 0) / 48000 if granule is not None else None
+        return InfoAudio("ogg", "opus", canais, taxa_original or 48000, duracao)
+    
+    if pacote.startswith(b"\x01vorbis") and len(pacote) >= 16:
+        canais = pacote[11]
+        taxa = struct.unpack_from("<I", pacote, 12)[0]
+        granule = _ultimo_granule_ogg(dados)
+        duracao = granule / taxa if granule is not None and taxa else None
+        return InfoAudio("ogg", "vorbis", canais, taxa, duracao)
+    
+    return InfoAudio("ogg")
+
+def _ultimo_granule_ogg(dados: bytes) -> Optional[int]:
+    """
+    Procura, do fim para o início, a última página OGG com posição de granule válida.
+    """
+    posicao = len(dados)
+    while True:
+        posicao = dados.rfind(b"OggS", 0, posicao)
+        if posicao < 0:
+            return None
+        if posicao + 27 <= len(dados) and dados[posicao + 4] == 0:
+            granule = struct.unpack_from("<q", dados, posicao + 6)[0]
+            if granule >= 0:
+                return granule
+
+def _ler_wav(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Percorre os blocos RIFF lendo o "fmt " e o tamanho do bloco de dados.
+    """
+    formato = None
+    posicao = 12
+    while posicao + 8 <= len(dados):
+        bloco = dados[posicao:posicao + 4]
+        tamanho = struct.unpack_from("<I", dados, posicao + 4)[0]
+        if bloco == b"fmt ":
+            formato = struct.unpack_from("<HHIIHH", dados, posicao + 8)
+        elif bloco == b"data":
+            # Gerado em pipe, o tamanho pode ser provisório: limita ao que foi recebido
+            tamanho = min(tamanho, len(dados) - posicao - 8)
+            break
+        posicao += 8 + tamanho + (tamanho % 2)
+    else:
+        tamanho = 0
+    
+    if formato is None:
+        return InfoAudio("wav")
+    
+    tag, canais, taxa, bytes_por_segundo, _, bits = formato
+    # 1 = PCM inteiro; 0xFFFE = WAVE_FORMAT_EXTENSIBLE (o subformato vem depois, assumido PCM)
+    codec = "pcm" if tag in (1, 0xFFFE) else f"wav_{tag:#06x}"
+    duracao = tamanho / bytes_por_segundo if bytes_por_segundo else None
+    return InfoAudio("wav", codec, canais, taxa, duracao, bits)
+
+# Taxas de bits do MP3 (kbps) por (versão MPEG 1?, camada), indexadas pelos 4 bits do cabeçalho
+_MP3_BITRATES: Dict[Tuple[bool, int], Tuple[int, ...]] = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Taxas de amostragem do MPEG-1; o MPEG-2 usa a metade e o MPEG-2.5, um quarto
+_MP3_TAXAS = (44100, 48000, 32000)
+
+# Até onde procurar o primeiro quadro depois da tag ID3
+_MP3_BUSCA_QUADRO = 64 * 1024
+
+def _ler_mp3(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Lê o primeiro quadro MPEG de áudio e calcula a duração pelo cabeçalho Xing/Info ou VBRI
+    (VBR) ou pela taxa de bits (CBR).
+    """
+    inicio = _pular_id3(dados)
+    limite = min(len(dados) - 4, inicio + _MP3_BUSCA_QUADRO)
+    posicao = inicio
+    while posicao < limite:
+        cabecalho = _quadro_mp3(dados, posicao)
+        if cabecalho is not None:
+            break
+        posicao = dados.find(b"\xff", posicao + 1, limite)
+        if posicao < 0:
+            return None
+    else:
+        return None
+    
+    mpeg1, camada, kbps, taxa, canais = cabecalho
+    amostras_por_quadro = 384 if camada == 1 else 1152 if camada == 2 or mpeg1 else 576
+    
+    # Cabeçalho Xing/Info logo após as "side info" do primeiro quadro
+    deslocamento = posicao + 4 + ((32 if canais == 2 else 17) if mpeg1 else (17 if canais == 2 else 9))
+    quadros = None
+    if dados[deslocamento:deslocamento + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", dados, deslocamento + 4)[0]
+        if flags & 0x01:
+            quadros = struct.unpack_from(">I", dados, deslocamento + 8)[0]
+    elif dados[posicao + 36:posicao + 40] == b"VBRI":
+        quadros = struct.unpack_from(">I", dados, posicao + 50)[0]
+    
+    if quadros is not None:
+        duracao = quadros * amostras_por_quadro / taxa
+    else:
+        fim = len(dados) - (128 if dados[-128:-125] == b"TAG" else 0)
+        duracao = (fim - posicao) * 8 / (kbps * 1000)
+    
+    return InfoAudio("mp3", "mp3", canais, taxa, duracao)
+
+def _quadro_mp3(dados: bytes, posicao: int) -> Optional[Tuple[bool, int, int, int, int]]:
+    """
+    Interpreta o cabeçalho de quadro MPEG em uma posição.
+    
+    Returns:
+        Optional[Tuple[bool, int, int, int, int]]: MPEG-1?, camada, kbps, taxa de amostragem e canais
+    """
+    b0, b1, b2, b3 = dados[posicao:posicao + 4]
+    if b0 != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+    versao = (b1 >> 3) & 0x03  # 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1
+    camada = 4 - ((b1 >> 1) & 0x03)  # 1, 2 ou 3 (4 = reservado)
+    indice_bitrate = b2 >> 4
+    indice_taxa = (b2 >> 2) & 0x03
+    if versao == 1 or camada == 4 or indice_bitrate in (0, 15) or indice_taxa == 3:
+        return None
+    
+    mpeg1 = versao == 3
+    kbps = _MP3_BITRATES[(mpeg1, camada)][indice_bitrate]
+    taxa = _MP3_TAXAS[indice_taxa] >> {3: 0, 2: 1, 0: 2}[versao]
+    canais = 1 if b3 >> 6 == 3 else 2
+    return mpeg1, camada, kbps, taxa, canais
+
+# Átomos MP4 percorridos até a descrição das amostras
+_MP4_CONTEINERES = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+def _ler_mp4(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Percorre os átomos do MP4 lendo a duração do "mvhd" e o primeiro "stsd" de áudio.
+    """
+    marca = dados[8:12]
+    info = InfoAudio("m4a" if marca.startswith(b"M4A") else "mp4")
+    pendentes = [(0, len(dados))]
+    while pendentes:
+        posicao, fim = pendentes.pop()
+        while posicao + 8 <= fim:
+            tamanho, tipo = struct.unpack_from(">I4s", dados, posicao)
+            cabecalho = 8
+            if tamanho == 1:
+                tamanho = struct.unpack_from(">Q", dados, posicao + 8)[0]
+                cabecalho = 16
+            elif tamanho == 0:
+                tamanho = fim - posicao
+            if tamanho < cabecalho:
+                break
+            
+            conteudo = posicao + cabecalho
+            if tipo in _MP4_CONTEINERES:
+                pendentes.append((conteudo, min(posicao + tamanho, fim)))
+            elif tipo == b"mvhd":
+                if dados[conteudo] == 1:
+                    escala, duracao = struct.unpack_from(">IQ", dados, conteudo + 20)
+                else:
+                    escala, duracao = struct.unpack_from(">II", dados, conteudo + 12)
+                info.duracao = duracao / escala if escala else None
+            elif tipo == b"stsd" and info.codec is None:
+                # Entrada de amostra de áudio: tipo, 16 bytes reservados, canais, bits e taxa (16.16)
+                entrada = conteudo + 8
+                codec = dados[entrada + 4:entrada + 8]
+                canais, bits = struct.unpack_from(">HH", dados, entrada + 24)
+                taxa = struct.unpack_from(">I", dados, entrada + 32)[0] >> 16
+                if codec in (b"mp4a", b"alac", b"Opus", b"fLaC", b"ac-3", b"ec-3"):
+                    info.codec = "aac" if codec == b"mp4a" else codec.decode("latin-1").strip().lower()
+                    info.canais = canais
+                    info.taxa_amostragem = taxa
+            posicao += tamanho
+    return info
+
+def _ler_flac(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Lê o bloco STREAMINFO, que é sempre o primeiro bloco de metadados do FLAC.
+    """
+    inicio = _pular_id3(dados) + 4
+    if dados[inicio] & 0x7F != 0:
+        return InfoAudio("flac", "flac")
+    
+    # 20 bits de taxa, 3 de canais - 1, 5 de bits - 1 e 36 de total de amostras
+    campos = int.from_bytes(dados[inicio + 14:inicio + 22], "big")
+    taxa = campos >> 44
+    canais = ((campos >> 41) & 0x07) + 1
+    bits = ((campos >> 36) & 0x1F) + 1
+    amostras = campos & ((1 << 36) - 1)
+    duracao = amostras / taxa if amostras and taxa else None
+    return InfoAudio("flac", "flac", canais, taxa, duracao, bits)
+
+# Elementos EBML (Matroska/WebM) usados na leitura
+_EBML_DOCTYPE = 0x4282
+_EBML_SEGMENTO = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_ESCALA_TEMPO = 0x2AD7B1
+_EBML_DURACAO = 0x4489
+_EBML_FAIXAS = 0x1654AE6B
+_EBML_FAIXA = 0xAE
+_EBML_TIPO_FAIXA = 0x83
+_EBML_CODEC = 0x86
+_EBML_AUDIO = 0xE1
+_EBML_TAXA = 0xB5
+_EBML_CANAIS = 0x9F
+_EBML_CLUSTER = 0x1F43B675
+
+# Elementos cujo conteúdo é percorrido (os demais são pulados pelo tamanho)
+_EBML_CONTEINERES = {_EBML_SEGMENTO, _EBML_INFO, _EBML_FAIXAS, _EBML_FAIXA, _EBML_AUDIO}
+
+def _ler_webm(dados: bytes) -> Optional[InfoAudio]:
+    """
+    Percorre os elementos EBML até o primeiro cluster, lendo Info e a faixa de áudio.
+    """
+    posicao, id_elemento, tamanho = _elemento_ebml(dados, 0)
+    if tamanho is None:
+        raise ValueError("cabeçalho EBML com tamanho desconhecido")
+    cabecalho_fim = posicao + tamanho
+    
+    # Cabeçalho EBML: o DocType distingue WebM de outros Matroska
+    formato = "mka"
+    interno = posicao
+    while interno < cabecalho_fim:
+        interno, id_filho, tamanho_filho = _elemento_ebml(dados, interno)
+        if tamanho_filho is None:
+            raise ValueError(f"elemento EBML com tamanho desconhecido no cabeçalho (posição {interno})")
+        if id_filho == _EBML_DOCTYPE:
+            formato = "webm" if dados[interno:interno + tamanho_filho] == b"webm" else "mka"
+        interno += tamanho_filho
+    info = InfoAudio(formato)
+    
+    escala = 1_000_000
+    duracao = None
+    faixas: List[Dict[int, Any]] = []
+    posicao = cabecalho_fim
+    while posicao < len(dados):
+        posicao, id_elemento, tamanho = _elemento_ebml(dados, posicao)
+        if id_elemento == _EBML_CLUSTER:
+            break
+        if id_elemento in _EBML_CONTEINERES:
+            if id_elemento == _EBML_FAIXA:
+                faixas.append({})
+            continue
+        
+        if tamanho is None:
+            break
+        valor = dados[posicao:posicao + tamanho]
+        if id_elemento == _EBML_ESCALA_TEMPO:
+            escala = int.from_bytes(valor, "big")
+        elif id_elemento in (_EBML_DURACAO, _EBML_TAXA):
+            numero = struct.unpack(">f" if tamanho == 4 else ">d", valor)[0]
+            if id_elemento == _EBML_DURACAO:
+                duracao = numero
+            elif faixas:
+                faixas[-1][_EBML_TAXA] = int(numero)
+        elif id_elemento in (_EBML_TIPO_FAIXA, _EBML_CANAIS) and faixas:
+            faixas[-1][id_elemento] = int.from_bytes(valor, "big")
+        elif id_elemento == _EBML_CODEC and faixas:
+            faixas[-1][_EBML_CODEC] = valor.decode("latin-1").rstrip("\x00")
+        posicao += tamanho
+    
+    # Usa a primeira faixa de áudio (TrackType 2); a taxa padrão do Matroska é 8 kHz e 1 canal
+    for faixa in faixas:
+        if faixa.get(_EBML_TIPO_FAIXA) == 2:
+            codec = faixa.get(_EBML_CODEC, "")
+            info.codec = (codec[2:] if codec.startswith("A_") else codec).lower() or None
+            info.canais = faixa.get(_EBML_CANAIS, 1)
+            info.taxa_amostragem = faixa.get(_EBML_TAXA, 8000)
+            break
+    
+    if duracao is not None:
+        info.duracao = duracao * escala / 1e9
+    return info
+
+def _elemento_ebml(dados: bytes, posicao: int) -> Tuple[int, int, Optional[int]]:
+    """
+    Lê o ID e o tamanho de um elemento EBML.
+    
+    Returns:
+        Tuple[int, int, Optional[int]]: Posição do conteúdo, ID e tamanho (None se desconhecido)
+    """
+    id_elemento, posicao, _ = _vint(dados, posicao, manter_marcador=True)
+    tamanho, posicao, desconhecido = _vint(dados, posicao, manter_marcador=False)
+    return posicao, id_elemento, None if desconhecido else tamanho
+
+def _vint(dados: bytes, posicao: int, manter_marcador: bool) -> Tuple[int, int, bool]:
+    """
+    Lê um inteiro de tamanho variável do EBML.
+    
+    Returns:
+        Tuple[int, int, bool]: Valor, posição seguinte e se todos os bits de valor são 1 (tamanho desconhecido)
+    """
+    primeiro = dados[posicao]
+    comprimento = 1
+    while comprimento <= 8 and not primeiro & (0x80 >> (comprimento - 1)):
+        comprimento += 1
+    if comprimento > 8:
+        raise ValueError(f"inteiro EBML inválido na posição {posicao}")
+    
+    valor = int.from_bytes(dados[posicao:posicao + comprimento], "big")
+    bits_valor = 7 * comprimento
+    sem_marcador = valor & ((1 << bits_valor) - 1)
+    desconhecido = sem_marcador == (1 << bits_valor) - 1
+    return (valor if manter_marcador else sem_marcador), posicao + comprimento, desconhecido
@@ -1,100 +1,503 @@
 """
 Processador de áudio para transcrição.
 """
+import io
 import logging
-import os
+import struct
 import subprocess
-import tempfile
-from typing import Tuple, Optional
+import wave
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from src.config.settings import WHISPER_SAMPLE_RATE
+from src.config.settings import (
+    AUDIO_FORMATS, WHISPER_SAMPLE_RATE, FFMPEG_BINARIO, AUDIO_CONVERSAO_TIMEOUT, AUDIO_LIMITE_UPLOAD,
+    AUDIO_OPUS_BITRATE, AUDIO_SEGMENTACAO, AUDIO_SEGMENTACAO_LIMIAR, AUDIO_SEGMENTO_MIN, AUDIO_SEGMENTO_MAX,
+    AUDIO_SEGMENTO_SOBREPOSICAO, AUDIO_SILENCIO_MARGEM_DB, AUDIO_SILENCIO_MAX_DBFS, AUDIO_PREPROCESSAMENTO,
+    AUDIO_PREPROCESSAMENTO_MIN_REMOVIDO, AUDIO_PREPROCESSAMENTO_MIN_DURACAO, AUDIO_PREPROCESSAMENTO_MIN_BYTES,
+    AUDIO_VAD_MARGEM, AUDIO_PAUSA_MAX, AUDIO_PICO_DBFS, AUDIO_GANHO_MAX_DB
+)
+from src.transcription.audio_format import InfoAudio, identificar_audio
+from src.utils.metricas import metricas
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Duração de cada quadro analisado pela detecção de silêncio (segundos)
+QUADRO_VAD = 0.03
+
+# Quadros na média móvel da energia: pausas mais curtas que isso (~300 ms) não viram corte
+SUAVIZACAO_VAD = 10
+
 class AudioProcessor:
     """
     Processador de áudio para preparação antes da transcrição.
+    
+    Todo o processamento é feito em memória: o áudio entra como bytes no stdin do ffmpeg
+    e o resultado sai pelo stdout, sem arquivos temporários. O formato é identificado pelos
+    bytes do cabeçalho; notas de voz do Telegram (Opus em OGG) e outros formatos aceitos pela
+    API seguem sem conversão. Silêncios longos podem ser removidos antes do envio e áudios
+    longos são divididos nos silêncios em partes menores.
     """
     
+    def preparar_envios(self, dados: bytes) -> Optional[List[Tuple[bytes, str]]]:
+        """
+        Prepara os uploads de um áudio: um único envio, ou várias partes para áudios longos.
+        
+        Com o pré-processamento ativo, áudios com pelo menos AUDIO_PREPROCESSAMENTO_MIN_DURACAO
+        segundos (ou, sem a duração no cabeçalho, AUDIO_PREPROCESSAMENTO_MIN_BYTES) são
+        decodificados, os silêncios são removidos e o volume é normalizado; o resultado só
+        substitui o original se remover pelo menos AUDIO_PREPROCESSAMENTO_MIN_REMOVIDO segundos
+        (senão o original segue sem conversão). Notas curtas seguem direto, sem passar pelo ffmpeg.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            
+        Returns:
+            Optional[List[Tuple[bytes, str]]]: Conteúdo e extensão de cada envio, em ordem, ou None em caso de erro
+        """
+        if not dados:
+            logger.error("Áudio vazio")
+            return None
+        
+        info = identificar_audio(dados)
+        longo = info is not None and info.duracao is not None and info.duracao > AUDIO_SEGMENTACAO_LIMIAR
+        segmentar = AUDIO_SEGMENTACAO and (longo or len(dados) > AUDIO_LIMITE_UPLOAD)
+        preprocessar = AUDIO_PREPROCESSAMENTO and self._vale_preprocessar(dados, info)
+        amostras = self.decodificar_pcm(dados, info) if segmentar or preprocessar else None
+        
+        processado = False
+        if amostras is not None and preprocessar:
+            processadas = self.preprocessar(amostras)
+            removidos = (len(amostras) - len(processadas)) / WHISPER_SAMPLE_RATE
+            if removidos >= AUDIO_PREPROCESSAMENTO_MIN_REMOVIDO:
+                metricas.contar("audio.segundos_removidos", round(removidos))
+                logger.info(f"Pré-processamento removeu {removidos:.1f}s de {len(amostras) / WHISPER_SAMPLE_RATE:.1f}s de áudio")
+                amostras = processadas
+                processado = True
+        
+        if amostras is not None and (segmentar or processado):
+            partes = self.segmentar(amostras)
+            if len(partes) > 1:
+                return [(parte, "wav") for parte in partes]
+            if processado:
+                # O áudio processado vai em Opus; sem o ffmpeg, vai o próprio WAV
+                opus = self.converter_para_opus(partes[0])
+                if opus is not None and len(opus) <= AUDIO_LIMITE_UPLOAD:
+                    return [(opus, "ogg")]
+                if len(partes[0]) <= AUDIO_LIMITE_UPLOAD:
+                    return [(partes[0], "wav")]
+        
+        preparado = self.preparar_para_envio(dados, info)
+        return [preparado] if preparado is not None else None
+    
+    def preparar_para_envio(self, dados: bytes, info: Optional[InfoAudio] = None) -> Optional[Tuple[bytes, str]]:
+        """
+        Prepara o áudio para o upload, convertendo apenas quando necessário.
+        
+        Um formato aceito pela API dentro do limite de tamanho é enviado como veio (um WAV só
+        se já for PCM mono de 16 bits a 16 kHz); os demais, ou arquivos grandes demais, são
+        convertidos para Opus mono a 16 kHz.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            info: Informações do cabeçalho, se já identificadas
+            
+        Returns:
+            Optional[Tuple[bytes, str]]: Conteúdo a enviar e sua extensão (ex: "ogg"), ou None em caso de erro
+        """
+        if not dados:
+            logger.error("Áudio vazio")
+            return None
+        
+        if info is None:
+            info = identificar_audio(dados)
+        if info is not None and self._aceito_sem_conversao(info) and len(dados) <= AUDIO_LIMITE_UPLOAD:
+            metricas.contar("audio.envios_diretos")
+            logger.info(f"Áudio de {len(dados)} bytes enviado sem conversão: {info}")
+            return dados, info.formato
+        
+        convertido = self.converter_para_opus(dados)
+        if convertido is None:
+            return None
+        if len(convertido) > AUDIO_LIMITE_UPLOAD:
+            logger.error(f"Áudio convertido ainda excede o limite de upload: {len(convertido)} bytes")
+            return None
+        return convertido, "ogg"
+    
     @staticmethod
-    def converter_para_wav(audio_path: str) -> Tuple[bool, Optional[str]]:
+    def _vale_preprocessar(dados: bytes, info: Optional[InfoAudio]) -> bool:
         """
-        Converte o arquivo de áudio para WAV com parâmetros específicos para Whisper.
+        Verifica se o áudio é longo o bastante para compensar a decodificação do pré-processamento.
         
         Args:
-            audio_path: Caminho para o arquivo de áudio original
+            dados: Conteúdo do arquivo de áudio original
+            info: Informações lidas do cabeçalho do áudio, se reconhecido
             
         Returns:
-            Tuple[bool, Optional[str]]: Sucesso da conversão e caminho do arquivo WAV
+            bool: True se a duração (ou, sem ela, o tamanho) atingir o mínimo configurado
         """
-        temp_wav_path = None
-        try:
-            # Verifica se o arquivo de entrada existe
-            if not os.path.exists(audio_path):
-                logger.error(f"Arquivo de áudio não encontrado: {audio_path}")
-                return False, None
-                
-            # Verifica o tamanho do arquivo
-            if os.path.getsize(audio_path) == 0:
-                logger.error(f"Arquivo de áudio está vazio: {audio_path}")
-                return False, None
-                
-            logger.info(f"Arquivo de áudio existe e tem tamanho: {os.path.getsize(audio_path)} bytes")
-            
-            # Cria um arquivo temporário para o WAV
-            temp_wav_fd, temp_wav_path = tempfile.mkstemp(suffix='.wav')
-            os.close(temp_wav_fd)
-            
-            # Certifica-se de que pydub está instalado
-            try:
-                from pydub import AudioSegment
-            except ImportError:
-                logger.info("Instalando pydub...")
-                subprocess.run(["python3", "-m", "pip", "install", "pydub"], check=True)
-                from pydub import AudioSegment
-            
-            # Tenta determinar o formato do arquivo
-            result = subprocess.run(['file', audio_path], capture_output=True, text=True)
-            logger.info(f"Informações do arquivo: {result.stdout}")
-            
-            # Carrega o áudio com o formato apropriado
-            if 'ogg' in result.stdout.lower():
-                logger.info("Detectado formato OGG")
-                sound = AudioSegment.from_file(audio_path, format="ogg")
-            elif 'mp3' in result.stdout.lower():
-                logger.info("Detectado formato MP3")
-                sound = AudioSegment.from_file(audio_path, format="mp3")
-            elif 'wav' in result.stdout.lower():
-                logger.info("Detectado formato WAV")
-                sound = AudioSegment.from_file(audio_path, format="wav")
-            elif 'm4a' in result.stdout.lower() or 'mp4' in result.stdout.lower():
-                logger.info("Detectado formato M4A/MP4")
-                sound = AudioSegment.from_file(audio_path, format="mp4")
-            else:
-                # Tenta formato genérico
-                logger.info("Formato não reconhecido, tentando formato genérico")
-                sound = AudioSegment.from_file(audio_path)
-            
-            # Configura para mono e 16kHz (requisitos do Whisper)
-            logger.info("Configurando áudio para mono e 16kHz...")
-            sound = sound.set_channels(1)  # Mono
-            sound = sound.set_frame_rate(WHISPER_SAMPLE_RATE)  # 16kHz
-            
-            # Exporta para WAV
-            logger.info(f"Exportando para WAV: {temp_wav_path}")
-            sound.export(temp_wav_path, format="wav")
-            
-            # Verifica se o arquivo WAV foi criado corretamente
-            if os.path.exists(temp_wav_path) and os.path.getsize(temp_wav_path) > 0:
-                logger.info(f"Arquivo WAV criado com sucesso: {os.path.getsize(temp_wav_path)} bytes")
-                return True, temp_wav_path
+        if info is not None and info.duracao is not None:
+            return info.duracao >= AUDIO_PREPROCESSAMENTO_MIN_DURACAO
+        return len(dados) >= AUDIO_PREPROCESSAMENTO_MIN_BYTES
+    
+    @staticmethod
+    def _aceito_sem_conversao(info: InfoAudio) -> bool:
+        """
+        Verifica se o áudio pode ser enviado à API como está.
+        
+        Args:
+            info: Informações lidas do cabeçalho do áudio
+            
+        Returns:
+            bool: True se o contêiner e o codec forem aceitos pela API
+        """
+        if info.formato not in AUDIO_FORMATS:
+            return False
+        if info.formato == "wav":
+            # WAV só passa direto se já estiver no formato do Whisper; os demais ficam bem menores em Opus
+            return (
+                info.codec == "pcm" and info.canais == 1 and info.bits == 16
+                and info.taxa_amostragem == WHISPER_SAMPLE_RATE
+            )
+        if info.formato in ("ogg", "webm"):
+            return info.codec in ("opus", "vorbis")
+        return info.codec is not None
+    
+    def segmentar(self, amostras: "np.ndarray") -> List[bytes]:
+        """
+        Divide o áudio em partes WAV (mono, 16 kHz) cortadas nos silêncios.
+        
+        Args:
+            amostras: Amostras PCM mono a 16 kHz
+            
+        Returns:
+            List[bytes]: WAV de cada parte, em ordem (uma só, se o áudio for curto)
+        """
+        with metricas.medir("audio.segmentacao"):
+            cortes = self.pontos_de_corte(amostras)
+            partes = [gerar_wav(amostras[inicio:fim]) for inicio, fim in cortes]
+        
+        if len(partes) > 1:
+            metricas.contar("audio.segmentos", len(partes))
+            logger.info(
+                f"Áudio de {len(amostras) / WHISPER_SAMPLE_RATE:.0f}s dividido em {len(partes)} partes: "
+                + ", ".join(f"{(fim - inicio) / WHISPER_SAMPLE_RATE:.0f}s" for inicio, fim in cortes)
+            )
+        return partes
+    
+    def decodificar_pcm(self, dados: bytes, info: Optional[InfoAudio] = None) -> Optional["np.ndarray"]:
+        """
+        Decodifica o áudio para amostras PCM de 16 bits, mono, a 16 kHz.
+        Um WAV que já está nesse formato é lido diretamente, sem o ffmpeg.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            info: Informações do cabeçalho, se já identificadas
+            
+        Returns:
+            Optional[np.ndarray]: Amostras (int16), ou None em caso de erro
+        """
+        import numpy as np
+        
+        if info is None:
+            info = identificar_audio(dados)
+        bloco = localizar_dados_wav(dados) if info is not None and info.formato == "wav" else None
+        if bloco is not None and self._aceito_sem_conversao(info):
+            inicio, tamanho = bloco
+            return np.frombuffer(dados, dtype="<i2", count=tamanho // 2, offset=inicio)
+        
+        with metricas.medir("audio.decodificacao"):
+            pcm = self._converter(dados, ["-f", "s16le", "-c:a", "pcm_s16le"])
+        if pcm is None:
+            return None
+        return np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    
+    def preprocessar(self, amostras: "np.ndarray") -> "np.ndarray":
+        """
+        Remove os silêncios do início e do fim, encurta as pausas longas e normaliza o pico.
+        
+        Todas as etapas são operações vetorizadas do NumPy sobre os quadros de 30 ms (sem
+        laços por amostra em Python).
+        
+        Args:
+            amostras: Amostras PCM mono a 16 kHz
+            
+        Returns:
+            np.ndarray: Amostras processadas (int16)
+        """
+        import numpy as np
+        
+        with metricas.medir("audio.preprocessamento"):
+            tamanho_quadro = int(WHISPER_SAMPLE_RATE * QUADRO_VAD)
+            energia = self._energia_quadros(amostras)
+            if energia.size == 0:
+                return amostras
+            silencio = self._silencio(energia)
+            fala = np.flatnonzero(~silencio)
+            if fala.size == 0:
+                return amostras
+            
+            # Início e fim: mantém só a fala, com uma pequena margem
+            margem = int(AUDIO_VAD_MARGEM / QUADRO_VAD)
+            manter = np.zeros(energia.size, dtype=bool)
+            manter[max(fala[0] - margem, 0):fala[-1] + margem + 1] = True
+            
+            if AUDIO_PAUSA_MAX:
+                # Pausas internas: de cada sequência de quadros silenciosos, mantém só as pontas
+                metade = int(AUDIO_PAUSA_MAX / QUADRO_VAD) // 2
+                inicios = np.concatenate(([0], np.flatnonzero(np.diff(silencio.astype(np.int8))) + 1))
+                comprimentos = np.diff(np.concatenate((inicios, [energia.size])))
+                sequencia = np.repeat(np.arange(inicios.size), comprimentos)
+                posicao = np.arange(energia.size) - inicios[sequencia]
+                manter &= ~(silencio & (posicao >= metade) & (posicao < comprimentos[sequencia] - metade))
+            
+            # Expande a máscara dos quadros para as amostras (o resto final segue o último quadro)
+            mascara = np.repeat(manter, tamanho_quadro)
+            mascara = np.concatenate((mascara, np.full(len(amostras) - mascara.size, manter[-1])))
+            processadas = amostras[mascara].astype(np.float32)
+            
+            # Normalização de pico, com ganho limitado para não amplificar demais o ruído
+            pico = float(np.max(np.abs(processadas))) if processadas.size else 0.0
+            if pico > 0:
+                ganho = min(10 ** (AUDIO_PICO_DBFS / 20) * 32767 / pico, 10 ** (AUDIO_GANHO_MAX_DB / 20))
+                processadas *= ganho
+            return np.clip(np.round(processadas), -32768, 32767).astype(np.int16)
+    
+    def pontos_de_corte(self, amostras: "np.ndarray") -> List[Tuple[int, int]]:
+        """
+        Escolhe onde dividir o áudio, usando a energia dos quadros para achar silêncios.
+        
+        Cada parte tem entre AUDIO_SEGMENTO_MIN e AUDIO_SEGMENTO_MAX segundos e termina no
+        quadro mais silencioso desse intervalo. Sem silêncio no intervalo, a parte é cortada no
+        tamanho máximo e a seguinte começa AUDIO_SEGMENTO_SOBREPOSICAO segundos antes, para que
+        nenhuma palavra se perca no corte.
+        
+        Args:
+            amostras: Amostras PCM mono a 16 kHz
+            
+        Returns:
+            List[Tuple[int, int]]: Início e fim (em amostras) de cada parte
+        """
+        import numpy as np
+        
+        tamanho_quadro = int(WHISPER_SAMPLE_RATE * QUADRO_VAD)
+        total_quadros = len(amostras) // tamanho_quadro
+        minimo = int(AUDIO_SEGMENTO_MIN / QUADRO_VAD)
+        maximo = int(AUDIO_SEGMENTO_MAX / QUADRO_VAD)
+        if total_quadros <= maximo:
+            return [(0, len(amostras))]
+        
+        energia = self._energia_quadros(amostras)
+        silencio = self._silencio(energia)
+        sobreposicao = int(AUDIO_SEGMENTO_SOBREPOSICAO / QUADRO_VAD)
+        
+        cortes = []
+        inicio = 0
+        while total_quadros - inicio > maximo:
+            janela = slice(inicio + minimo, inicio + maximo)
+            candidatos = np.flatnonzero(silencio[janela])
+            if candidatos.size:
+                corte = janela.start + int(candidatos[np.argmin(energia[janela][candidatos])])
+                proximo = corte
             else:
-                logger.error("Arquivo WAV não foi criado corretamente")
-                return False, None
-                
-        except Exception as e:
-            logger.error(f"Erro na conversão para WAV: {e}")
-            return False, None
+                corte = janela.stop
+                proximo = corte - sobreposicao
+            cortes.append((inicio * tamanho_quadro, corte * tamanho_quadro))
+            inicio = proximo
+        cortes.append((inicio * tamanho_quadro, len(amostras)))
+        return cortes
+    
+    @staticmethod
+    def _energia_quadros(amostras: "np.ndarray") -> "np.ndarray":
+        """
+        Calcula a energia (dBFS) de cada quadro, suavizada para ignorar pausas curtas entre palavras.
+        
+        Args:
+            amostras: Amostras PCM mono a 16 kHz
+            
+        Returns:
+            np.ndarray: Energia de cada quadro completo de QUADRO_VAD segundos
+        """
+        import numpy as np
+        
+        tamanho_quadro = int(WHISPER_SAMPLE_RATE * QUADRO_VAD)
+        total_quadros = len(amostras) // tamanho_quadro
+        quadros = amostras[:total_quadros * tamanho_quadro].astype(np.float32).reshape(total_quadros, tamanho_quadro)
+        energia = 10 * np.log10(np.mean((quadros / 32768) ** 2, axis=1) + 1e-10)
+        if total_quadros == 0:
+            return energia
+        # Média móvel com as pontas repetidas (preencher com zeros faria as bordas parecerem fala)
+        antes = SUAVIZACAO_VAD // 2
+        estendida = np.pad(energia, (antes, SUAVIZACAO_VAD - 1 - antes), mode="edge")
+        return np.convolve(estendida, np.ones(SUAVIZACAO_VAD) / SUAVIZACAO_VAD, mode="valid")
+    
+    @staticmethod
+    def _silencio(energia: "np.ndarray") -> "np.ndarray":
+        """
+        Marca os quadros silenciosos: perto do ruído de fundo do próprio áudio (o limiar se adapta
+        ao volume da gravação) e abaixo de AUDIO_SILENCIO_MAX_DBFS.
+        
+        Args:
+            energia: Energia (dBFS) de cada quadro
+            
+        Returns:
+            np.ndarray: True para os quadros silenciosos
+        """
+        import numpy as np
+        
+        limiar = min(float(np.percentile(energia, 10)) + AUDIO_SILENCIO_MARGEM_DB, AUDIO_SILENCIO_MAX_DBFS)
+        return energia < limiar
+    
+    def converter_para_opus(self, dados: bytes) -> Optional[bytes]:
+        """
+        Converte o áudio para Opus em OGG, mono a 16 kHz (formato compacto aceito pela API).
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            
+        Returns:
+            Optional[bytes]: Conteúdo do OGG convertido, ou None em caso de erro
+        """
+        return self._converter(dados, ["-c:a", "libopus", "-b:a", AUDIO_OPUS_BITRATE, "-application", "voip", "-f", "ogg"])
+    
+    def converter_para_wav(self, dados: bytes) -> Optional[bytes]:
+        """
+        Converte o áudio para WAV com parâmetros específicos para Whisper (mono, 16 kHz).
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            
+        Returns:
+            Optional[bytes]: Conteúdo do WAV convertido, ou None em caso de erro
+        """
+        wav = self._converter(dados, ["-f", "wav"])
+        return corrigir_cabecalho_wav(wav) if wav is not None else None
+    
+    @staticmethod
+    def _converter(dados: bytes, saida: List[str]) -> Optional[bytes]:
+        """
+        Converte o áudio com o ffmpeg (stdin/stdout) para mono a 16 kHz.
+        O tempo de cada conversão é registrado na métrica "audio.conversao".
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio original
+            saida: Argumentos do ffmpeg que definem o codec e o formato de saída
+            
+        Returns:
+            Optional[bytes]: Conteúdo convertido, ou None em caso de erro
+        """
+        if not dados:
+            logger.error("Áudio vazio")
+            return None
+        
+        logger.info(f"Convertendo áudio de {len(dados)} bytes ({' '.join(saida)})...")
+        try:
+            with metricas.medir("audio.conversao"):
+                resultado = subprocess.run(
+                    [
+                        FFMPEG_BINARIO, "-hide_banner", "-loglevel", "error",
+                        "-i", "pipe:0",
+                        "-ac", "1", "-ar", str(WHISPER_SAMPLE_RATE),
+                        *saida, "pipe:1",
+                    ],
+                    input=dados,
+                    capture_output=True,
+                    timeout=AUDIO_CONVERSAO_TIMEOUT,
+                    check=False
+                )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"Erro na conversão do áudio: {e}")
+            return None
+        
+        if resultado.returncode != 0 or not resultado.stdout:
+            logger.error(f"Erro na conversão do áudio: {resultado.stderr.decode(errors='replace').strip()}")
+            return None
+        
+        metricas.contar("audio.conversoes")
+        logger.info(f"Áudio convertido: {len(resultado.stdout)} bytes")
+        return resultado.stdout
+
+def localizar_dados_wav(wav: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Localiza o bloco de amostras de um WAV.
+    
+    Args:
+        wav: Conteúdo do WAV
+        
+    Returns:
+        Optional[Tuple[int, int]]: Posição e tamanho do bloco "data", ou None se não houver
+    """
+    posicao = 12
+    while posicao + 8 <= len(wav):
+        bloco = wav[posicao:posicao + 4]
+        tamanho = struct.unpack_from("<I", wav, posicao + 4)[0]
+        if bloco == b"data":
+            return posicao + 8, min(tamanho, len(wav) - posicao - 8)
+        posicao += 8 + tamanho + (tamanho % 2)
+    return None
+
+def gerar_wav(amostras: "np.ndarray") -> bytes:
+    """
+    Gera um WAV (PCM de 16 bits, mono, 16 kHz) a partir das amostras.
+    
+    Args:
+        amostras: Amostras PCM (int16)
+        
+    Returns:
+        bytes: Conteúdo do WAV
+    """
+    saida = io.BytesIO()
+    with wave.open(saida, "wb") as arquivo:
+        arquivo.setnchannels(1)
+        arquivo.setsampwidth(2)
+        arquivo.setframerate(WHISPER_SAMPLE_RATE)
+        arquivo.writeframes(amostras.astype("<i2", copy=False).tobytes())
+    return saida.getvalue()
+
+def corrigir_cabecalho_wav(wav: bytes) -> bytes:
+    """
+    Preenche os tamanhos do cabeçalho RIFF de um WAV gerado em pipe.
+    
+    Sem poder voltar ao início da saída, o ffmpeg deixa os tamanhos do RIFF e do bloco
+    de dados com um valor provisório; aqui eles são preenchidos com os tamanhos reais.
+    
+    Args:
+        wav: Conteúdo do WAV
+        
+    Returns:
+        bytes: WAV com o cabeçalho corrigido (ou o original, se não for um RIFF/WAVE)
+    """
+    if len(wav) < 12 or wav[:4] != b"RIFF" or wav[8:12] != b"WAVE":
+        return wav
+    
+    corrigido = bytearray(wav)
+    struct.pack_into("<I", corrigido, 4, len(wav) - 8)
+    
+    # Percorre os blocos até o de dados (pode haver LIST/INFO antes dele)
+    posicao = 12
+    while posicao + 8 <= len(corrigido):
+        bloco = bytes(corrigido[posicao:posicao + 4])
+        tamanho = struct.unpack_from("<I", corrigido, posicao + 4)[0]
+        if bloco == b"data":
+            struct.pack_into("<I", corrigido, posicao + 4, len(corrigido) - posicao - 8)
+            break
+        posicao += 8 + tamanho + (tamanho % 2)
+    
+    return bytes(corrigido)
+
+def preparar_envios(dados: bytes) -> Optional[List[Tuple[bytes, str]]]:
+    """
+    Prepara os uploads de um áudio com o processador global.
+    Função de módulo para poder ser executada em um processo do pool de áudio.
+    
+    Args:
+        dados: Conteúdo do arquivo de áudio original
+        
+    Returns:
+        Optional[List[Tuple[bytes, str]]]: Conteúdo e extensão de cada envio, em ordem, ou None em caso de erro
+    """
+    return audio_processor.preparar_envios(dados)
 
 
 # Instância global do processador de áudio
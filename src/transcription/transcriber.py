@@ -1,23 +1,83 @@
 """
 Transcritor de áudio usando a API da OpenAI.
 """
+import asyncio
+import hashlib
 import logging
-import os
-import subprocess
-import tempfile
-from typing import Tuple, Optional
+import re
+from typing import List, Optional, Tuple
 
-import openai
-import requests
-
-from src.config.settings import OPENAI_API_KEY, OPENAI_WHISPER_MODEL
-from src.transcription.audio_processor import audio_processor
+from src.config.settings import (
+    OPENAI_API_KEY, OPENAI_WHISPER_MODEL, AUDIO_SEGMENTOS_PARALELOS, AUDIO_PROCESSOS,
+    TRANSCRICAO_CACHE_HABILITADO
+)
+from src.transcription.audio_format import identificar_audio
+from src.transcription.audio_processor import preparar_envios
+from src.transcription.transcription_cache import transcription_cache
+from src.utils.async_runtime import async_runtime
+from src.utils.http_pool import http_pool
+from src.utils.lazy import LazyInstance
+from src.utils.metricas import metricas
+from src.utils.process_pool import audio_pool, FilaCheia, PrazoEsgotado
+from src.utils.resiliencia import resiliencia, retry_after, CircuitoAberto, ErroHttp
+from src.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Endpoint de transcrição da OpenAI
+URL_TRANSCRICAO = "https://api.openai.com/v1/audio/transcriptions"
+
+# Mensagem exibida enquanto o circuito da API de transcrição está aberto
+MENSAGEM_INDISPONIVEL = "serviço de transcrição temporariamente indisponível. Tente novamente em alguns instantes."
+
+# Mensagens exibidas quando o pool de preparo do áudio recusa o áudio ou estoura o prazo
+MENSAGEM_OCUPADO = "muitos áudios sendo processados agora. Tente novamente em alguns instantes."
+MENSAGEM_DEMORADO = "o processamento do áudio demorou demais. Tente enviar um áudio mais curto."
+
+# Palavras comparadas entre o fim de uma parte e o começo da seguinte ao remover repetições;
+# uma única palavra igual não é removida (pode ser uma repetição real, como "Sim. Sim, claro")
+MIN_PALAVRAS_SOBREPOSTAS = 2
+MAX_PALAVRAS_SOBREPOSTAS = 10
+
+def juntar_transcricoes(textos: List[str]) -> str:
+    """
+    Junta as transcrições das partes de um áudio, em ordem, sem repetir o trecho sobreposto.
+    
+    Quando uma parte é cortada fora de um silêncio, a seguinte começa um pouco antes e as
+    mesmas palavras podem aparecer nas duas; a maior sequência que termina uma parte e
+    começa a seguinte (ignorando maiúsculas e pontuação) é mantida só uma vez.
+    
+    Args:
+        textos: Texto transcrito de cada parte
+        
+    Returns:
+        str: Transcrição completa
+    """
+    def normalizar(palavra: str) -> str:
+        return re.sub(r"\W", "", palavra.lower())
+    
+    palavras: List[str] = []
+    for texto in textos:
+        novas = texto.split()
+        anteriores = [normalizar(p) for p in palavras[-MAX_PALAVRAS_SOBREPOSTAS:]]
+        iniciais = [normalizar(p) for p in novas[:MAX_PALAVRAS_SOBREPOSTAS]]
+        repetidas = 0
+        for quantidade in range(min(len(anteriores), len(iniciais)), MIN_PALAVRAS_SOBREPOSTAS - 1, -1):
+            if anteriores[-quantidade:] == iniciais[:quantidade]:
+                repetidas = quantidade
+                break
+        palavras.extend(novas[repetidas:])
+    return " ".join(palavras)
+
 class AudioTranscriber:
     """
     Transcritor de áudio usando a API da OpenAI.
+    
+    O áudio é tratado apenas em memória e enviado em um único upload multipart: notas de voz
+    (Opus em OGG) seguem como vieram do Telegram; outros formatos passam pelo ffmpeg
+    (stdin/stdout). Áudios longos são divididos nos silêncios e as partes são transcritas em
+    paralelo, então a espera acompanha o tamanho de uma parte e não a duração total.
+    Os bytes enviados são somados na métrica "whisper.bytes_enviados".
     """
     
     def __init__(self):
@@ -26,6 +86,9 @@ class AudioTranscriber:
         """
         self.api_key = OPENAI_API_KEY
         self.model = OPENAI_WHISPER_MODEL
+        
+        # O mesmo áudio recebido ao mesmo tempo (ex: encaminhado por dois usuários) é transcrito uma vez
+        self._em_andamento = SingleFlight("whisper")
     
     def transcrever_audio(self, audio_path: str) -> Tuple[bool, str]:
         """
@@ -37,196 +100,346 @@ class AudioTranscriber:
         Returns:
             Tuple[bool, str]: Sucesso da transcrição e texto transcrito
         """
-        temp_wav_path = None
-        upload_path = None
+        try:
+            with open(audio_path, "rb") as audio_file:
+                dados = audio_file.read()
+        except OSError as e:
+            logger.error(f"Arquivo de áudio não encontrado: {audio_path} ({e})")
+            return False, "Arquivo de áudio não encontrado"
+        return self.transcrever_bytes(dados)
+    
+    async def transcrever_audio_async(self, audio_path: str) -> Tuple[bool, str]:
+        """
+        Transcreve um arquivo de áudio sem bloquear o event loop.
+        
+        Args:
+            audio_path: Caminho para o arquivo de áudio
+            
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito
+        """
+        def ler() -> bytes:
+            with open(audio_path, "rb") as audio_file:
+                return audio_file.read()
         
         try:
-            # Verifica se o arquivo existe
-            if not os.path.exists(audio_path):
-                logger.error(f"Arquivo de áudio não encontrado: {audio_path}")
-                return False, "Arquivo de áudio não encontrado"
+            dados = await async_runtime.em_thread(ler)
+        except OSError as e:
+            logger.error(f"Arquivo de áudio não encontrado: {audio_path} ({e})")
+            return False, "Arquivo de áudio não encontrado"
+        return await self.transcrever_bytes_async(dados)
+    
+    def transcrever_bytes(self, dados: bytes, id_arquivo: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Transcreve um áudio em memória (versão síncrona).
+        Um áudio já transcrito vem do cache; transcrições simultâneas de um áudio com o mesmo
+        conteúdo compartilham o resultado.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            id_arquivo: `file_unique_id` do áudio no Telegram, para indexar também a transcrição
             
-            # Converte o áudio para WAV
-            logger.info("Convertendo áudio para WAV...")
-            success, temp_wav_path = audio_processor.converter_para_wav(audio_path)
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito
+        """
+        em_cache = self._buscar_em_cache(dados, id_arquivo)
+        if em_cache is not None:
+            return True, em_cache
+        
+        resultado = self._em_andamento.executar_sincrono(self._chave(dados), lambda: self._transcrever(dados))
+        self._guardar_em_cache(dados, id_arquivo, resultado)
+        return resultado
+    
+    async def transcrever_bytes_async(self, dados: bytes, id_arquivo: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Transcreve um áudio em memória sem bloquear o event loop.
+        Um áudio já transcrito vem do cache; transcrições simultâneas de um áudio com o mesmo
+        conteúdo compartilham o resultado.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio (ex: baixado do Telegram)
+            id_arquivo: `file_unique_id` do áudio no Telegram, para indexar também a transcrição
+            
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito
+        """
+        # O cache lê e grava no SQLite (e calcula o hash do áudio): fica fora do event loop
+        em_cache = await async_runtime.em_thread(self._buscar_em_cache, dados, id_arquivo)
+        if em_cache is not None:
+            return True, em_cache
+        
+        resultado = await self._em_andamento.executar(self._chave(dados), lambda _: self._transcrever_async(dados))
+        await async_runtime.em_thread(self._guardar_em_cache, dados, id_arquivo, resultado)
+        return resultado
+    
+    @staticmethod
+    def _buscar_em_cache(dados: bytes, id_arquivo: Optional[str]) -> Optional[str]:
+        """
+        Busca a transcrição de um áudio pelo conteúdo e, se encontrada, indexa também o arquivo.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            id_arquivo: `file_unique_id` do áudio no Telegram
+            
+        Returns:
+            Optional[str]: Texto transcrito ou None se ausente
+        """
+        if not TRANSCRICAO_CACHE_HABILITADO:
+            return None
+        
+        em_cache = transcription_cache.buscar_por_conteudo(dados)
+        if em_cache is None:
+            return None
+        if id_arquivo:
+            # O mesmo áudio chegou como outro arquivo: o próximo envio dele nem precisa ser baixado
+            transcription_cache.salvar(em_cache["texto"], em_cache["duracao"], id_arquivo=id_arquivo)
+        return em_cache["texto"]
+    
+    @staticmethod
+    def _guardar_em_cache(dados: bytes, id_arquivo: Optional[str], resultado: Tuple[bool, str]) -> None:
+        """
+        Guarda uma transcrição bem-sucedida no cache, pelo conteúdo e pelo arquivo.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            id_arquivo: `file_unique_id` do áudio no Telegram
+            resultado: Resultado da transcrição
+        """
+        sucesso, texto = resultado
+        if not TRANSCRICAO_CACHE_HABILITADO or not sucesso:
+            return
+        
+        info = identificar_audio(dados)
+        transcription_cache.salvar(texto, info.duracao if info else None, id_arquivo=id_arquivo, dados=dados)
+    
+    @staticmethod
+    def _chave(dados: bytes) -> str:
+        """
+        Calcula a chave de agrupamento de um áudio (hash do conteúdo).
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
             
-            if not success or not temp_wav_path:
-                logger.error("Falha na conversão do áudio para WAV")
+        Returns:
+            str: Chave do áudio
+        """
+        return "transcricao:" + hashlib.sha256(dados).hexdigest()
+    
+    def _transcrever(self, dados: bytes) -> Tuple[bool, str]:
+        """
+        Converte e transcreve um áudio (versão síncrona, sem agrupamento).
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito
+        """
+        try:
+            if AUDIO_PROCESSOS > 0:
+                envios = audio_pool.executar_sincrono(preparar_envios, dados)
+            else:
+                envios = preparar_envios(dados)
+            if not envios:
+                logger.error("Falha na preparação do áudio")
                 return False, "Falha na conversão do áudio"
             
-            # Transcreve o áudio usando a API REST direta
+            if len(envios) > 1:
+                # As partes são enviadas em paralelo pelo runtime assíncrono
+                return self._resultado(juntar_transcricoes(async_runtime.executar(self._enviar_partes_async(envios))))
+            
             logger.info("Transcrevendo áudio usando API REST...")
+            return self._resultado(self._enviar(*envios[0]))
+        except CircuitoAberto as e:
+            logger.error(f"Erro na transcrição: {e}")
+            return False, MENSAGEM_INDISPONIVEL
+        except FilaCheia as e:
+            logger.warning(f"Preparo do áudio recusado: {e}")
+            return False, MENSAGEM_OCUPADO
+        except PrazoEsgotado as e:
+            logger.error(f"Preparo do áudio excedeu o prazo: {e}")
+            return False, MENSAGEM_DEMORADO
+        except Exception as e:
+            logger.error(f"Erro na transcrição: {e}")
+            return False, f"Erro na transcrição: {e}"
+    
+    async def _transcrever_async(self, dados: bytes) -> Tuple[bool, str]:
+        """
+        Converte e transcreve um áudio (versão assíncrona, sem agrupamento).
+        A preparação (e a conversão, se necessária) roda em uma thread do executor e o upload
+        usa aiohttp (um único método de upload; as retentativas ficam com a política de resiliência).
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito
+        """
+        try:
+            # Prepara o áudio fora do event loop (em um processo do pool, se habilitado)
+            if AUDIO_PROCESSOS > 0:
+                envios = await audio_pool.executar(preparar_envios, dados)
+            else:
+                envios = await async_runtime.em_thread(preparar_envios, dados)
+            if not envios:
+                logger.error("Falha na preparação do áudio")
+                return False, "Falha na conversão do áudio"
             
-            # Configura os cabeçalhos para a solicitação
-            headers = {
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            # Método 1: Usando arquivo diretamente
-            try:
-                logger.info("Método 1: Usando arquivo diretamente")
-                
-                with open(temp_wav_path, "rb") as audio_file:
-                    files = {
-                        "file": ("audio.wav", audio_file, "audio/wav")
-                    }
-                    
-                    data = {
-                        "model": self.model,
-                        "language": "pt",
-                        "response_format": "json",
-                        "temperature": 0.0
-                    }
-                    
-                    response = requests.post(
-                        "https://api.openai.com/v1/audio/transcriptions",
-                        headers=headers,
-                        files=files,
-                        data=data
-                    )
-                    
-                    logger.info(f"Código de status da resposta: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        transcription = result.get("text", "")
-                        logger.info(f"Texto transcrito: '{transcription}'")
-                        
-                        if transcription and transcription.strip():
-                            logger.info("Transcrição bem-sucedida com Método 1!")
-                            return True, transcription
-                    else:
-                        logger.warning(f"Método 1 falhou: {response.status_code} - {response.text}")
-            except Exception as e:
-                logger.warning(f"Erro no Método 1: {e}")
-            
-            # Método 2: Usando arquivo temporário
-            try:
-                logger.info("Método 2: Usando arquivo temporário")
-                
-                # Cria um arquivo temporário para o upload
-                upload_fd, upload_path = tempfile.mkstemp(suffix='.wav')
-                os.close(upload_fd)
-                
-                # Lê o arquivo de áudio
-                with open(temp_wav_path, "rb") as src_file:
-                    audio_data = src_file.read()
-                
-                # Escreve os dados no arquivo temporário
-                with open(upload_path, 'wb') as dst_file:
-                    dst_file.write(audio_data)
-                
-                logger.info(f"Arquivo temporário criado: {upload_path} ({os.path.getsize(upload_path)} bytes)")
-                
-                # Prepara o arquivo para upload
-                with open(upload_path, 'rb') as f:
-                    files = {
-                        "file": ("audio.wav", f, "audio/wav")
-                    }
-                    
-                    data = {
-                        "model": self.model,
-                        "language": "pt",
-                        "response_format": "json",
-                        "temperature": 0.0
-                    }
-                    
-                    response = requests.post(
-                        "https://api.openai.com/v1/audio/transcriptions",
-                        headers=headers,
-                        files=files,
-                        data=data
-                    )
-                    
-                    logger.info(f"Código de status da resposta: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        transcription = result.get("text", "")
-                        logger.info(f"Texto transcrito: '{transcription}'")
-                        
-                        if transcription and transcription.strip():
-                            logger.info("Transcrição bem-sucedida com Método 2!")
-                            return True, transcription
-                    else:
-                        logger.warning(f"Método 2 falhou: {response.status_code} - {response.text}")
-            except Exception as e:
-                logger.warning(f"Erro no Método 2: {e}")
-            
-            # Método 3: Usando requests_toolbelt
-            try:
-                logger.info("Método 3: Usando requests_toolbelt")
-                
-                try:
-                    from requests_toolbelt.multipart.encoder import MultipartEncoder
-                except ImportError:
-                    logger.info("Instalando requests_toolbelt...")
-                    subprocess.run(["python3", "-m", "pip", "install", "requests_toolbelt"], check=True)
-                    from requests_toolbelt.multipart.encoder import MultipartEncoder
-                
-                with open(temp_wav_path, "rb") as audio_file:
-                    audio_data = audio_file.read()
-                
-                # Cria um dicionário com os campos do formulário
-                fields = {
-                    'file': ('audio.wav', audio_data, 'audio/wav'),
-                    'model': self.model,
-                    'language': 'pt',
-                    'response_format': 'json',
-                    'temperature': '0.0'
-                }
-                
-                # Cria o codificador multipart
-                m = MultipartEncoder(fields=fields)
-                
-                # Atualiza os cabeçalhos com o tipo de conteúdo correto
-                headers['Content-Type'] = m.content_type
-                
-                # Faz a solicitação
-                response = requests.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers=headers,
-                    data=m
-                )
-                
-                logger.info(f"Código de status da resposta: {response.status_code}")
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    transcription = result.get("text", "")
-                    logger.info(f"Texto transcrito: '{transcription}'")
-                    
-                    if transcription and transcription.strip():
-                        logger.info("Transcrição bem-sucedida com Método 3!")
-                        return True, transcription
-                else:
-                    logger.warning(f"Método 3 falhou: {response.status_code} - {response.text}")
-            except Exception as e:
-                logger.warning(f"Erro no Método 3: {e}")
-            
-            # Se chegou até aqui, todos os métodos falharam
-            logger.error("Todos os métodos de transcrição falharam")
-            return False, "Não foi possível transcrever o áudio após várias tentativas"
+            if len(envios) > 1:
+                return self._resultado(juntar_transcricoes(await self._enviar_partes_async(envios)))
+            
+            logger.info("Transcrevendo áudio usando aiohttp...")
+            return self._resultado(await self._enviar_async(*envios[0]))
+        except CircuitoAberto as e:
+            logger.error(f"Erro na transcrição: {e}")
+            return False, MENSAGEM_INDISPONIVEL
+        except FilaCheia as e:
+            logger.warning(f"Preparo do áudio recusado: {e}")
+            return False, MENSAGEM_OCUPADO
+        except PrazoEsgotado as e:
+            logger.error(f"Preparo do áudio excedeu o prazo: {e}")
+            return False, MENSAGEM_DEMORADO
         except Exception as e:
             logger.error(f"Erro na transcrição: {e}")
             return False, f"Erro na transcrição: {e}"
+    
+    async def _enviar_partes_async(self, envios: List[Tuple[bytes, str]]) -> List[str]:
+        """
+        Transcreve as partes de um áudio em paralelo (até AUDIO_SEGMENTOS_PARALELOS por vez).
+        Se uma parte falhar, as demais são canceladas.
+        
+        Args:
+            envios: Conteúdo e extensão de cada parte, em ordem
+            
+        Returns:
+            List[str]: Texto de cada parte, na mesma ordem
+        """
+        logger.info(f"Transcrevendo {len(envios)} partes em paralelo usando aiohttp...")
+        limite = asyncio.Semaphore(AUDIO_SEGMENTOS_PARALELOS)
+        
+        async def enviar(conteudo: bytes, formato: str) -> str:
+            async with limite:
+                return await self._enviar_async(conteudo, formato)
+        
+        tarefas = [asyncio.ensure_future(enviar(*envio)) for envio in envios]
+        try:
+            with metricas.medir("whisper.partes"):
+                return await asyncio.gather(*tarefas)
+        except BaseException:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            raise
+    
+    async def _enviar_async(self, conteudo: bytes, formato: str) -> str:
+        """
+        Envia o áudio para a API de transcrição (upload assíncrono com aiohttp).
+        Erros temporários (429, 5xx, timeouts) são repetidos pela política de resiliência.
+        
+        Args:
+            conteudo: Conteúdo do áudio preparado
+            formato: Extensão do áudio (ex: "ogg")
+            
+        Returns:
+            str: Texto transcrito
+            
+        Raises:
+            CircuitoAberto: Se a API de transcrição estiver indisponível
+            ErroHttp: Se a API responder com erro após as tentativas
+        """
+        import aiohttp
+        
+        async def tentativa() -> str:
+            # O formulário é recriado a cada tentativa (um FormData só pode ser enviado uma vez);
+            # os bytes do áudio são referenciados, não copiados
+            form = aiohttp.FormData()
+            form.add_field("file", conteudo, filename=f"audio.{formato}", content_type=f"audio/{formato}")
+            form.add_field("model", self.model)
+            form.add_field("language", "pt")
+            form.add_field("response_format", "json")
+            form.add_field("temperature", "0.0")
+            
+            async with http_pool.aiohttp_sessao("whisper").post(
+                URL_TRANSCRICAO,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                data=form
+            ) as response:
+                logger.info(f"Código de status da resposta: {response.status}")
+                if response.status != 200:
+                    raise ErroHttp(response.status, await response.text(), retry_after(response))
+                result = await response.json()
+                return result.get("text", "")
+        
+        self._registrar_envio(conteudo, formato)
+        return await resiliencia.executar("whisper", tentativa)
+    
+    def _enviar(self, conteudo: bytes, formato: str) -> str:
+        """
+        Envia o áudio para a API de transcrição (upload síncrono com requests).
+        
+        Args:
+            conteudo: Conteúdo do áudio preparado
+            formato: Extensão do áudio (ex: "ogg")
+            
+        Returns:
+            str: Texto transcrito
+            
+        Raises:
+            CircuitoAberto: Se a API de transcrição estiver indisponível
+            ErroHttp: Se a API responder com erro após as tentativas
+        """
+        sessao = http_pool.requests_sessao("whisper")
+        timeout = http_pool.timeout("whisper")
+        
+        def tentativa() -> str:
+            response = sessao.post(
+                URL_TRANSCRICAO,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                files={"file": (f"audio.{formato}", conteudo, f"audio/{formato}")},
+                data={
+                    "model": self.model,
+                    "language": "pt",
+                    "response_format": "json",
+                    "temperature": 0.0
+                },
+                timeout=timeout
+            )
+            logger.info(f"Código de status da resposta: {response.status_code}")
+            if response.status_code != 200:
+                raise ErroHttp(response.status_code, response.text, retry_after(response))
+            return response.json().get("text", "")
+        
+        self._registrar_envio(conteudo, formato)
+        return resiliencia.executar_sincrono("whisper", tentativa)
+    
+    @staticmethod
+    def _registrar_envio(conteudo: bytes, formato: str) -> None:
+        """
+        Registra o tamanho do áudio enviado para a API de transcrição.
+        
+        Args:
+            conteudo: Conteúdo do áudio preparado
+            formato: Extensão do áudio
+        """
+        metricas.contar("whisper.envios")
+        metricas.contar("whisper.bytes_enviados", len(conteudo))
+        logger.info(f"Enviando {len(conteudo)} bytes de áudio ({formato}) para transcrição")
+    
+    @staticmethod
+    def _resultado(transcription: str) -> Tuple[bool, str]:
+        """
+        Converte o texto retornado pela API no resultado da transcrição.
+        
+        Args:
+            transcription: Texto transcrito
             
-        finally:
-            # Limpa os arquivos temporários
-            if temp_wav_path and os.path.exists(temp_wav_path):
-                try:
-                    os.remove(temp_wav_path)
-                    logger.info(f"Arquivo temporário removido: {temp_wav_path}")
-                except Exception as e:
-                    logger.error(f"Erro ao remover arquivo temporário: {e}")
-                    
-            if upload_path and os.path.exists(upload_path):
-                try:
-                    os.remove(upload_path)
-                    logger.info(f"Arquivo temporário de upload removido: {upload_path}")
-                except Exception as e:
-                    logger.error(f"Erro ao remover arquivo temporário de upload: {e}")
+        Returns:
+            Tuple[bool, str]: Sucesso da transcrição e texto transcrito (ou mensagem de erro)
+        """
+        logger.info(f"Texto transcrito: '{transcription}'")
+        if not transcription or not transcription.strip():
+            return False, "Nenhuma fala reconhecida no áudio"
+        return True, transcription
 
 
-# Instância global do transcritor de áudio
-audio_transcriber = AudioTranscriber()
+# Instância global do transcritor de áudio (construída no primeiro uso)
+audio_transcriber = LazyInstance(AudioTranscriber)
@@ -0,0 +1,127 @@
+"""
+Cache persistente de transcrições de áudio.
+"""
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from src.config.settings import (
+    OPENAI_WHISPER_MODEL, TRANSCRICAO_CACHE_DB_PATH, TRANSCRICAO_CACHE_TTL_SEGUNDOS,
+    TRANSCRICAO_CACHE_MEMORIA_MAX_ITENS, TRANSCRICAO_CACHE_DISCO_MAX_BYTES
+)
+from src.services.response_cache import ResponseCache, gerar_chave
+from src.utils.lazy import LazyInstance
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+class TranscriptionCache:
+    """
+    Guarda a transcrição (texto e duração) de cada áudio já transcrito.
+    
+    Cada transcrição é indexada pelo `file_unique_id` do Telegram, que identifica o mesmo
+    arquivo mesmo quando encaminhado ou reenviado (e permite pular o download), e pelo hash do
+    conteúdo, para o mesmo áudio chegar como arquivos diferentes. Usa um ResponseCache próprio,
+    com TTL e limite de tamanho em disco separados das respostas da OpenAI.
+    """
+    
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """
+        Inicializa o cache de transcrições.
+        
+        Args:
+            cache: Cache de armazenamento (por padrão, um ResponseCache no arquivo de transcrições)
+        """
+        self._cache = cache or ResponseCache(
+            TRANSCRICAO_CACHE_DB_PATH,
+            TRANSCRICAO_CACHE_TTL_SEGUNDOS,
+            TRANSCRICAO_CACHE_MEMORIA_MAX_ITENS,
+            TRANSCRICAO_CACHE_DISCO_MAX_BYTES
+        )
+    
+    def buscar_por_arquivo(self, id_arquivo: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca a transcrição de um arquivo do Telegram, antes de baixá-lo.
+        
+        Args:
+            id_arquivo: `file_unique_id` do áudio no Telegram
+            
+        Returns:
+            Optional[Dict[str, Any]]: Transcrição ("texto" e "duracao") ou None se ausente
+        """
+        return self._buscar("transcricao_arquivo", self._chave_arquivo(id_arquivo))
+    
+    def buscar_por_conteudo(self, dados: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Busca a transcrição de um áudio pelo hash do conteúdo.
+        
+        Args:
+            dados: Conteúdo do arquivo de áudio
+            
+        Returns:
+            Optional[Dict[str, Any]]: Transcrição ("texto" e "duracao") ou None se ausente
+        """
+        return self._buscar("transcricao_conteudo", self._chave_conteudo(dados))
+    
+    def salvar(
+        self,
+        texto: str,
+        duracao: Optional[float],
+        id_arquivo: Optional[str] = None,
+        dados: Optional[bytes] = None
+    ) -> None:
+        """
+        Armazena uma transcrição pelo arquivo do Telegram e/ou pelo conteúdo.
+        
+        Args:
+            texto: Texto transcrito
+            duracao: Duração do áudio em segundos (se conhecida)
+            id_arquivo: `file_unique_id` do áudio no Telegram
+            dados: Conteúdo do arquivo de áudio
+        """
+        valor = {"texto": texto, "duracao": duracao}
+        if id_arquivo:
+            self._cache.salvar("transcricao_arquivo", self._chave_arquivo(id_arquivo), valor)
+        if dados:
+            self._cache.salvar("transcricao_conteudo", self._chave_conteudo(dados), valor)
+    
+    def estatisticas(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna os contadores de acertos e faltas por tipo de chave.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Contadores de "transcricao_arquivo" e "transcricao_conteudo"
+        """
+        return self._cache.estatisticas()
+    
+    def _buscar(self, operacao: str, chave: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca uma transcrição e contabiliza os segundos de áudio que não precisarão ser transcritos.
+        """
+        transcricao = self._cache.buscar(operacao, chave)
+        if transcricao is None:
+            return None
+        
+        duracao = transcricao.get("duracao")
+        if duracao:
+            metricas.contar("transcricao.segundos_poupados", round(duracao))
+        logger.info(f"Transcrição encontrada no cache ({operacao}, {duracao or '?'}s de áudio)")
+        return transcricao
+    
+    @staticmethod
+    def _chave_arquivo(id_arquivo: str) -> str:
+        """
+        Chave de cache de um arquivo do Telegram.
+        """
+        return gerar_chave("transcricao", OPENAI_WHISPER_MODEL, "arquivo", id_arquivo)
+    
+    @staticmethod
+    def _chave_conteudo(dados: bytes) -> str:
+        """
+        Chave de cache do conteúdo de um áudio.
+        """
+        return gerar_chave("transcricao", OPENAI_WHISPER_MODEL, "conteudo", hashlib.sha256(dados).hexdigest())
+
+
+# Instância global do cache de transcrições (construída no primeiro uso)
+transcription_cache = LazyInstance(TranscriptionCache)
@@ -0,0 +1,144 @@
+"""
+Runtime assíncrono compartilhado do bot Cerebro.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from src.config.settings import ASYNC_MAX_THREADS
+
+logger = logging.getLogger(__name__)
+
+class AsyncRuntime:
+    """
+    Mantém um event loop asyncio rodando em uma thread dedicada.
+    
+    Os handlers síncronos do python-telegram-bot submetem corrotinas para este loop,
+    de forma que uma espera longa pela OpenAI custa uma corrotina e não uma thread.
+    """
+    
+    def __init__(self, max_threads: int = ASYNC_MAX_THREADS):
+        """
+        Inicializa o runtime. O event loop só é criado no primeiro uso.
+        
+        Args:
+            max_threads: Máximo de threads para chamadas bloqueantes (Telegram, banco, áudio)
+        """
+        self.max_threads = max_threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Retorna o event loop, iniciando-o se necessário.
+        """
+        if self._loop is None:
+            self._iniciar()
+        return self._loop
+    
+    def _iniciar(self) -> None:
+        """
+        Cria o event loop e a thread que o executa.
+        """
+        with self._lock:
+            if self._loop is not None:
+                return
+            
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(
+                ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="cerebro-bloqueante")
+            )
+            pronto = threading.Event()
+            
+            def executar_loop() -> None:
+                asyncio.set_event_loop(loop)
+                pronto.set()
+                loop.run_forever()
+            
+            self._thread = threading.Thread(target=executar_loop, name="cerebro-async", daemon=True)
+            self._thread.start()
+            pronto.wait()
+            self._loop = loop
+            
+            logger.info(f"Runtime assíncrono iniciado ({self.max_threads} threads para chamadas bloqueantes)")
+    
+    def submeter(self, coro: Awaitable[Any]) -> Future:
+        """
+        Agenda uma corrotina no loop sem aguardar o resultado.
+        O processamento das mensagens é limitado pelo chat_scheduler, não aqui.
+        
+        Args:
+            coro: Corrotina a ser executada
+            
+        Returns:
+            Future: Future concorrente com o resultado da corrotina
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._registrar_erro)
+        return future
+    
+    def executar(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Executa uma corrotina no loop e bloqueia até o resultado.
+        Usado para manter a API síncrona dos serviços.
+        
+        Args:
+            coro: Corrotina a ser executada
+            timeout: Tempo máximo de espera em segundos
+            
+        Returns:
+            Any: Resultado da corrotina
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("executar() não pode ser chamado de dentro do event loop; use await")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+    
+    async def em_thread(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Executa uma função bloqueante em uma thread do executor sem bloquear o loop.
+        
+        Args:
+            func: Função bloqueante
+            *args: Argumentos posicionais
+            **kwargs: Argumentos nomeados
+            
+        Returns:
+            Any: Resultado da função
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    
+    def parar(self) -> None:
+        """
+        Para o event loop e aguarda o fim da thread.
+        """
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._loop = None
+        self._thread = None
+        logger.info("Runtime assíncrono parado")
+    
+    @staticmethod
+    def _registrar_erro(future: Future) -> None:
+        """
+        Registra no log exceções de tarefas que ninguém está aguardando.
+        """
+        if future.cancelled():
+            return
+        erro = future.exception()
+        if erro:
+            logger.error(f"Erro em tarefa assíncrona: {erro}", exc_info=erro)
+
+
+# Instância global do runtime assíncrono
+async_runtime = AsyncRuntime()
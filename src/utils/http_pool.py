@@ -0,0 +1,212 @@
+"""
+Pools de conexões HTTP persistentes, um por serviço externo.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple, TYPE_CHECKING
+
+from src.config.settings import HTTP_POOLS, HTTP_KEEPALIVE_SEGUNDOS, HTTP2_HABILITADO
+
+if TYPE_CHECKING:
+    import aiohttp
+    import httpx
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# URLs usadas para abrir as conexões (TCP + TLS) antes da primeira requisição real.
+# A resposta não importa (pode ser 401); o que fica é a conexão aberta no pool.
+URLS_AQUECIMENTO = {
+    "openai": "https://api.openai.com/v1/models",
+    "whisper": "https://api.openai.com/v1/models",
+}
+
+class HttpPool:
+    """
+    Mantém sessões HTTP com keep-alive para cada serviço externo (OpenAI, Whisper,
+    Telegram e Supabase), para que nenhuma requisição pague um novo handshake TCP + TLS.
+    
+    Cada biblioteca usa o cliente HTTP que já suporta: aiohttp para a OpenAI (openai 0.28)
+    e o upload assíncrono do Whisper, requests para o upload síncrono, httpx para o
+    Supabase e o pool de conexões do próprio python-telegram-bot para o Telegram.
+    """
+    
+    def __init__(self, pools: Dict[str, Dict[str, float]] = HTTP_POOLS):
+        """
+        Inicializa o gerenciador (as sessões são criadas no primeiro uso).
+        
+        Args:
+            pools: Configuração por serviço (conexoes, timeout_conexao, timeout_leitura)
+        """
+        self.pools = pools
+        self._aiohttp: Dict[str, "aiohttp.ClientSession"] = {}
+        self._requests: Dict[str, "requests.Session"] = {}
+        self._httpx: Dict[str, "httpx.Client"] = {}
+        self._lock = threading.Lock()
+    
+    def timeout(self, nome: str) -> Tuple[float, float]:
+        """
+        Retorna os timeouts de conexão e de leitura de um serviço.
+        
+        Args:
+            nome: Nome do serviço (ex: "whisper")
+            
+        Returns:
+            Tuple[float, float]: Timeout de conexão e de leitura, em segundos
+        """
+        config = self.pools[nome]
+        return config["timeout_conexao"], config["timeout_leitura"]
+    
+    def aiohttp_sessao(self, nome: str) -> "aiohttp.ClientSession":
+        """
+        Retorna a sessão aiohttp do serviço. Deve ser chamada dentro do event loop do runtime.
+        
+        Args:
+            nome: Nome do serviço
+            
+        Returns:
+            aiohttp.ClientSession: Sessão compartilhada
+        """
+        sessao = self._aiohttp.get(nome)
+        if sessao is None or sessao.closed:
+            import aiohttp
+            
+            config = self.pools[nome]
+            conector = aiohttp.TCPConnector(
+                limit=int(config["conexoes"]),
+                keepalive_timeout=HTTP_KEEPALIVE_SEGUNDOS
+            )
+            sessao = aiohttp.ClientSession(
+                connector=conector,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=config["timeout_conexao"],
+                    sock_read=config["timeout_leitura"]
+                )
+            )
+            self._aiohttp[nome] = sessao
+            logger.info(f"Sessão HTTP '{nome}' criada (aiohttp, {int(config['conexoes'])} conexões)")
+        return sessao
+    
+    def requests_sessao(self, nome: str) -> "requests.Session":
+        """
+        Retorna a sessão requests do serviço (para código síncrono).
+        O requests não tem timeout por sessão: use timeout(nome) em cada chamada.
+        
+        Args:
+            nome: Nome do serviço
+            
+        Returns:
+            requests.Session: Sessão compartilhada
+        """
+        with self._lock:
+            sessao = self._requests.get(nome)
+            if sessao is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                conexoes = int(self.pools[nome]["conexoes"])
+                sessao = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=conexoes, pool_block=True)
+                sessao.mount("https://", adaptador)
+                sessao.mount("http://", adaptador)
+                self._requests[nome] = sessao
+                logger.info(f"Sessão HTTP '{nome}' criada (requests, {conexoes} conexões)")
+            return sessao
+    
+    def httpx_cliente(self, nome: str) -> "httpx.Client":
+        """
+        Retorna o cliente httpx do serviço, com HTTP/2 quando habilitado e disponível.
+        
+        Args:
+            nome: Nome do serviço
+            
+        Returns:
+            httpx.Client: Cliente compartilhado
+        """
+        with self._lock:
+            cliente = self._httpx.get(nome)
+            if cliente is None:
+                import httpx
+                
+                config = self.pools[nome]
+                http2 = HTTP2_HABILITADO
+                if http2:
+                    try:
+                        import h2  # noqa: F401
+                    except ImportError:
+                        logger.warning("Pacote h2 não instalado; usando HTTP/1.1 (pip install httpx[http2])")
+                        http2 = False
+                
+                cliente = httpx.Client(
+                    http2=http2,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=int(config["conexoes"]),
+                        max_keepalive_connections=int(config["conexoes"]),
+                        keepalive_expiry=HTTP_KEEPALIVE_SEGUNDOS
+                    ),
+                    timeout=httpx.Timeout(config["timeout_leitura"], connect=config["timeout_conexao"])
+                )
+                self._httpx[nome] = cliente
+                logger.info(f"Cliente HTTP '{nome}' criado (httpx, HTTP/2: {http2})")
+            return cliente
+    
+    def telegram_request_kwargs(self) -> Dict[str, Any]:
+        """
+        Retorna os argumentos de conexão para o Updater do python-telegram-bot.
+        
+        Returns:
+            Dict[str, Any]: Tamanho do pool e timeouts do Telegram
+        """
+        config = self.pools["telegram"]
+        return {
+            "con_pool_size": int(config["conexoes"]),
+            "connect_timeout": config["timeout_conexao"],
+            "read_timeout": config["timeout_leitura"],
+        }
+    
+    async def aquecer(self, *chamadas_sincronas: Callable[[], Any]) -> None:
+        """
+        Abre uma conexão com cada serviço para que a primeira mensagem não pague o handshake.
+        
+        Args:
+            *chamadas_sincronas: Chamadas bloqueantes extras que também abrem conexões
+                                 (ex: bot.get_me do Telegram), executadas em threads
+        """
+        from src.config.supabase_config import SUPABASE_URL
+        from src.utils.async_runtime import async_runtime
+        
+        async def aquecer_aiohttp(nome: str, url: str) -> None:
+            async with self.aiohttp_sessao(nome).head(url) as resposta:
+                logger.debug(f"Conexão '{nome}' aquecida ({resposta.status})")
+        
+        tarefas = [aquecer_aiohttp(nome, url) for nome, url in URLS_AQUECIMENTO.items()]
+        tarefas.append(async_runtime.em_thread(self.httpx_cliente("supabase").head, f"{SUPABASE_URL}/rest/v1/"))
+        tarefas.extend(async_runtime.em_thread(chamada) for chamada in chamadas_sincronas)
+        
+        resultados = await asyncio.gather(*tarefas, return_exceptions=True)
+        falhas = [r for r in resultados if isinstance(r, Exception)]
+        for falha in falhas:
+            logger.warning(f"Falha ao aquecer conexão: {falha}")
+        logger.info(f"Conexões HTTP aquecidas ({len(resultados) - len(falhas)}/{len(resultados)})")
+    
+    async def fechar(self) -> None:
+        """
+        Fecha todas as sessões abertas. Deve ser aguardada dentro do event loop do runtime.
+        """
+        for sessao in self._aiohttp.values():
+            await sessao.close()
+        self._aiohttp.clear()
+        
+        with self._lock:
+            for sessao in self._requests.values():
+                sessao.close()
+            for cliente in self._httpx.values():
+                cliente.close()
+            self._requests.clear()
+            self._httpx.clear()
+
+
+# Instância global dos pools HTTP
+http_pool = HttpPool()
@@ -0,0 +1,57 @@
+"""
+Instâncias globais com construção adiada.
+"""
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+class LazyInstance(Generic[T]):
+    """
+    Proxy para uma instância global que só é construída no primeiro acesso.
+    
+    Permite manter o padrão `from modulo import servico` sem pagar, na importação,
+    o custo de criar clientes (Supabase, OpenAI, Telegram) que o chamador pode nem usar.
+    """
+    
+    def __init__(self, fabrica: Callable[[], T]):
+        """
+        Inicializa o proxy.
+        
+        Args:
+            fabrica: Função sem argumentos que constrói a instância real
+        """
+        object.__setattr__(self, "_fabrica", fabrica)
+        object.__setattr__(self, "_instancia", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+    
+    def obter(self) -> T:
+        """
+        Retorna a instância real, construindo-a se necessário.
+        
+        Returns:
+            T: Instância construída pela fábrica
+        """
+        if self._instancia is None:
+            with self._lock:
+                if self._instancia is None:
+                    object.__setattr__(self, "_instancia", self._fabrica())
+        return self._instancia
+    
+    @property
+    def construida(self) -> bool:
+        """
+        Indica se a instância real já foi construída.
+        """
+        return self._instancia is not None
+    
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self.obter(), nome)
+    
+    def __setattr__(self, nome: str, valor: Any) -> None:
+        setattr(self.obter(), nome, valor)
+    
+    def __repr__(self) -> str:
+        if self._instancia is None:
+            return f"<LazyInstance ainda não construída: {self._fabrica!r}>"
+        return repr(self._instancia)
@@ -0,0 +1,177 @@
+"""
+Métricas de latência por operação, mantidas em memória.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from src.config.settings import METRICAS_JANELA
+
+logger = logging.getLogger(__name__)
+
+class Metricas:
+    """
+    Registra a duração das últimas execuções de cada operação e calcula percentis.
+    
+    Cada operação guarda apenas as amostras mais recentes (janela), então os percentis
+    refletem o comportamento atual e a memória usada é limitada. Também mantém contadores
+    simples de eventos (ex: retentativas).
+    """
+    
+    def __init__(self, janela: int = METRICAS_JANELA):
+        """
+        Inicializa o registro de métricas.
+        
+        Args:
+            janela: Quantidade de amostras mantidas por operação
+        """
+        self.janela = janela
+        self._amostras: Dict[str, Deque[float]] = {}
+        self._contadores: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def registrar(self, operacao: str, segundos: float) -> None:
+        """
+        Registra a duração de uma execução.
+        
+        Args:
+            operacao: Nome da operação (ex: "openai.classificacao")
+            segundos: Duração da execução
+        """
+        with self._lock:
+            amostras = self._amostras.get(operacao)
+            if amostras is None:
+                amostras = self._amostras[operacao] = deque(maxlen=self.janela)
+            amostras.append(segundos)
+        logger.debug(f"{operacao}: {segundos * 1000:.0f} ms")
+    
+    def contar(self, evento: str, quantidade: int = 1) -> None:
+        """
+        Incrementa o contador de um evento.
+        
+        Args:
+            evento: Nome do evento (ex: "openai.retentativas")
+            quantidade: Valor a somar
+        """
+        with self._lock:
+            self._contadores[evento] = self._contadores.get(evento, 0) + quantidade
+    
+    def contadores(self) -> Dict[str, int]:
+        """
+        Retorna os contadores de eventos.
+        
+        Returns:
+            Dict[str, int]: Valor de cada contador
+        """
+        with self._lock:
+            return dict(sorted(self._contadores.items()))
+    
+    @contextmanager
+    def medir(self, operacao: str) -> Iterator[None]:
+        """
+        Mede a duração do bloco e a registra, inclusive quando o bloco lança exceção.
+        Funciona também em código assíncrono (`with metricas.medir(...)` em volta de um await).
+        
+        Args:
+            operacao: Nome da operação
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(operacao, time.perf_counter() - inicio)
+    
+    def descartar(self, operacao: str) -> None:
+        """
+        Descarta as amostras de uma operação (ex: para reavaliá-la do zero).
+        
+        Args:
+            operacao: Nome da operação
+        """
+        with self._lock:
+            self._amostras.pop(operacao, None)
+    
+    def extrair(self) -> Dict[str, Any]:
+        """
+        Retorna e limpa as amostras e os contadores registrados até aqui.
+        Usado pelos processos do pool para repassar suas métricas ao processo principal.
+        
+        Returns:
+            Dict[str, Any]: Amostras por operação ("amostras") e contadores ("contadores")
+        """
+        with self._lock:
+            dados = {
+                "amostras": {operacao: list(amostras) for operacao, amostras in self._amostras.items()},
+                "contadores": dict(self._contadores),
+            }
+            self._amostras.clear()
+            self._contadores.clear()
+        return dados
+    
+    def incorporar(self, dados: Dict[str, Any]) -> None:
+        """
+        Soma às métricas locais as métricas extraídas em outro processo.
+        
+        Args:
+            dados: Resultado de `extrair()`
+        """
+        for operacao, amostras in dados.get("amostras", {}).items():
+            for segundos in amostras:
+                self.registrar(operacao, segundos)
+        for evento, quantidade in dados.get("contadores", {}).items():
+            self.contar(evento, quantidade)
+    
+    def percentil(self, operacao: str, percentual: float) -> Optional[float]:
+        """
+        Calcula um percentil da duração de uma operação.
+        
+        Args:
+            operacao: Nome da operação
+            percentual: Percentil desejado, entre 0 e 100
+            
+        Returns:
+            Optional[float]: Duração em segundos, ou None se não houver amostras
+        """
+        with self._lock:
+            amostras = sorted(self._amostras.get(operacao, ()))
+        return self._percentil_ordenado(amostras, percentual)
+    
+    def estatisticas(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna quantidade, média, p50 e p95 (em ms) de cada operação.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Estatísticas por operação
+        """
+        # Uma única cópia de todas as amostras: um descartar() simultâneo não afeta o cálculo
+        with self._lock:
+            copia = {operacao: list(amostras) for operacao, amostras in self._amostras.items()}
+        
+        resultado = {}
+        for operacao, amostras in sorted(copia.items()):
+            if not amostras:
+                continue
+            amostras.sort()
+            resultado[operacao] = {
+                "n": len(amostras),
+                "media_ms": sum(amostras) / len(amostras) * 1000,
+                "p50_ms": self._percentil_ordenado(amostras, 50) * 1000,
+                "p95_ms": self._percentil_ordenado(amostras, 95) * 1000,
+            }
+        return resultado
+    
+    @staticmethod
+    def _percentil_ordenado(amostras: List[float], percentual: float) -> Optional[float]:
+        """
+        Calcula um percentil de amostras já ordenadas (None se não houver amostras).
+        """
+        if not amostras:
+            return None
+        indice = min(len(amostras) - 1, int(round(percentual / 100 * (len(amostras) - 1))))
+        return amostras[indice]
+
+# Instância global das métricas
+metricas = Metricas()
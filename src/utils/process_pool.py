@@ -0,0 +1,320 @@
+"""
+Pool de processos para trabalho de CPU fora do processo principal.
+"""
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Any, Callable, List, Optional
+
+from src.config.settings import AUDIO_PROCESSOS, AUDIO_PROCESSOS_FILA, AUDIO_PROCESSO_TIMEOUT
+from src.utils.async_runtime import async_runtime
+from src.utils.lazy import LazyInstance
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (s) entre as verificações de prazo e cancelamento enquanto um trabalho espera ou roda
+INTERVALO_VERIFICACAO = 0.05
+
+class FilaCheia(Exception):
+    """
+    O pool já tem o máximo de trabalhos em execução e aguardando um processo livre.
+    """
+    
+    def __init__(self, nome: str, limite: int):
+        super().__init__(f"Pool '{nome}' cheio ({limite} trabalhos em andamento)")
+        self.nome = nome
+        self.limite = limite
+
+class PrazoEsgotado(Exception):
+    """
+    O trabalho não terminou (ou não conseguiu um processo livre) dentro do prazo do pool.
+    """
+    
+    def __init__(self, nome: str):
+        super().__init__(f"trabalho excedeu o prazo no pool '{nome}'")
+        self.nome = nome
+
+def _atender(conexao: Any) -> None:
+    """
+    Laço de um processo do pool: recebe (função, argumentos) e devolve o resultado junto com
+    as métricas registradas durante o trabalho. Termina quando a conexão é fechada.
+    """
+    # O Ctrl+C chega a todo o grupo de processos; quem encerra o pool é o processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            funcao, args = conexao.recv()
+        except EOFError:
+            return
+        try:
+            resposta = (True, funcao(*args))
+        except Exception as e:
+            # A exceção vai como texto: nem toda exceção pode ser serializada de volta
+            resposta = (False, f"{type(e).__name__}: {e}")
+        conexao.send(resposta + (metricas.extrair(),))
+
+class _Trabalhador:
+    """
+    Um processo do pool e a conexão com ele.
+    """
+    
+    def __init__(self, contexto: Any, nome: str):
+        self.conexao, remota = contexto.Pipe()
+        self.processo = contexto.Process(target=_atender, args=(remota,), name=nome, daemon=True)
+        self.processo.start()
+        remota.close()
+    
+    def encerrar(self) -> None:
+        """
+        Fecha a conexão e termina o processo (interrompendo o trabalho em andamento, se houver).
+        """
+        self.conexao.close()
+        if self.processo.is_alive():
+            self.processo.terminate()
+        self.processo.join(timeout=1)
+
+class ProcessPool:
+    """
+    Executa funções em processos separados, com fila limitada, prazo por trabalho e cancelamento.
+    
+    Argumentos e resultados atravessam o processo serializados (ex: bytes do áudio de entrada e
+    das partes prontas para envio), então a função precisa estar definida no nível de um módulo.
+    Diferente do ProcessPoolExecutor, um trabalho em execução pode ser interrompido: quando o
+    prazo estoura ou o chamador desiste, o processo é terminado e substituído no próximo uso.
+    """
+    
+    def __init__(
+        self,
+        nome: str,
+        processos: int = AUDIO_PROCESSOS,
+        fila_max: int = AUDIO_PROCESSOS_FILA,
+        timeout: float = AUDIO_PROCESSO_TIMEOUT
+    ):
+        """
+        Inicializa o pool. Os processos são criados sob demanda.
+        
+        Args:
+            nome: Nome do pool (usado nos processos, no log e nas métricas)
+            processos: Máximo de processos trabalhando ao mesmo tempo
+            fila_max: Trabalhos aguardando um processo livre antes de recusar novos
+            timeout: Prazo padrão (s) de cada trabalho, incluindo a espera na fila
+        """
+        self.nome = nome
+        self.processos = processos
+        self.fila_max = fila_max
+        self.timeout = timeout
+        self._contexto = multiprocessing.get_context("spawn")
+        self._vagas = threading.Semaphore(processos)
+        # Vagas dos chamadores assíncronos, criadas no event loop do primeiro uso
+        self._vagas_async: Optional[asyncio.Semaphore] = None
+        self._livres: List[_Trabalhador] = []
+        self._todos: List[_Trabalhador] = []
+        self._em_andamento = 0
+        self._encerrado = False
+        self._lock = threading.Lock()
+    
+    def executar_sincrono(
+        self,
+        funcao: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        cancelado: Optional[threading.Event] = None
+    ) -> Any:
+        """
+        Executa uma função em um processo do pool, bloqueando até o resultado.
+        
+        Args:
+            funcao: Função definida no nível de um módulo
+            *args: Argumentos (serializáveis) da função
+            timeout: Prazo do trabalho em segundos (padrão: o do pool)
+            cancelado: Evento que, quando ativado, interrompe o trabalho
+            
+        Returns:
+            Any: Resultado da função
+            
+        Raises:
+            FilaCheia: Se o pool já tiver o máximo de trabalhos em andamento
+            PrazoEsgotado: Se o prazo estourar
+            CancelledError: Se o evento de cancelamento for ativado
+            RuntimeError: Se a função lançar exceção ou o processo morrer
+        """
+        self._admitir()
+        try:
+            prazo = time.monotonic() + (timeout or self.timeout)
+            return self._executar_admitido(funcao, args, prazo, cancelado)
+        finally:
+            self._liberar()
+    
+    async def executar(self, funcao: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Executa uma função em um processo do pool sem bloquear o event loop.
+        
+        A espera por um processo livre acontece no event loop: só os trabalhos que já têm um
+        processo ocupam uma thread do async_runtime (no máximo `processos` threads por pool).
+        Se a tarefa for cancelada (ex: o usuário desistiu), o trabalho é interrompido.
+        
+        Args:
+            funcao: Função definida no nível de um módulo
+            *args: Argumentos (serializáveis) da função
+            timeout: Prazo do trabalho em segundos (padrão: o do pool)
+            
+        Returns:
+            Any: Resultado da função
+            
+        Raises:
+            FilaCheia: Se o pool já tiver o máximo de trabalhos em andamento
+            PrazoEsgotado: Se o prazo estourar
+            RuntimeError: Se a função lançar exceção ou o processo morrer
+        """
+        self._admitir()
+        try:
+            prazo = time.monotonic() + (timeout or self.timeout)
+            if self._vagas_async is None:
+                self._vagas_async = asyncio.Semaphore(self.processos)
+            
+            # Espera por um processo livre sem ocupar uma thread
+            try:
+                with metricas.medir(f"{self.nome}.fila"):
+                    await asyncio.wait_for(self._vagas_async.acquire(), max(prazo - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                metricas.contar(f"{self.nome}.timeouts")
+                raise PrazoEsgotado(self.nome)
+            
+            cancelado = threading.Event()
+            try:
+                return await async_runtime.em_thread(self._executar_admitido, funcao, args, prazo, cancelado)
+            except asyncio.CancelledError:
+                cancelado.set()
+                raise
+            finally:
+                self._vagas_async.release()
+        finally:
+            self._liberar()
+    
+    def encerrar(self) -> None:
+        """
+        Termina todos os processos do pool, interrompendo os trabalhos em andamento.
+        """
+        with self._lock:
+            self._encerrado = True
+            trabalhadores, self._todos, self._livres = self._todos, [], []
+        for trabalhador in trabalhadores:
+            trabalhador.encerrar()
+        if trabalhadores:
+            logger.info(f"Pool de processos '{self.nome}' encerrado ({len(trabalhadores)} processos)")
+    
+    def _admitir(self) -> None:
+        """
+        Reserva um lugar entre os trabalhos em andamento (em execução ou aguardando um processo).
+        """
+        limite = self.processos + self.fila_max
+        with self._lock:
+            if self._encerrado:
+                raise RuntimeError(f"Pool '{self.nome}' encerrado")
+            if self._em_andamento >= limite:
+                metricas.contar(f"{self.nome}.recusados")
+                raise FilaCheia(self.nome, limite)
+            self._em_andamento += 1
+    
+    def _liberar(self) -> None:
+        """
+        Libera o lugar reservado por _admitir().
+        """
+        with self._lock:
+            self._em_andamento -= 1
+    
+    def _executar_admitido(
+        self,
+        funcao: Callable[..., Any],
+        args: tuple,
+        prazo: float,
+        cancelado: Optional[threading.Event]
+    ) -> Any:
+        """
+        Espera por um processo livre e executa o trabalho nele (o lugar já foi reservado).
+        """
+        with metricas.medir(f"{self.nome}.fila"):
+            while not self._vagas.acquire(timeout=INTERVALO_VERIFICACAO):
+                self._verificar(prazo, cancelado)
+        try:
+            return self._executar_no_processo(funcao, args, prazo, cancelado)
+        finally:
+            self._vagas.release()
+    
+    def _executar_no_processo(
+        self,
+        funcao: Callable[..., Any],
+        args: tuple,
+        prazo: float,
+        cancelado: Optional[threading.Event]
+    ) -> Any:
+        """
+        Envia o trabalho a um processo livre e aguarda a resposta, verificando prazo e cancelamento.
+        Se o trabalho for interrompido, o processo é terminado e não volta para o pool.
+        """
+        trabalhador = self._obter_trabalhador()
+        try:
+            with metricas.medir(f"{self.nome}.execucao"):
+                trabalhador.conexao.send((funcao, args))
+                while not trabalhador.conexao.poll(INTERVALO_VERIFICACAO):
+                    if not trabalhador.processo.is_alive():
+                        raise RuntimeError(f"processo do pool '{self.nome}' terminou inesperadamente")
+                    self._verificar(prazo, cancelado)
+                sucesso, valor, metricas_processo = trabalhador.conexao.recv()
+        except BaseException:
+            self._descartar(trabalhador)
+            raise
+        
+        with self._lock:
+            if self._encerrado:
+                trabalhador.encerrar()
+            else:
+                self._livres.append(trabalhador)
+        
+        metricas.incorporar(metricas_processo)
+        if not sucesso:
+            raise RuntimeError(valor)
+        return valor
+    
+    def _obter_trabalhador(self) -> _Trabalhador:
+        """
+        Retorna um processo livre, criando um novo se necessário.
+        """
+        with self._lock:
+            if self._livres:
+                return self._livres.pop()
+        
+        trabalhador = _Trabalhador(self._contexto, f"{self.nome}-{len(self._todos) + 1}")
+        metricas.contar(f"{self.nome}.processos_criados")
+        with self._lock:
+            self._todos.append(trabalhador)
+        return trabalhador
+    
+    def _descartar(self, trabalhador: _Trabalhador) -> None:
+        """
+        Termina um processo interrompido no meio de um trabalho e o remove do pool.
+        """
+        with self._lock:
+            if trabalhador in self._todos:
+                self._todos.remove(trabalhador)
+        trabalhador.encerrar()
+    
+    def _verificar(self, prazo: float, cancelado: Optional[threading.Event]) -> None:
+        """
+        Interrompe a espera se o trabalho foi cancelado ou se o prazo estourou.
+        """
+        if cancelado is not None and cancelado.is_set():
+            metricas.contar(f"{self.nome}.cancelados")
+            raise CancelledError()
+        if time.monotonic() >= prazo:
+            metricas.contar(f"{self.nome}.timeouts")
+            raise PrazoEsgotado(self.nome)
+
+
+# Instância global do pool de preparo de áudio (construída no primeiro uso)
+audio_pool = LazyInstance(lambda: ProcessPool("audio"))
@@ -0,0 +1,348 @@
+"""
+Retentativas com backoff, prazo por requisição e circuit breakers por serviço externo.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.config.settings import RESILIENCIA_UPSTREAMS, RESILIENCIA_ESPERA_BASE, RESILIENCIA_ESPERA_MAXIMA
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status HTTP que indicam falha temporária do serviço (vale tentar de novo)
+STATUS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+
+# Nomes de exceções de rede/timeout das bibliotecas usadas (openai, aiohttp, requests, httpx).
+# A comparação é pelo nome da classe para não importar as bibliotecas aqui.
+EXCECOES_TRANSITORIAS = {
+    "APIConnectionError", "Timeout", "ServiceUnavailableError", "TryAgain", "RateLimitError",
+    "ClientConnectionError", "ServerDisconnectedError", "TransportError", "TimeoutException",
+    "ConnectionError", "ReadTimeout", "ConnectTimeout",
+}
+
+class CircuitoAberto(Exception):
+    """
+    Lançada quando o circuito de um serviço está aberto e a chamada é recusada sem ser feita.
+    """
+    
+    def __init__(self, upstream: str, segundos_restantes: float):
+        super().__init__(f"Serviço '{upstream}' indisponível; nova tentativa em {segundos_restantes:.0f}s")
+        self.upstream = upstream
+        self.segundos_restantes = segundos_restantes
+
+class ErroHttp(Exception):
+    """
+    Resposta HTTP de erro de um serviço chamado diretamente (sem biblioteca cliente).
+    """
+    
+    def __init__(self, status: int, mensagem: str = "", retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}: {mensagem}")
+        self.status = status
+        self.retry_after = retry_after
+
+def status_do_erro(erro: BaseException) -> Optional[int]:
+    """
+    Extrai o status HTTP de uma exceção, quando ela tiver um.
+    
+    Args:
+        erro: Exceção lançada pela chamada
+        
+    Returns:
+        Optional[int]: Status HTTP ou None
+    """
+    for atributo in ("http_status", "status", "status_code"):
+        valor = getattr(erro, atributo, None)
+        if isinstance(valor, int):
+            return valor
+    resposta = getattr(erro, "response", None)
+    valor = getattr(resposta, "status_code", None)
+    return valor if isinstance(valor, int) else None
+
+def eh_transitorio(erro: BaseException) -> bool:
+    """
+    Indica se vale tentar de novo após este erro (429, 5xx, timeout ou falha de conexão).
+    
+    Args:
+        erro: Exceção lançada pela chamada
+        
+    Returns:
+        bool: True se o erro for temporário
+    """
+    if isinstance(erro, CircuitoAberto):
+        return False
+    status = status_do_erro(erro)
+    if status is not None:
+        return status in STATUS_TRANSITORIOS
+    if isinstance(erro, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    return any(classe.__name__ in EXCECOES_TRANSITORIAS for classe in type(erro).__mro__)
+
+def retry_after(erro: BaseException) -> Optional[float]:
+    """
+    Lê o tempo de espera sugerido pelo serviço (cabeçalho Retry-After), se houver.
+    
+    Args:
+        erro: Exceção lançada pela chamada
+        
+    Returns:
+        Optional[float]: Segundos de espera ou None
+    """
+    if getattr(erro, "retry_after", None) is not None:
+        return float(erro.retry_after)
+    cabecalhos = getattr(erro, "headers", None) or getattr(getattr(erro, "response", None), "headers", None)
+    try:
+        return float(cabecalhos.get("retry-after")) if cabecalhos else None
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    """
+    Circuit breaker de um serviço: abre após falhas seguidas e recusa chamadas por um tempo.
+    
+    Passado esse tempo, o circuito fica meio aberto e deixa passar uma única chamada de teste;
+    se ela funcionar o circuito fecha, se falhar ele volta a abrir.
+    """
+    
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+    
+    def __init__(self, nome: str, limite_falhas: int, tempo_aberto: float):
+        """
+        Inicializa o circuito fechado.
+        
+        Args:
+            nome: Nome do serviço
+            limite_falhas: Falhas seguidas que abrem o circuito
+            tempo_aberto: Segundos que o circuito fica aberto antes da chamada de teste
+        """
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_ate = 0.0
+        self._testando = False
+        self._lock = threading.Lock()
+    
+    def antes_da_chamada(self) -> None:
+        """
+        Verifica se a chamada pode ser feita.
+        
+        Raises:
+            CircuitoAberto: Se o circuito estiver aberto (ou já houver uma chamada de teste)
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if self.estado == self.ABERTO and agora >= self._aberto_ate:
+                self.estado = self.MEIO_ABERTO
+                self._testando = False
+                logger.info(f"Circuito '{self.nome}' meio aberto: testando o serviço")
+            
+            if self.estado == self.ABERTO or (self.estado == self.MEIO_ABERTO and self._testando):
+                metricas.contar(f"{self.nome}.recusadas_circuito")
+                raise CircuitoAberto(self.nome, max(0.0, self._aberto_ate - agora))
+            
+            if self.estado == self.MEIO_ABERTO:
+                self._testando = True
+    
+    def registrar_sucesso(self) -> None:
+        """
+        Registra uma chamada bem-sucedida e fecha o circuito.
+        """
+        with self._lock:
+            if self.estado != self.FECHADO:
+                logger.info(f"Circuito '{self.nome}' fechado: serviço respondendo novamente")
+            self.estado = self.FECHADO
+            self._falhas = 0
+            self._testando = False
+    
+    def liberar_teste(self) -> None:
+        """
+        Libera a chamada de teste interrompida antes de terminar (ex: tarefa cancelada).
+        Sem resposta do serviço, o circuito continua meio aberto e a próxima chamada vira o teste.
+        """
+        with self._lock:
+            self._testando = False
+    
+    def registrar_falha(self) -> None:
+        """
+        Registra uma falha temporária e abre o circuito se necessário.
+        """
+        with self._lock:
+            self._falhas += 1
+            if self.estado == self.MEIO_ABERTO or self._falhas >= self.limite_falhas:
+                if self.estado != self.ABERTO:
+                    metricas.contar(f"{self.nome}.aberturas_circuito")
+                    logger.warning(f"Circuito '{self.nome}' aberto por {self.tempo_aberto:.0f}s após {self._falhas} falhas")
+                self.estado = self.ABERTO
+                self._aberto_ate = time.monotonic() + self.tempo_aberto
+                self._testando = False
+
+class Resiliencia:
+    """
+    Executa chamadas a serviços externos com retentativas, prazo total e circuit breaker.
+    
+    Apenas erros temporários (429, 5xx, timeouts e falhas de conexão) são repetidos e contam
+    para abrir o circuito. A espera entre tentativas é exponencial com jitter completo,
+    respeitando o Retry-After do serviço, e nunca ultrapassa o prazo da requisição.
+    """
+    
+    def __init__(self, upstreams: Dict[str, Dict[str, float]] = RESILIENCIA_UPSTREAMS):
+        """
+        Inicializa um circuito por serviço.
+        
+        Args:
+            upstreams: Configuração por serviço (tentativas, prazo, limite_falhas, tempo_aberto)
+        """
+        self.upstreams = upstreams
+        self._circuitos = {
+            nome: CircuitBreaker(nome, int(config["limite_falhas"]), config["tempo_aberto"])
+            for nome, config in upstreams.items()
+        }
+    
+    async def executar(
+        self,
+        upstream: str,
+        chamada: Callable[[], Awaitable[T]],
+        prazo: Optional[float] = None,
+        pode_repetir: Optional[Callable[[], bool]] = None
+    ) -> T:
+        """
+        Executa uma chamada assíncrona com a política de resiliência do serviço.
+        
+        Args:
+            upstream: Nome do serviço (ex: "openai")
+            chamada: Função sem argumentos que cria a corrotina de uma tentativa
+            prazo: Tempo total em segundos para todas as tentativas (padrão: o do serviço)
+            pode_repetir: Função opcional consultada antes de repetir (ex: False se parte
+                          de uma resposta em streaming já foi entregue ao usuário)
+                          
+        Returns:
+            T: Resultado da chamada
+            
+        Raises:
+            CircuitoAberto: Se o circuito do serviço estiver aberto
+            Exception: O último erro, se as tentativas ou o prazo se esgotarem
+        """
+        limite = time.monotonic() + (prazo or self.upstreams[upstream]["prazo"])
+        tentativa = 0
+        while True:
+            tentativa += 1
+            self._circuitos[upstream].antes_da_chamada()
+            restante = limite - time.monotonic()
+            try:
+                resultado = await asyncio.wait_for(chamada(), timeout=max(restante, 0.001))
+            except Exception as e:
+                espera = self._falhou(upstream, tentativa, e, limite, pode_repetir)
+                await asyncio.sleep(espera)
+                continue
+            except BaseException:
+                # Cancelada (ex: o usuário desistiu): não diz nada sobre o serviço
+                self._circuitos[upstream].liberar_teste()
+                raise
+            self._circuitos[upstream].registrar_sucesso()
+            return resultado
+    
+    def executar_sincrono(
+        self,
+        upstream: str,
+        chamada: Callable[[], T],
+        prazo: Optional[float] = None,
+        pode_repetir: Optional[Callable[[], bool]] = None
+    ) -> T:
+        """
+        Executa uma chamada bloqueante com a política de resiliência do serviço.
+        O prazo é verificado entre as tentativas; cada tentativa é limitada pelos timeouts do cliente HTTP.
+        
+        Args:
+            upstream: Nome do serviço (ex: "supabase")
+            chamada: Função sem argumentos que faz uma tentativa
+            prazo: Tempo total em segundos para todas as tentativas (padrão: o do serviço)
+            pode_repetir: Função opcional consultada antes de repetir (ex: False para uma
+                          inserção, que pode ter sido gravada mesmo sem a resposta chegar)
+            
+        Returns:
+            T: Resultado da chamada
+            
+        Raises:
+            CircuitoAberto: Se o circuito do serviço estiver aberto
+            Exception: O último erro, se as tentativas ou o prazo se esgotarem
+        """
+        limite = time.monotonic() + (prazo or self.upstreams[upstream]["prazo"])
+        tentativa = 0
+        while True:
+            tentativa += 1
+            self._circuitos[upstream].antes_da_chamada()
+            try:
+                resultado = chamada()
+            except Exception as e:
+                time.sleep(self._falhou(upstream, tentativa, e, limite, pode_repetir))
+                continue
+            except BaseException:
+                self._circuitos[upstream].liberar_teste()
+                raise
+            self._circuitos[upstream].registrar_sucesso()
+            return resultado
+    
+    def estado_circuitos(self) -> Dict[str, str]:
+        """
+        Retorna o estado do circuito de cada serviço.
+        
+        Returns:
+            Dict[str, str]: Estado ("fechado", "aberto" ou "meio_aberto") por serviço
+        """
+        return {nome: circuito.estado for nome, circuito in self._circuitos.items()}
+    
+    def _falhou(
+        self,
+        upstream: str,
+        tentativa: int,
+        erro: Exception,
+        limite: float,
+        pode_repetir: Optional[Callable[[], bool]]
+    ) -> float:
+        """
+        Trata a falha de uma tentativa: decide se repete e calcula a espera.
+        Relança o erro quando não há nova tentativa.
+        """
+        transitorio = eh_transitorio(erro)
+        if transitorio:
+            self._circuitos[upstream].registrar_falha()
+        else:
+            # O serviço respondeu (ex: 400, 401): está no ar, mesmo que a chamada tenha falhado
+            self._circuitos[upstream].registrar_sucesso()
+        
+        # Sem nova tentativa se o erro não é temporário, se ela seria recusada pelo circuito
+        # (que acabou de abrir) ou se as tentativas acabaram
+        if (
+            not transitorio
+            or self._circuitos[upstream].estado == CircuitBreaker.ABERTO
+            or tentativa >= self.upstreams[upstream]["tentativas"]
+            or (pode_repetir and not pode_repetir())
+        ):
+            metricas.contar(f"{upstream}.falhas")
+            raise erro
+        
+        # Backoff exponencial com jitter completo, respeitando o Retry-After
+        espera = random.uniform(0, min(RESILIENCIA_ESPERA_MAXIMA, RESILIENCIA_ESPERA_BASE * 2 ** tentativa))
+        espera = max(espera, retry_after(erro) or 0.0)
+        
+        if time.monotonic() + espera >= limite:
+            logger.warning(f"Prazo de '{upstream}' esgotado após {tentativa} tentativa(s): {erro}")
+            metricas.contar(f"{upstream}.prazo_esgotado")
+            raise erro
+        
+        metricas.contar(f"{upstream}.retentativas")
+        logger.warning(f"Falha temporária em '{upstream}' (tentativa {tentativa}): {erro}; nova tentativa em {espera:.1f}s")
+        return espera
+
+
+# Instância global da política de resiliência
+resiliencia = Resiliencia()
@@ -0,0 +1,170 @@
+"""
+Agrupamento de requisições idênticas simultâneas (single-flight).
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from src.utils.metricas import metricas
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Callback que recebe o texto parcial de uma resposta em streaming
+AoReceber = Callable[[str], Awaitable[None]]
+
+class _Voo:
+    """
+    Uma requisição em andamento e quem está esperando por ela.
+    """
+    
+    def __init__(self, tarefa: "asyncio.Future[Any]"):
+        self.tarefa = tarefa
+        self.ouvintes: List[AoReceber] = []
+        self.ultimo_parcial: Optional[str] = None
+        self.esperando = 0
+
+class _VooSincrono:
+    """
+    Uma requisição síncrona em andamento (as outras threads esperam o evento).
+    """
+    
+    def __init__(self):
+        self.concluido = threading.Event()
+        self.resultado: Any = None
+        self.erro: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Garante que requisições idênticas feitas ao mesmo tempo sejam executadas uma única vez.
+    
+    A primeira chamada com uma chave executa a requisição; as chamadas seguintes com a mesma
+    chave, enquanto ela não termina, aguardam o mesmo resultado (ou a mesma exceção).
+    A requisição só é cancelada quando todos que a aguardam são cancelados.
+    Nada é guardado depois da conclusão: reaproveitar resultados é papel do cache.
+    """
+    
+    def __init__(self, nome: str):
+        """
+        Inicializa o agrupador.
+        
+        Args:
+            nome: Nome usado nas métricas (ex: "openai" conta "openai.coalescidas")
+        """
+        self.nome = nome
+        self._voos: Dict[str, _Voo] = {}
+        self._voos_sincronos: Dict[str, _VooSincrono] = {}
+        self._lock = threading.Lock()
+    
+    async def executar(
+        self,
+        chave: str,
+        chamada: Callable[[Optional[AoReceber]], Awaitable[T]],
+        ao_receber: Optional[AoReceber] = None
+    ) -> T:
+        """
+        Executa a chamada ou aguarda a execução idêntica já em andamento.
+        Deve ser usada sempre no mesmo event loop (o do runtime assíncrono).
+        
+        Se a primeira chamada for em streaming, todos os que passarem ao_receber recebem os
+        parciais (quem chega depois recebe primeiro o último parcial). Quem chega a uma
+        execução sem streaming apenas aguarda o resultado final.
+        
+        Args:
+            chave: Identifica a requisição (operação + entrada normalizada)
+            chamada: Função que recebe o callback de parciais (ou None) e cria a corrotina
+            ao_receber: Callback opcional para os parciais da resposta
+            
+        Returns:
+            T: Resultado compartilhado da chamada
+        """
+        voo = self._voos.get(chave)
+        if voo is not None:
+            metricas.contar(f"{self.nome}.coalescidas")
+            logger.info(f"Requisição idêntica em andamento ({self.nome}); aguardando o mesmo resultado")
+            if ao_receber is not None:
+                voo.ouvintes.append(ao_receber)
+                if voo.ultimo_parcial is not None:
+                    await ao_receber(voo.ultimo_parcial)
+            return await self._aguardar(voo, ao_receber)
+        
+        async def transmitir(parcial: str) -> None:
+            voo.ultimo_parcial = parcial
+            for ouvinte in list(voo.ouvintes):
+                try:
+                    await ouvinte(parcial)
+                except Exception as e:
+                    logger.warning(f"Erro ao repassar resposta parcial: {e}")
+        
+        voo = _Voo(asyncio.ensure_future(chamada(transmitir if ao_receber is not None else None)))
+        if ao_receber is not None:
+            voo.ouvintes.append(ao_receber)
+        self._voos[chave] = voo
+        
+        def encerrar(tarefa: "asyncio.Future[Any]") -> None:
+            self._voos.pop(chave, None)
+            # Marca a exceção como lida caso todos que esperavam tenham sido cancelados
+            if not tarefa.cancelled():
+                tarefa.exception()
+        
+        voo.tarefa.add_done_callback(encerrar)
+        return await self._aguardar(voo, ao_receber)
+    
+    @staticmethod
+    async def _aguardar(voo: _Voo, ao_receber: Optional[AoReceber]) -> Any:
+        """
+        Aguarda o resultado de uma requisição em andamento.
+        
+        O shield faz com que cancelar quem espera não cancele a requisição dos demais;
+        quando o último que esperava é cancelado, a requisição é cancelada também.
+        """
+        voo.esperando += 1
+        try:
+            return await asyncio.shield(voo.tarefa)
+        except asyncio.CancelledError:
+            if ao_receber in voo.ouvintes:
+                voo.ouvintes.remove(ao_receber)
+            if voo.esperando == 1 and not voo.tarefa.done():
+                voo.tarefa.cancel()
+            raise
+        finally:
+            voo.esperando -= 1
+    
+    def executar_sincrono(self, chave: str, chamada: Callable[[], T]) -> T:
+        """
+        Versão bloqueante: executa a chamada ou espera, na thread atual, a execução idêntica
+        que outra thread já está fazendo.
+        
+        Args:
+            chave: Identifica a requisição
+            chamada: Função sem argumentos que faz a requisição
+            
+        Returns:
+            T: Resultado compartilhado da chamada
+        """
+        with self._lock:
+            voo = self._voos_sincronos.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._voos_sincronos[chave] = _VooSincrono()
+        
+        if not lider:
+            metricas.contar(f"{self.nome}.coalescidas")
+            logger.info(f"Requisição idêntica em andamento ({self.nome}); aguardando o mesmo resultado")
+            voo.concluido.wait()
+            if voo.erro is not None:
+                raise voo.erro
+            return voo.resultado
+        
+        try:
+            voo.resultado = chamada()
+            return voo.resultado
+        except BaseException as e:
+            voo.erro = e
+            raise
+        finally:
+            with self._lock:
+                self._voos_sincronos.pop(chave, None)
+            voo.concluido.set()
@@ -0,0 +1,12 @@
+"""
+Configuração comum dos testes.
+"""
+import os
+import sys
+
+# Adiciona o diretório raiz ao path para importações relativas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Chaves fictícias: as configurações são validadas na importação de alguns módulos
+os.environ.setdefault("TELEGRAM_API_KEY", "123456:teste")
+os.environ.setdefault("OPENAI_API_KEY", "sk-teste")
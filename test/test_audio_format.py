@@ -0,0 +1,99 @@
+"""
+Testes da identificação de formato e da leitura de cabeçalhos de áudio.
+"""
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from src.transcription.audio_format import identificar_audio
+from src.transcription.audio_processor import gerar_wav
+
+# Magic number do cabeçalho EBML (Matroska/WebM)
+EBML = b"\x1a\x45\xdf\xa3"
+
+def pagina_ogg(flags, granule, pacote=b""):
+    segmentos = bytes([len(pacote)]) if pacote else b""
+    return b"OggS" + struct.pack("<BBqIIIB", 0, flags, granule, 1, 0, 0, len(segmentos)) + segmentos + pacote
+
+def ogg_opus(segundos, pre_skip=312):
+    cabecalho = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, pre_skip, 16000, 0, 0)
+    return pagina_ogg(0x02, 0, cabecalho) + pagina_ogg(0x04, int(segundos * 48000) + pre_skip)
+
+def flac(taxa, canais, bits, amostras):
+    campos = (taxa << 44) | ((canais - 1) << 41) | ((bits - 1) << 36) | amostras
+    return b"fLaC" + b"\x00\x00\x00\x22" + bytes(10) + campos.to_bytes(8, "big") + bytes(16)
+
+def mp3_cbr(segundos):
+    # MPEG-1 camada 3, 128 kbps, 44,1 kHz, mono
+    quadro = b"\xff\xfb\x90\xc0"
+    return quadro + bytes(int(segundos * 128000 / 8) - len(quadro))
+
+def atomo(tipo, conteudo):
+    return struct.pack(">I4s", 8 + len(conteudo), tipo) + conteudo
+
+def m4a(segundos):
+    mvhd = atomo(b"mvhd", bytes(12) + struct.pack(">II", 1000, int(segundos * 1000)) + bytes(80))
+    return atomo(b"ftyp", b"M4A \x00\x00\x00\x00") + atomo(b"moov", mvhd)
+
+def elemento(id_elemento, conteudo):
+    return id_elemento + bytes([0x80 | len(conteudo)]) + conteudo
+
+def webm(segundos):
+    cabecalho = elemento(EBML, elemento(b"\x42\x82", b"webm"))
+    escala = elemento(b"\x2a\xd7\xb1", b"\x0f\x42\x40")
+    info = elemento(b"\x15\x49\xa9\x66", escala + elemento(b"\x44\x89", struct.pack(">f", segundos * 1000)))
+    audio = elemento(b"\xe1", elemento(b"\xb5", struct.pack(">d", 48000.0)) + elemento(b"\x9f", b"\x01"))
+    faixa = elemento(b"\xae", elemento(b"\x83", b"\x02") + elemento(b"\x86", b"A_OPUS") + audio)
+    # Segmento com tamanho desconhecido, como nas gravações ao vivo
+    return cabecalho + b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff" + info + elemento(b"\x16\x54\xae\x6b", faixa)
+
+AMOSTRAS = {
+    "ogg": (ogg_opus(2.0), ("ogg", "opus", 1, 16000, 2.0)),
+    "wav": (gerar_wav(np.zeros(16000, dtype=np.int16)), ("wav", "pcm", 1, 16000, 1.0)),
+    "flac": (flac(16000, 1, 16, 48000), ("flac", "flac", 1, 16000, 3.0)),
+    "mp3": (mp3_cbr(1.0), ("mp3", "mp3", 1, 44100, 1.0)),
+    "m4a": (m4a(5.0), ("m4a", None, None, None, 5.0)),
+    "webm": (webm(2.5), ("webm", "opus", 1, 48000, 2.5)),
+}
+
+@pytest.mark.parametrize("nome", AMOSTRAS)
+def test_le_os_parametros_do_cabecalho(nome):
+    dados, esperado = AMOSTRAS[nome]
+    info = identificar_audio(dados)
+    assert (info.formato, info.codec, info.canais, info.taxa_amostragem) == esperado[:4]
+    assert info.duracao == pytest.approx(esperado[4])
+
+def test_mp3_com_tag_id3():
+    tag = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+    assert identificar_audio(tag + mp3_cbr(1.0)).formato == "mp3"
+
+def test_formato_desconhecido():
+    assert identificar_audio(b"nada de audio aqui") is None
+    assert identificar_audio(b"") is None
+
+@pytest.mark.parametrize("nome", AMOSTRAS)
+def test_cabecalho_truncado_nao_lanca_excecao(nome):
+    dados = AMOSTRAS[nome][0]
+    for tamanho in range(len(dados) if len(dados) < 256 else 256):
+        identificar_audio(dados[:tamanho])
+
+@pytest.mark.parametrize("nome", AMOSTRAS)
+def test_cabecalho_corrompido_nao_lanca_excecao(nome):
+    gerador = random.Random(nome)
+    original = AMOSTRAS[nome][0][:512]
+    for _ in range(500):
+        dados = bytearray(original)
+        # Preserva o magic number para exercitar o leitor do formato, não só a identificação
+        for _ in range(gerador.randint(1, 8)):
+            dados[gerador.randrange(4, len(dados))] = gerador.randrange(256)
+        identificar_audio(bytes(dados[:gerador.randint(4, len(dados))]))
+
+def test_webm_com_cabecalho_de_tamanho_desconhecido():
+    # Tamanho de 8 bytes com todos os bits de valor em 1: "desconhecido" no EBML
+    assert identificar_audio(EBML + b"\x01\xff\xff\xff\xff\xff\xff\xff") is None
+
+def test_webm_com_elemento_de_tamanho_desconhecido_no_cabecalho():
+    # Cabeçalho de 5 bytes cujo DocType (0x4282) tem tamanho desconhecido (0xFF)
+    assert identificar_audio(EBML + b"\x85\x42\x82\xff\x00\x00") is None
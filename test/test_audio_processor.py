@@ -0,0 +1,31 @@
+"""
+Testes do preparo do áudio para o envio.
+"""
+import numpy as np
+
+from src.config.settings import WHISPER_SAMPLE_RATE
+from src.transcription.audio_processor import AudioProcessor, gerar_wav
+
+def nota(segundos):
+    """WAV mono a 16 kHz com fala simulada entre dois trechos de silêncio de 3 s."""
+    gerador = np.random.default_rng(0)
+    silencio = np.zeros(3 * WHISPER_SAMPLE_RATE, dtype=np.int16)
+    fala = gerador.normal(0, 3000, int((segundos - 6) * WHISPER_SAMPLE_RATE)).astype(np.int16)
+    return gerar_wav(np.concatenate([silencio, fala, silencio]))
+
+def test_nota_curta_segue_sem_decodificar(monkeypatch):
+    processador = AudioProcessor()
+    decodificados = []
+    monkeypatch.setattr(processador, "decodificar_pcm", lambda *args: decodificados.append(args))
+    
+    dados = nota(10)
+    assert processador.preparar_envios(dados) == [(dados, "wav")]
+    assert decodificados == []
+
+def test_nota_longa_tem_silencios_removidos():
+    dados = nota(40)
+    envios = AudioProcessor().preparar_envios(dados)
+    
+    assert len(envios) == 1
+    # Sem o ffmpeg, o áudio processado vai como WAV; com ele, em Opus
+    assert len(envios[0][0]) < len(dados)
@@ -0,0 +1,90 @@
+"""
+Testes do agendador de updates por chat.
+"""
+import asyncio
+import threading
+
+from src.bot.chat_scheduler import ACEITO, FILA_CHAT_CHEIA, FILA_GLOBAL_CHEIA, ChatScheduler
+from src.utils.async_runtime import async_runtime
+
+class Registro:
+    """Registra a ordem e a concorrência dos trabalhos executados pelo agendador."""
+    
+    def __init__(self, total):
+        self.ordem = []
+        self.rodando = {}
+        self.max_por_chat = 0
+        self.max_global = 0
+        self.restantes = total
+        self.concluido = threading.Event()
+    
+    def trabalho(self, chat_id, nome, espera=0.01):
+        async def executar():
+            self.rodando[chat_id] = self.rodando.get(chat_id, 0) + 1
+            self.max_por_chat = max(self.max_por_chat, self.rodando[chat_id])
+            self.max_global = max(self.max_global, sum(self.rodando.values()))
+            self.ordem.append((chat_id, nome))
+            await asyncio.sleep(espera)
+            self.rodando[chat_id] -= 1
+            self.restantes -= 1
+            if not self.restantes:
+                self.concluido.set()
+        return executar
+
+def test_trabalhos_do_mesmo_chat_rodam_em_ordem_um_por_vez():
+    agendador = ChatScheduler(max_workers=4, max_fila_por_chat=10, max_fila_global=100)
+    registro = Registro(total=6)
+    # Os primeiros demoram mais: se rodassem em paralelo, terminariam fora de ordem
+    for i in range(6):
+        assert agendador.enfileirar(1, registro.trabalho(1, i, espera=0.03 - i * 0.005)) == ACEITO
+    
+    assert registro.concluido.wait(5)
+    assert [nome for _, nome in registro.ordem] == list(range(6))
+    assert registro.max_por_chat == 1
+
+def test_chats_diferentes_rodam_em_paralelo_ate_o_limite_de_workers():
+    agendador = ChatScheduler(max_workers=2, max_fila_por_chat=10, max_fila_global=100)
+    registro = Registro(total=8)
+    for chat_id in range(4):
+        for i in range(2):
+            agendador.enfileirar(chat_id, registro.trabalho(chat_id, i, espera=0.05))
+    
+    assert registro.concluido.wait(5)
+    assert registro.max_global == 2
+    for chat_id in range(4):
+        assert [nome for chat, nome in registro.ordem if chat == chat_id] == [0, 1]
+
+def test_filas_cheias_recusam_trabalhos():
+    agendador = ChatScheduler(max_workers=4, max_fila_por_chat=2, max_fila_global=4)
+    iniciado = threading.Event()
+    liberar = async_runtime.executar(criar_evento())
+    
+    async def bloqueado():
+        iniciado.set()
+        await liberar.wait()
+    
+    async def rapido():
+        pass
+    
+    # O primeiro trabalho sai da fila e fica rodando; os dois seguintes ocupam a fila do chat
+    assert agendador.enfileirar(1, bloqueado) == ACEITO
+    assert iniciado.wait(5)
+    assert agendador.enfileirar(1, rapido) == ACEITO
+    assert agendador.enfileirar(1, rapido) == ACEITO
+    assert agendador.enfileirar(1, rapido) == FILA_CHAT_CHEIA
+    
+    # Os trabalhos em execução também contam no limite global
+    assert agendador.enfileirar(2, bloqueado) == ACEITO
+    assert agendador.enfileirar(3, rapido) == FILA_GLOBAL_CHEIA
+    assert agendador.estatisticas()["pendentes"] == 4
+    
+    async_runtime.loop.call_soon_threadsafe(liberar.set)
+    for _ in range(100):
+        if agendador.estatisticas() == {"pendentes": 0, "chats_ativos": 0, "maior_fila": 0}:
+            break
+        threading.Event().wait(0.05)
+    assert agendador.estatisticas() == {"pendentes": 0, "chats_ativos": 0, "maior_fila": 0}
+
+async def criar_evento():
+    """Cria um asyncio.Event no event loop do runtime."""
+    return asyncio.Event()
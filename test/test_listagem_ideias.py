@@ -0,0 +1,127 @@
+"""
+Testes da listagem paginada de ideias (/listar).
+"""
+import sys
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.bot import command_handlers
+from src.database.schema_migrator import SchemaMigrator
+from src.database.supabase_service import SupabaseService
+
+# O pacote src.database exporta a instância com o mesmo nome do módulo
+modulo_repositorio = sys.modules["src.database.idea_repository"]
+
+POR_PAGINA = 3
+
+@pytest.fixture
+def repositorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(modulo_repositorio, "USE_SUPABASE", False)
+    repositorio = modulo_repositorio.IdeaRepository(str(tmp_path / "cerebro.db"))
+    SchemaMigrator(repositorio.conexoes).aplicar()
+    yield repositorio
+    repositorio.conexoes.fechar()
+
+@pytest.fixture
+def ideias(repositorio):
+    """Sete ideias do chat 1 intercaladas com ideias do chat 2; retorna os IDs do chat 1."""
+    ids = []
+    for i in range(7):
+        ids.append(repositorio.salvar_ideia(f"ideia {i} " + "x" * 100, 1, resumo=f"resumo {i}"))
+        repositorio.salvar_ideia(f"outra {i}", 2, resumo=f"outro {i}")
+    return ids
+
+def test_pagina_do_chat_por_keyset(repositorio, ideias):
+    primeira = repositorio.listar_pagina_ideias(1, limite=POR_PAGINA)
+    assert [ideia["id"] for ideia in primeira] == ideias[::-1][:3]
+    assert all(ideia["chat_id"] == 1 for ideia in primeira)
+    
+    seguinte = repositorio.listar_pagina_ideias(1, antes_de=primeira[-1]["id"], limite=POR_PAGINA)
+    assert [ideia["id"] for ideia in seguinte] == ideias[::-1][3:6]
+    
+    # A página anterior volta em ordem decrescente, logo acima do cursor
+    anterior = repositorio.listar_pagina_ideias(1, depois_de=seguinte[0]["id"], limite=POR_PAGINA)
+    assert anterior == primeira
+
+def test_conteudo_vem_cortado_do_banco(repositorio, ideias):
+    ideia = repositorio.listar_pagina_ideias(1, limite=1)[0]
+    assert len(ideia["conteudo_inicio"]) == modulo_repositorio.LISTAR_DESCRICAO_MAX + 1
+    assert set(ideia) == {"id", "chat_id", "resumo", "conteudo_inicio"}
+
+def test_superusuario_lista_todos_os_chats(repositorio, ideias):
+    pagina = repositorio.listar_pagina_ideias(1, is_superuser=True, limite=4)
+    assert {ideia["chat_id"] for ideia in pagina} == {1, 2}
+
+@pytest.fixture
+def paginas(repositorio, monkeypatch):
+    monkeypatch.setattr(command_handlers, "idea_repository", repositorio)
+    monkeypatch.setattr(command_handlers, "LISTAR_IDEIAS_POR_PAGINA", POR_PAGINA)
+
+def botoes(teclado):
+    return [botao.callback_data for botao in teclado.inline_keyboard[0]] if teclado else []
+
+def test_navegacao_entre_paginas(paginas, ideias):
+    mensagem, teclado = command_handlers._pagina_de_ideias(1, False)
+    assert f"ID {ideias[-1]}" in mensagem and f"ID {ideias[-4]}" not in mensagem
+    assert botoes(teclado) == [f"listar:antes:{ideias[-3]}"]
+    
+    mensagem, teclado = command_handlers._pagina_de_ideias(1, False, antes_de=ideias[-3])
+    assert botoes(teclado) == [f"listar:depois:{ideias[-4]}", f"listar:antes:{ideias[-6]}"]
+    
+    # Última página: só uma ideia e nenhuma mais antiga
+    mensagem, teclado = command_handlers._pagina_de_ideias(1, False, antes_de=ideias[-6])
+    assert botoes(teclado) == [f"listar:depois:{ideias[0]}"]
+    
+    # Voltando da última página: a do meio de novo, com as duas direções
+    _, teclado = command_handlers._pagina_de_ideias(1, False, depois_de=ideias[0])
+    assert botoes(teclado) == [f"listar:depois:{ideias[-4]}", f"listar:antes:{ideias[-6]}"]
+    
+    # Voltando até o início: sem botão para as mais recentes
+    _, teclado = command_handlers._pagina_de_ideias(1, False, depois_de=ideias[-4])
+    assert botoes(teclado) == [f"listar:antes:{ideias[-3]}"]
+
+def test_descricao_longa_e_abreviada(paginas, ideias):
+    mensagem, _ = command_handlers._pagina_de_ideias(1, False)
+    assert "x" * (command_handlers.LISTAR_DESCRICAO_MAX - 3 - len("ideia 6 ")) + "..." in mensagem
+
+def test_chat_sem_ideias(paginas):
+    assert command_handlers._pagina_de_ideias(1, False) is None
+
+def test_erro_na_consulta_nao_e_confundido_com_lista_vazia(paginas, repositorio, monkeypatch):
+    def falhar(*args, **kwargs):
+        raise OSError("disco indisponível")
+    
+    monkeypatch.setattr(repositorio.conexoes, "consultar", falhar)
+    assert repositorio.listar_pagina_ideias(1) is None
+    assert command_handlers._pagina_de_ideias(1, False) == (command_handlers.MENSAGEM_ERRO_LISTAGEM, None)
+
+class ConsultaFalsa:
+    """Imita o encadeamento do cliente do Supabase; a view de listagem não existe."""
+    
+    def __init__(self, tabela, linhas):
+        self.tabela = tabela
+        self.linhas = linhas
+    
+    def __getattr__(self, nome):
+        return lambda *args, **kwargs: self
+    
+    def execute(self):
+        if self.tabela == "ideias_listagem":
+            raise APIError({"code": "42P01", "message": 'relation "ideias_listagem" does not exist'})
+        return type("Resposta", (), {"data": self.linhas})()
+
+def test_supabase_sem_a_view_lista_pela_tabela():
+    linhas = [{"id": 2, "chat_id": 1, "resumo": "r", "conteudo": "y" * 200}, {"id": 1, "chat_id": 1, "resumo": "s", "conteudo": None}]
+    servico = SupabaseService.__new__(SupabaseService)
+    servico._view_listagem = True
+    servico.supabase = type("Cliente", (), {"table": lambda _, tabela: ConsultaFalsa(tabela, linhas)})()
+    servico.executar = lambda query: query.execute()
+    
+    for _ in range(2):
+        ideias = servico.listar_pagina_ideias(1)
+        assert [set(ideia) for ideia in ideias] == [{"id", "chat_id", "resumo", "conteudo_inicio"}] * 2
+        assert len(ideias[0]["conteudo_inicio"]) == modulo_repositorio.LISTAR_DESCRICAO_MAX + 1
+        assert ideias[1]["conteudo_inicio"] == ""
+    # A view ausente é lembrada: as próximas páginas vão direto à tabela
+    assert servico._view_listagem is False
@@ -0,0 +1,39 @@
+"""
+Testes do classificador local de IDEIA x QUESTAO.
+"""
+import threading
+
+from src.services.local_classifier import LocalClassifier
+
+IDEIAS = ["criar um app de receitas", "montar uma loja de bolos", "escrever um livro de contos"]
+QUESTOES = ["qual a capital da franca?", "como funciona a fotossintese?", "quem escreveu dom casmurro?"]
+
+def criar_classificador(tmp_path):
+    classificador = LocalClassifier(str(tmp_path / "classificador.db"), limiar=0.7, min_exemplos=3, importar_historico=False)
+    for texto in IDEIAS:
+        classificador.aprender(texto, "ideia")
+    for texto in QUESTOES:
+        classificador.aprender(texto, "questao")
+    return classificador
+
+def test_aprende_e_classifica(tmp_path):
+    classificador = criar_classificador(tmp_path)
+    classificador.aprender(IDEIAS[0], "IDEIA")
+    
+    assert classificador.classificar("qual a capital do brasil?") == "QUESTAO"
+    assert classificador.estatisticas() == {"exemplos": {"IDEIA": 3, "QUESTAO": 3}, "decisoes": {"local": 1, "llm": 0}}
+    
+    # Os exemplos sobrevivem a um novo carregamento
+    assert LocalClassifier(str(tmp_path / "classificador.db"), importar_historico=False).estatisticas()["exemplos"] == {"IDEIA": 3, "QUESTAO": 3}
+
+def test_gravacao_em_andamento_nao_bloqueia_a_classificacao(tmp_path):
+    classificador = criar_classificador(tmp_path)
+    resultado = []
+    
+    # Com a conexão ocupada (ex: o commit de um exemplo novo), a classificação continua respondendo
+    with classificador._lock_db:
+        thread = threading.Thread(target=lambda: resultado.append(classificador.classificar("quem pintou a monalisa?")))
+        thread.start()
+        thread.join(5)
+    
+    assert resultado == ["QUESTAO"]
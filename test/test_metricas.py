@@ -0,0 +1,60 @@
+"""
+Testes das métricas de latência e dos contadores.
+"""
+import threading
+
+from src.utils.metricas import Metricas
+
+def test_percentis_e_estatisticas():
+    metricas = Metricas(janela=100)
+    for ms in range(1, 101):
+        metricas.registrar("op", ms / 1000)
+    
+    assert metricas.percentil("op", 50) == 0.051
+    assert metricas.percentil("outra", 50) is None
+    estatisticas = metricas.estatisticas()["op"]
+    assert estatisticas["n"] == 100
+    assert round(estatisticas["p95_ms"]) == 95
+
+def test_janela_guarda_so_as_amostras_recentes():
+    metricas = Metricas(janela=3)
+    for segundos in (10, 1, 2, 3):
+        metricas.registrar("op", segundos)
+    assert metricas.estatisticas()["op"]["n"] == 3
+    assert metricas.percentil("op", 100) == 3
+
+def test_extrair_e_incorporar_entre_processos():
+    origem, destino = Metricas(), Metricas()
+    origem.registrar("op", 0.5)
+    origem.contar("evento", 2)
+    
+    destino.incorporar(origem.extrair())
+    assert destino.percentil("op", 50) == 0.5
+    assert destino.contadores() == {"evento": 2}
+    assert origem.extrair() == {"amostras": {}, "contadores": {}}
+
+def test_estatisticas_com_descartar_simultaneo():
+    metricas = Metricas()
+    parar = threading.Event()
+    erros = []
+    
+    def registrar_e_descartar():
+        while not parar.is_set():
+            for i in range(20):
+                metricas.registrar(f"op{i}", 0.01)
+            for i in range(20):
+                metricas.descartar(f"op{i}")
+    
+    thread = threading.Thread(target=registrar_e_descartar)
+    thread.start()
+    try:
+        for _ in range(2000):
+            try:
+                for estatisticas in metricas.estatisticas().values():
+                    assert estatisticas["n"] > 0 and estatisticas["p95_ms"] is not None
+            except Exception as e:
+                erros.append(e)
+    finally:
+        parar.set()
+        thread.join()
+    assert erros == []
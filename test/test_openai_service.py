@@ -0,0 +1,73 @@
+"""
+Testes da classificação local e da geração do brainstorm por seções.
+"""
+import asyncio
+
+import pytest
+
+from src.config.prompts import BRAINSTORM_SECOES
+from src.services.openai_service import OpenAIService
+
+def secao_do_prompt(prompt_base):
+    """Seção pedida no prompt (o nome aparece entre aspas)."""
+    return next(secao for secao in BRAINSTORM_SECOES if f'"{secao}"' in prompt_base)
+
+def test_secoes_sao_montadas_na_ordem_fixa(monkeypatch):
+    servico = OpenAIService()
+    
+    async def completion(operacao, system, prompt_base, texto, usar_cache=True, ao_receber=None):
+        # As últimas seções terminam primeiro
+        await asyncio.sleep(0.01 * (len(BRAINSTORM_SECOES) - BRAINSTORM_SECOES.index(secao_do_prompt(prompt_base))))
+        return f"{secao_do_prompt(prompt_base)} de {texto}"
+    
+    monkeypatch.setattr(servico, "_chat_completion", completion)
+    brainstorm = asyncio.run(servico._gerar_secoes("ideia", True, None))
+    assert brainstorm == "\n\n".join(f"*{secao}*\n{secao} de ideia" for secao in BRAINSTORM_SECOES)
+
+def test_falha_em_uma_secao_cancela_as_outras(monkeypatch):
+    servico = OpenAIService()
+    canceladas = []
+    
+    async def completion(operacao, system, prompt_base, texto, usar_cache=True, ao_receber=None):
+        if secao_do_prompt(prompt_base) == BRAINSTORM_SECOES[0]:
+            await asyncio.sleep(0.01)
+            raise ConnectionError("falhou")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            canceladas.append(prompt_base)
+            raise
+    
+    monkeypatch.setattr(servico, "_chat_completion", completion)
+    
+    async def cenario():
+        inicio = asyncio.get_running_loop().time()
+        with pytest.raises(ConnectionError):
+            await servico._gerar_secoes("ideia", True, None)
+        return asyncio.get_running_loop().time() - inicio
+    
+    assert asyncio.run(cenario()) < 1
+    assert len(canceladas) == len(BRAINSTORM_SECOES) - 1
+
+def test_ideia_classificada_localmente_recebe_o_resumo_depois(monkeypatch):
+    servico = OpenAIService()
+    chamadas = []
+    
+    async def classificar_localmente(texto):
+        return "IDEIA"
+    
+    async def completion(operacao, system, prompt_base, texto, usar_cache=True, ao_receber=None):
+        chamadas.append(operacao)
+        return '"App de receitas"\n'
+    
+    monkeypatch.setattr(servico, "_classificar_localmente", classificar_localmente)
+    monkeypatch.setattr(servico, "_chat_completion", completion)
+    
+    # A classificação local não chama a API nem inventa um resumo
+    assert asyncio.run(servico.classificar_e_responder_async("criar um app de receitas")) == (
+        "IDEIA", "criar um app de receitas", None, None
+    )
+    assert chamadas == []
+    
+    assert asyncio.run(servico.resumir_async("criar um app de receitas")) == "App de receitas"
+    assert chamadas == ["resumo"]
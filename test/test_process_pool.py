@@ -0,0 +1,60 @@
+"""
+Testes do pool de processos.
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.utils.async_runtime import async_runtime
+from src.utils.process_pool import FilaCheia, PrazoEsgotado, ProcessPool
+
+@pytest.fixture
+def pool():
+    pool = ProcessPool("teste", processos=1, fila_max=2, timeout=30)
+    yield pool
+    pool.encerrar()
+
+def test_executa_e_devolve_o_resultado(pool):
+    assert asyncio.run(pool.executar(abs, -3)) == 3
+    assert pool.executar_sincrono(abs, -4) == 4
+
+def test_erro_da_funcao_vira_runtime_error(pool):
+    with pytest.raises(RuntimeError, match="ValueError"):
+        pool.executar_sincrono(int, "x")
+
+def test_fila_espera_sem_ocupar_threads_e_recusa_o_excedente(pool, monkeypatch):
+    em_thread = async_runtime.em_thread
+    threads = []
+    maximo = []
+    
+    async def contar_threads(func, *args, **kwargs):
+        threads.append(func)
+        maximo.append(len(threads))
+        try:
+            return await em_thread(func, *args, **kwargs)
+        finally:
+            threads.remove(func)
+    
+    monkeypatch.setattr(async_runtime, "em_thread", contar_threads)
+    
+    async def cenario():
+        trabalhos = [asyncio.ensure_future(pool.executar(time.sleep, 0.3)) for _ in range(3)]
+        await asyncio.sleep(0)
+        with pytest.raises(FilaCheia):
+            await pool.executar(abs, 1)
+        await asyncio.gather(*trabalhos)
+    
+    asyncio.run(cenario())
+    # Um processo: os dois trabalhos da fila esperam no event loop, não em threads
+    assert max(maximo) == 1
+
+def test_prazo_na_fila(pool):
+    async def cenario():
+        ocupado = asyncio.ensure_future(pool.executar(time.sleep, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(PrazoEsgotado):
+            await pool.executar(abs, 1, timeout=0.1)
+        await ocupado
+    
+    asyncio.run(cenario())
@@ -0,0 +1,107 @@
+"""
+Testes do circuit breaker e da política de resiliência.
+"""
+import asyncio
+
+import pytest
+
+from src.utils.resiliencia import CircuitBreaker, CircuitoAberto, Resiliencia
+
+def criar_resiliencia(tempo_aberto=0.05):
+    """Resiliência com um serviço "x" que abre o circuito na primeira falha."""
+    return Resiliencia({"x": {"tentativas": 1, "prazo": 5.0, "limite_falhas": 1, "tempo_aberto": tempo_aberto}})
+
+async def falhar():
+    raise ConnectionError("sem conexão")
+
+async def responder():
+    return "ok"
+
+def test_circuito_abre_apos_falhas_e_recusa_chamadas():
+    resiliencia = criar_resiliencia(tempo_aberto=60)
+    
+    async def cenario():
+        with pytest.raises(ConnectionError):
+            await resiliencia.executar("x", falhar)
+        with pytest.raises(CircuitoAberto):
+            await resiliencia.executar("x", responder)
+    
+    asyncio.run(cenario())
+    assert resiliencia.estado_circuitos()["x"] == CircuitBreaker.ABERTO
+
+def test_chamada_de_teste_bem_sucedida_fecha_o_circuito():
+    resiliencia = criar_resiliencia()
+    
+    async def cenario():
+        with pytest.raises(ConnectionError):
+            await resiliencia.executar("x", falhar)
+        await asyncio.sleep(0.06)
+        return await resiliencia.executar("x", responder)
+    
+    assert asyncio.run(cenario()) == "ok"
+    assert resiliencia.estado_circuitos()["x"] == CircuitBreaker.FECHADO
+
+def test_chamada_de_teste_cancelada_libera_o_circuito():
+    resiliencia = criar_resiliencia()
+    
+    async def cenario():
+        with pytest.raises(ConnectionError):
+            await resiliencia.executar("x", falhar)
+        await asyncio.sleep(0.06)
+        
+        # A chamada de teste é cancelada antes de o serviço responder
+        teste = asyncio.ensure_future(resiliencia.executar("x", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        teste.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await teste
+        
+        # A próxima chamada vira o novo teste em vez de ser recusada para sempre
+        return await resiliencia.executar("x", responder)
+    
+    assert asyncio.run(cenario()) == "ok"
+    assert resiliencia.estado_circuitos()["x"] == CircuitBreaker.FECHADO
+
+def test_chamada_de_teste_interrompida_no_modo_sincrono_libera_o_circuito():
+    circuito = CircuitBreaker("x", limite_falhas=1, tempo_aberto=0.0)
+    circuito.registrar_falha()
+    resiliencia = criar_resiliencia()
+    resiliencia._circuitos["x"] = circuito
+    
+    def interromper():
+        raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        resiliencia.executar_sincrono("x", interromper)
+    assert resiliencia.executar_sincrono("x", lambda: "ok") == "ok"
+
+def test_erro_nao_transitorio_nao_abre_o_circuito():
+    resiliencia = criar_resiliencia(tempo_aberto=60)
+    
+    async def recusar():
+        raise ValueError("requisição inválida")
+    
+    async def cenario():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await resiliencia.executar("x", recusar)
+    
+    asyncio.run(cenario())
+    assert resiliencia.estado_circuitos()["x"] == CircuitBreaker.FECHADO
+
+def test_chamada_sincrona_que_nao_pode_ser_repetida_falha_na_primeira_tentativa(monkeypatch):
+    monkeypatch.setattr("src.utils.resiliencia.RESILIENCIA_ESPERA_BASE", 0.0)
+    resiliencia = Resiliencia({"x": {"tentativas": 3, "prazo": 5.0, "limite_falhas": 5, "tempo_aberto": 60}})
+    tentativas = []
+    
+    def falhar_sincrono():
+        tentativas.append(1)
+        raise ConnectionError("sem conexão")
+    
+    with pytest.raises(ConnectionError):
+        resiliencia.executar_sincrono("x", falhar_sincrono, pode_repetir=lambda: False)
+    assert len(tentativas) == 1
+    
+    with pytest.raises(ConnectionError):
+        resiliencia.executar_sincrono("x", falhar_sincrono)
+    assert len(tentativas) == 4
@@ -0,0 +1,44 @@
+"""
+Testes do cache de respostas em memória e em disco.
+"""
+from src.services.response_cache import ResponseCache
+
+def criar_cache(tmp_path, max_bytes_disco=1000, ttl_segundos=60):
+    return ResponseCache(str(tmp_path / "cache.db"), ttl_segundos, 2, max_bytes_disco)
+
+def bytes_na_tabela(cache):
+    return cache._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM cache").fetchone()[0]
+
+def test_busca_em_memoria_e_em_disco(tmp_path):
+    cache = criar_cache(tmp_path)
+    for chave in "abc":
+        cache.salvar("op", chave, {"valor": chave})
+    
+    # A memória guarda só as 2 mais recentes; "a" volta do disco
+    assert cache.buscar("op", "a") == {"valor": "a"}
+    assert cache.buscar("op", "c") == {"valor": "c"}
+    assert cache.buscar("op", "x") is None
+    assert cache.estatisticas()["op"] == {"acertos_memoria": 1, "acertos_disco": 1, "faltas": 1, "gravacoes": 3}
+
+def test_total_em_bytes_acompanha_gravacoes_e_remocoes(tmp_path):
+    cache = criar_cache(tmp_path, max_bytes_disco=100)
+    for i in range(20):
+        cache.salvar("op", f"chave{i}", "x" * 20)
+        # Regravar a mesma chave substitui a entrada sem contá-la duas vezes
+        cache.salvar("op", f"chave{i}", "y" * 20)
+        assert cache._bytes_disco == bytes_na_tabela(cache) <= 100
+    
+    # As acessadas há mais tempo saíram primeiro
+    assert cache.buscar("op", "chave0") is None
+    assert cache.buscar("op", "chave19") == "y" * 20
+
+def test_total_em_bytes_e_lido_ao_reabrir(tmp_path):
+    criar_cache(tmp_path).salvar("op", "a", "valor")
+    cache = criar_cache(tmp_path)
+    assert cache._bytes_disco == bytes_na_tabela(cache) > 0
+
+def test_entrada_expirada_e_removida(tmp_path):
+    cache = criar_cache(tmp_path, ttl_segundos=-1)
+    cache.salvar("op", "a", "valor")
+    assert cache.buscar("op", "a") is None
+    assert cache._bytes_disco == bytes_na_tabela(cache) == 0
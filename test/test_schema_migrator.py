@@ -0,0 +1,61 @@
+"""
+Testes das migrações versionadas do esquema SQLite.
+"""
+import sqlite3
+
+import pytest
+
+from src.database.connection_manager import ConnectionManager
+from src.database.schema_migrator import MIGRACOES, SchemaMigrator
+
+@pytest.fixture
+def conexoes(tmp_path):
+    conexoes = ConnectionManager(str(tmp_path / "cerebro.db"))
+    yield conexoes
+    conexoes.fechar()
+
+def indices(conexoes):
+    return {row["name"] for row in conexoes.consultar("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def test_banco_novo_recebe_todas_as_migracoes(conexoes):
+    migrator = SchemaMigrator(conexoes)
+    assert migrator.versao_atual() == 0
+    assert migrator.aplicar() == [versao for versao, _, _ in MIGRACOES]
+    assert migrator.versao_atual() == MIGRACOES[-1][0]
+    assert {"idx_ideias_chat_id_id", "idx_brainstorms_ideia_id_data"} <= indices(conexoes)
+
+def test_migracoes_aplicadas_nao_rodam_de_novo(conexoes):
+    SchemaMigrator(conexoes).aplicar()
+    assert SchemaMigrator(conexoes).aplicar() == []
+
+def test_banco_antigo_sem_chat_id_e_migrado(conexoes):
+    conexoes.executar(
+        "CREATE TABLE ideias (id INTEGER PRIMARY KEY AUTOINCREMENT, tipo TEXT NOT NULL, "
+        "conteudo TEXT NOT NULL, resumo TEXT NOT NULL, data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conexoes.executar("INSERT INTO ideias (tipo, conteudo, resumo) VALUES ('ideia', 'texto', 'resumo')")
+    
+    SchemaMigrator(conexoes).aplicar()
+    
+    colunas = [row["name"] for row in conexoes.consultar("PRAGMA table_info(ideias)")]
+    assert "chat_id" in colunas
+    assert conexoes.consultar_um("SELECT conteudo FROM ideias")["conteudo"] == "texto"
+
+def test_migracao_com_erro_e_desfeita_e_repetida_depois(conexoes):
+    def criar_tabela(conn):
+        conn.execute("CREATE TABLE teste (id INTEGER)")
+    
+    def falhar(conn):
+        conn.execute("CREATE TABLE parcial (id INTEGER)")
+        raise sqlite3.OperationalError("falha no meio da migração")
+    
+    migrator = SchemaMigrator(conexoes, [(1, "Tabela de teste", criar_tabela), (2, "Migração com erro", falhar)])
+    with pytest.raises(sqlite3.OperationalError):
+        migrator.aplicar()
+    
+    # A primeira continua aplicada; a segunda não deixou nada pela metade
+    assert migrator.versao_atual() == 1
+    assert conexoes.consultar_um("SELECT name FROM sqlite_master WHERE name = 'parcial'") is None
+    
+    migrator.migracoes[1] = (2, "Migração corrigida", lambda conn: conn.execute("CREATE TABLE parcial (id INTEGER)"))
+    assert migrator.aplicar() == [2]
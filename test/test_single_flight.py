@@ -0,0 +1,106 @@
+"""
+Testes do agrupamento de requisições idênticas.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+def test_chamadas_simultaneas_compartilham_uma_execucao():
+    agrupador = SingleFlight("teste")
+    chamadas = []
+    
+    async def chamada(_):
+        chamadas.append(1)
+        await asyncio.sleep(0.01)
+        return "resultado"
+    
+    async def cenario():
+        return await asyncio.gather(*(agrupador.executar("chave", chamada) for _ in range(3)))
+    
+    assert asyncio.run(cenario()) == ["resultado"] * 3
+    assert len(chamadas) == 1
+
+def test_cancelar_um_dos_que_esperam_nao_cancela_os_outros():
+    agrupador = SingleFlight("teste")
+    
+    async def chamada(_):
+        await asyncio.sleep(0.05)
+        return "resultado"
+    
+    async def cenario():
+        primeiro = asyncio.ensure_future(agrupador.executar("chave", chamada))
+        segundo = asyncio.ensure_future(agrupador.executar("chave", chamada))
+        await asyncio.sleep(0.01)
+        primeiro.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await primeiro
+        return await segundo
+    
+    assert asyncio.run(cenario()) == "resultado"
+
+def test_cancelar_todos_cancela_a_requisicao():
+    agrupador = SingleFlight("teste")
+    cancelada = []
+    
+    async def chamada(_):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelada.append(True)
+            raise
+    
+    async def cenario():
+        esperas = [asyncio.ensure_future(agrupador.executar("chave", chamada)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for espera in esperas:
+            espera.cancel()
+        await asyncio.gather(*esperas, return_exceptions=True)
+        await asyncio.sleep(0)
+        # Com a requisição encerrada, a chave fica livre para uma nova execução
+        return "chave" in agrupador._voos
+    
+    assert asyncio.run(cenario()) is False
+    assert cancelada == [True]
+
+def test_erro_e_entregue_a_todos_que_esperam():
+    agrupador = SingleFlight("teste")
+    
+    async def chamada(_):
+        await asyncio.sleep(0.01)
+        raise ValueError("falhou")
+    
+    async def cenario():
+        return await asyncio.gather(*(agrupador.executar("chave", chamada) for _ in range(2)), return_exceptions=True)
+    
+    resultados = asyncio.run(cenario())
+    assert all(isinstance(resultado, ValueError) for resultado in resultados)
+
+def test_versao_sincrona_compartilha_o_resultado_entre_threads():
+    agrupador = SingleFlight("teste")
+    chamadas = []
+    liberar = threading.Event()
+    resultados = []
+    
+    def chamada():
+        chamadas.append(1)
+        liberar.wait(5)
+        return "resultado"
+    
+    threads = [
+        threading.Thread(target=lambda: resultados.append(agrupador.executar_sincrono("chave", chamada)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while not chamadas:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.05)
+    liberar.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert resultados == ["resultado"] * 3
+    assert len(chamadas) == 1
@@ -0,0 +1,41 @@
+"""
+Testes da edição progressiva das respostas em streaming.
+"""
+import asyncio
+
+from src.bot import stream_editor
+from src.bot.stream_editor import LIMITE_MENSAGEM, StreamEditor, dividir_texto
+
+def test_texto_curto_fica_em_uma_parte():
+    assert dividir_texto("abc") == ["abc"]
+
+def test_divide_entre_paragrafos_sem_perder_texto():
+    paragrafos = [("palavra " * 100).strip() for _ in range(12)]
+    texto = "\n\n".join(paragrafos)
+    partes = dividir_texto(texto)
+    
+    assert len(partes) > 1
+    assert all(len(parte) <= LIMITE_MENSAGEM for parte in partes)
+    assert "\n\n".join(partes) == texto
+
+def test_palavra_maior_que_o_limite_e_cortada():
+    partes = dividir_texto("x" * 10, limite=4)
+    assert partes == ["xxxx", "xxxx", "xx"]
+
+def test_texto_final_longo_continua_em_novas_mensagens(monkeypatch):
+    edicoes, envios = [], []
+    
+    async def editar(mensagem, texto, **kwargs):
+        edicoes.append(texto)
+    
+    async def enviar_no_chat(mensagem, texto, **kwargs):
+        envios.append(texto)
+    
+    monkeypatch.setattr(stream_editor, "editar", editar)
+    monkeypatch.setattr(stream_editor, "enviar_no_chat", enviar_no_chat)
+    
+    texto = "\n".join(f"linha {i} " + "y" * 60 for i in range(200))
+    asyncio.run(StreamEditor(mensagem=None).finalizar(texto))
+    
+    assert len(edicoes) == 1 and envios
+    assert "\n".join(edicoes + envios) == texto
@@ -0,0 +1,37 @@
+"""
+Testes das mensagens de erro da transcrição.
+"""
+import asyncio
+
+from src.transcription import transcriber
+from src.utils.process_pool import PrazoEsgotado
+
+class PoolFalso:
+    """Pool de processos que lança o erro dado em vez de preparar o áudio."""
+    
+    def __init__(self, erro=None):
+        self.erro = erro
+    
+    async def executar(self, funcao, *args):
+        if self.erro:
+            raise self.erro
+        return [(b"audio", "ogg")]
+
+def transcrever(monkeypatch, pool, enviar=None):
+    monkeypatch.setattr(transcriber, "AUDIO_PROCESSOS", 1)
+    monkeypatch.setattr(transcriber, "audio_pool", pool)
+    instancia = transcriber.AudioTranscriber()
+    if enviar:
+        monkeypatch.setattr(instancia, "_enviar_async", enviar)
+    return asyncio.run(instancia._transcrever_async(b"audio"))
+
+def test_prazo_do_pool_vira_mensagem_de_demora(monkeypatch):
+    assert transcrever(monkeypatch, PoolFalso(PrazoEsgotado("audio"))) == (False, transcriber.MENSAGEM_DEMORADO)
+
+def test_timeout_do_upload_nao_e_confundido_com_o_prazo_do_pool(monkeypatch):
+    async def enviar(conteudo, formato):
+        raise asyncio.TimeoutError()
+    
+    sucesso, mensagem = transcrever(monkeypatch, PoolFalso(), enviar)
+    assert not sucesso
+    assert mensagem != transcriber.MENSAGEM_DEMORADO